@@ -106,7 +106,8 @@ async def startup_event():
     
     # Initialize model manager
     model_manager = ModelManager()
-    model_manager.init_models(use_local_proxy=config.use_local_proxy)
+    model_manager.init_models(use_local_proxy=config.use_local_proxy, rate_limits=config.get("model_rate_limits", None),
+                              routes=config.get("model_routes", None))
     
     logger.info("API Server started successfully")
 
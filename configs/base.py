@@ -1,3 +1,14 @@
+# Per-model request limits shared by every agent and tool using the model. Models not
+# listed have no RPM/TPM limit but still shrink their concurrency window on 429/5xx, e.g.
+# model_rate_limits = {"gpt-4.1": dict(rpm=500, tpm=200000, max_concurrency=16)}
+model_rate_limits = dict()
+
+# Routes over interchangeable models, registered under the route name. A request is hedged on the
+# next member once the current one exceeds its p95 latency, and fails over on errors, e.g. over the
+# local proxy and the remote OpenAI deployments (registered when OPENAI_API_KEY and OPENAI_API_BASE are set)
+# model_routes = {"gpt-4.1-router": dict(models=["gpt-4.1", "gpt-4.1-remote"], hedge_delay=30)}
+model_routes = dict()
+
 web_fetcher_tool_config = dict(
     type="web_fetcher_tool",
 )
@@ -5,8 +16,13 @@ web_fetcher_tool_config = dict(
 web_searcher_tool_config = dict(
     type="web_searcher_tool",
     engine="Firecrawl",  # Options: "Firecrawl", "Google", "Bing", "DuckDuckGo", "Baidu"
-    retry_delay = 10,
+    retry_delay = 10,  # Seconds before the first retry once all engines failed, doubled on each retry
+    max_retry_delay = 60,
+    retry_jitter = 0.5,  # Retry delays are randomly shortened by up to this fraction
     max_retries = 3,
+    race = False,  # Query all engines concurrently and keep the first results instead of falling back in order
+    merge_results = False,  # Merge the results of the engines completing within merge_window seconds of the first
+    merge_window = 1.0,
     lang = "en",
     country = "us",
     num_results = 5,
@@ -21,6 +37,17 @@ deep_researcher_tool_config  = dict(
     max_insights = 20,
     time_limit_seconds = 60,
     max_follow_ups = 3,
+    max_branches = 2,  # Follow-up queries researched per node
+    max_concurrency = 4,  # Nodes researched at the same time
+    max_concurrent_analyses = 5,  # Contents analyzed at the same time per node
+    duplicate_threshold = 0.8,  # Contents this similar to an analyzed one are skipped
+    max_content_length = 32768,  # Characters fetched per page before passage selection
+    top_k_passages = 4,  # Passages most relevant to the query sent per analysis
+    map_reduce_passages = 24,  # Pages with more passages are analyzed in up to max_map_chunks chunks
+    max_map_chunks = 3,
+    max_tokens = 500000,  # Tokens a research call may spend
+    max_cost = 1.0,  # Dollars a research call may spend, with the prices of src/utils/token_utils.py
+    min_marginal_gain = 0.5,  # Stop expanding once recent nodes find less new insight relevance than this
 )
 
 auto_browser_use_tool_config  = dict(
@@ -193,7 +193,8 @@ async def main():
     logger.info(f"| Config:\n{config.pretty_text}")
 
     # Registed models
-    model_manager.init_models(use_local_proxy=True)
+    model_manager.init_models(use_local_proxy=True, rate_limits=config.get("model_rate_limits", None),
+                              routes=config.get("model_routes", None))
     logger.info("| Registed models: %s", ", ".join(model_manager.registed_models.keys()))
     
     # Load dataset
@@ -8,11 +8,10 @@ import json
 import yaml
 from rich.panel import Panel
 from rich.text import Text
-from rich.live import Live
 from rich.markdown import Markdown
 from collections.abc import AsyncGenerator
 
-from src.tools import AsyncTool
+from src.tools import AsyncTool, stream_progress, tool_progress_callback
 from src.exception import (
     AgentGenerationError,
     AgentParsingError,
@@ -24,6 +23,7 @@ from src.base.async_multistep_agent import (PromptTemplates,
                                             AsyncMultiStepAgent,
                                             )
 from src.base import (ToolOutput,
+                      ToolProgress,
                       ActionOutput,
                       StreamEvent)
 
@@ -31,11 +31,12 @@ from src.memory import (ActionStep,
                         ToolCall,
                         AgentMemory)
 from src.logger import (LogLevel,
+                        StreamLive,
                         YELLOW_HEX,
                         logger)
 from src.models import (Model,
                         parse_json_if_needed,
-                        agglomerate_stream_deltas,
+                        ChatMessageStreamAccumulator,
                         ChatMessage,
                         ChatMessageStreamDelta)
 from src.utils.agent_types import (
@@ -144,21 +145,19 @@ class GeneralAgent(AsyncMultiStepAgent):
 
         try:
             if self.stream_outputs and hasattr(self.model, "generate_stream"):
-                output_stream = self.model.generate_stream(
+                output_stream = self._generate_stream(
                     input_messages,
                     stop_sequences=["Observation:", "Calling tools:"],
                     tools_to_call_from=self.tools_and_managed_agents,
                 )
 
-                chat_message_stream_deltas: list[ChatMessageStreamDelta] = []
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
-                    for event in output_stream:
-                        chat_message_stream_deltas.append(event)
-                        live.update(
-                            Markdown(agglomerate_stream_deltas(chat_message_stream_deltas).render_as_markdown())
-                        )
+                stream_accumulator = ChatMessageStreamAccumulator()
+                with StreamLive(console=self.logger.console, vertical_overflow="visible") as live:
+                    async for event in output_stream:
+                        stream_accumulator.add(event)
+                        live.update_lazy(lambda: Markdown(stream_accumulator.render_as_markdown()))
                         yield event
-                chat_message = agglomerate_stream_deltas(chat_message_stream_deltas)
+                chat_message = stream_accumulator.to_chat_message()
             else:
                 chat_message: ChatMessage = await self.model(
                     input_messages,
@@ -219,11 +218,18 @@ class GeneralAgent(AsyncMultiStepAgent):
                 final_answer_call = (tool_name, tool_arguments)
                 break  # Stop: final answer reached, no further tool calls
             else:
-                parallel_calls.append((tool_name, tool_arguments))
+                parallel_calls.append((tool_name, tool_arguments, tool_call.id))
+
+        # Progress reported by the tools while they run, yielded before their outputs
+        progress = asyncio.Queue()
 
         # Helper function to process a single tool call
         async def process_single_tool_call(call_info):
-            tool_name, tool_arguments = call_info
+            tool_name, tool_arguments, tool_call_id = call_info
+            # Each call runs in its own task, so the callback only sees the progress of this tool
+            tool_progress_callback.set(
+                lambda event: progress.put_nowait(ToolProgress(tool_name=tool_name, tool_call_id=tool_call_id, event=event))
+            )
             self.logger.log(
                 Panel(Text(f"Calling tool: '{tool_name}' with arguments: {tool_arguments}")),
                 level=LogLevel.INFO,
@@ -248,20 +254,15 @@ class GeneralAgent(AsyncMultiStepAgent):
             )
             return observation
 
-        # Process tool calls in parallel
+        # Process tool calls in parallel, streaming their progress until they all complete
         if parallel_calls:
-            if len(parallel_calls) == 1:
-                # Only one parallel call, process it directly
-                observation = await process_single_tool_call(parallel_calls[0])
-                observations.append(observation)
+            calls = asyncio.gather(*[process_single_tool_call(call_info) for call_info in parallel_calls])
+            async for event in stream_progress(progress, calls):
+                yield event
+            results = calls.result()
+            observations.extend(results)
+            for _ in results:
                 yield ToolOutput(output=None, is_final_answer=False)
-            else:
-                # Multiple parallel calls, use asyncio.gather for concurrent execution
-                tasks = [process_single_tool_call(call_info) for call_info in parallel_calls]
-                results = await asyncio.gather(*tasks)
-                observations.extend(results)
-                for _ in results:
-                    yield ToolOutput(output=None, is_final_answer=False)
 
         # Process final_answer call if present
         if final_answer_call:
@@ -1,4 +1,4 @@
-from src.base.multistep_agent import MultiStepAgent, ToolOutput, ActionOutput, StreamEvent
+from src.base.multistep_agent import MultiStepAgent, ToolOutput, ToolProgress, ActionOutput, StreamEvent
 from src.base.tool_calling_agent import ToolCallingAgent
 from src.base.code_agent import CodeAgent
 from src.base.async_multistep_agent import AsyncMultiStepAgent
@@ -8,6 +8,7 @@ __all__ = [
     "CodeAgent",
     "AsyncMultiStepAgent",
     "ToolOutput",
+    "ToolProgress",
     "ActionOutput",
     "StreamEvent",
 ]
\ No newline at end of file
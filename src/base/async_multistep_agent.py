@@ -35,7 +35,6 @@ import yaml
 from huggingface_hub import create_repo, metadata_update, snapshot_download, upload_folder
 from jinja2 import StrictUndefined, Template
 from rich.console import Group
-from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.rule import Rule
@@ -50,6 +49,7 @@ from src.tools.default_tools import TOOL_MAPPING
 from src.tools.executor.local_python_executor import BASE_BUILTIN_MODULES
 from src.memory import (ActionStep,
                         AgentMemory,
+                        ContextBudgeter,
                         FinalAnswerStep,
                         PlanningStep,
                         SystemPromptStep,
@@ -57,6 +57,7 @@ from src.memory import (ActionStep,
                         TaskStep)
 from src.models import (
     ChatMessage,
+    ChatMessageStreamAccumulator,
     ChatMessageStreamDelta,
     ChatMessageToolCall,
     MessageRole,
@@ -65,6 +66,7 @@ from src.logger import (
     AgentLogger,
     LogLevel,
     Monitor,
+    StreamLive,
     Timing,
     TokenUsage,
 )
@@ -205,6 +207,8 @@ class AsyncMultiStepAgent(ABC):
             Each function should:
             - Take the final answer and the agent's memory as arguments.
             - Return a boolean indicating whether the final answer is valid.
+        context_budget (`int`, *optional*): Context window the memory is trimmed to before each model call.
+            Defaults to the known context window of the model.
     """
 
     def __init__(
@@ -226,9 +230,11 @@ class AsyncMultiStepAgent(ABC):
         final_answer_checks: list[Callable] | None = None,
         return_full_result: bool = False,
         logger: AgentLogger | None = None,
+        context_budget: int | None = None,
     ):
         self.agent_name = self.__class__.__name__
         self.model = model
+        self.context_budgeter = ContextBudgeter(model_id=getattr(model, "model_id", None), max_tokens=context_budget)
         self.prompt_templates = prompt_templates or EMPTY_PROMPT_TEMPLATES
         if prompt_templates is not None:
             missing_keys = set(EMPTY_PROMPT_TEMPLATES.keys()) - set(prompt_templates.keys())
@@ -399,6 +405,8 @@ You have been provided with these additional arguments, that you can access usin
         if self.return_full_result:
             total_input_tokens = 0
             total_output_tokens = 0
+            total_cached_input_tokens = 0
+            total_cache_creation_input_tokens = 0
             correct_token_usage = True
             for step in self.memory.steps:
                 if isinstance(step, (ActionStep, PlanningStep)):
@@ -408,8 +416,15 @@ You have been provided with these additional arguments, that you can access usin
                     else:
                         total_input_tokens += step.token_usage.input_tokens
                         total_output_tokens += step.token_usage.output_tokens
+                        total_cached_input_tokens += step.token_usage.cached_input_tokens
+                        total_cache_creation_input_tokens += step.token_usage.cache_creation_input_tokens
             if correct_token_usage:
-                token_usage = TokenUsage(input_tokens=total_input_tokens, output_tokens=total_output_tokens)
+                token_usage = TokenUsage(
+                    input_tokens=total_input_tokens,
+                    output_tokens=total_output_tokens,
+                    cached_input_tokens=total_cached_input_tokens,
+                    cache_creation_input_tokens=total_cache_creation_input_tokens,
+                )
             else:
                 token_usage = None
 
@@ -544,28 +559,31 @@ You have been provided with these additional arguments, that you can access usin
                 )
             ]
             if self.stream_outputs and hasattr(self.model, "generate_stream"):
-                plan_message_content = ""
-                output_stream = self.model.generate_stream(input_messages, stop_sequences=["<end_plan>"])  # type: ignore
-                input_tokens, output_tokens = 0, 0
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
-                    for event in output_stream:
-                        if event.content is not None:
-                            plan_message_content += event.content
-                            live.update(Markdown(plan_message_content))
-                            if event.token_usage:
-                                output_tokens += event.token_usage.output_tokens
-                                input_tokens = event.token_usage.input_tokens
+                output_stream = self._generate_stream(input_messages, stop_sequences=["<end_plan>"])
+                stream_accumulator = ChatMessageStreamAccumulator()
+                with StreamLive(console=self.logger.console, vertical_overflow="visible") as live:
+                    async for event in output_stream:
+                        stream_accumulator.add(event)
+                        live.update_lazy(lambda: Markdown(stream_accumulator.content))
                         yield event
+                plan_message = stream_accumulator.to_chat_message()
+                plan_message_content = plan_message.content
+                input_tokens, output_tokens, cached_input_tokens = (
+                    plan_message.token_usage.input_tokens,
+                    plan_message.token_usage.output_tokens,
+                    plan_message.token_usage.cached_input_tokens,
+                )
             else:
-                plan_message = self.model.generate(input_messages, stop_sequences=["<end_plan>"])
+                plan_message = await self.model.generate(input_messages, stop_sequences=["<end_plan>"])
                 plan_message_content = plan_message.content
-                input_tokens, output_tokens = (
+                input_tokens, output_tokens, cached_input_tokens = (
                     (
                         plan_message.token_usage.input_tokens,
                         plan_message.token_usage.output_tokens,
+                        plan_message.token_usage.cached_input_tokens,
                     )
                     if plan_message.token_usage
-                    else (None, None)
+                    else (None, None, 0)
                 )
             plan = textwrap.dedent(
                 f"""Here are the facts I know and the plan of action that I will follow to solve the task:\n```\n{plan_message_content}\n```"""
@@ -573,7 +591,7 @@ You have been provided with these additional arguments, that you can access usin
         else:
             # Summary mode removes the system prompt and previous planning messages output by the model.
             # Removing previous planning messages avoids influencing too much the new plan.
-            memory_messages = self.write_memory_to_messages(summary_mode=True)
+            memory_messages = await self.write_memory_to_messages(summary_mode=True)
             plan_update_pre = ChatMessage(
                 role=MessageRole.SYSTEM,
                 content=[
@@ -605,27 +623,30 @@ You have been provided with these additional arguments, that you can access usin
             # remove last message from memory_messages because it is the current task
             input_messages = [plan_update_pre] + memory_messages[:-1] + [plan_update_post]
             if self.stream_outputs and hasattr(self.model, "generate_stream"):
-                plan_message_content = ""
-                input_tokens, output_tokens = 0, 0
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
-                    for event in self.model.generate_stream(
+                stream_accumulator = ChatMessageStreamAccumulator()
+                with StreamLive(console=self.logger.console, vertical_overflow="visible") as live:
+                    async for event in self._generate_stream(
                         input_messages,
                         stop_sequences=["<end_plan>"],
-                    ):  # type: ignore
-                        if event.content is not None:
-                            plan_message_content += event.content
-                            live.update(Markdown(plan_message_content))
-                            if event.token_usage:
-                                output_tokens += event.token_usage.output_tokens
-                                input_tokens = event.token_usage.input_tokens
+                    ):
+                        stream_accumulator.add(event)
+                        live.update_lazy(lambda: Markdown(stream_accumulator.content))
                         yield event
+                plan_message = stream_accumulator.to_chat_message()
+                plan_message_content = plan_message.content
+                input_tokens, output_tokens, cached_input_tokens = (
+                    plan_message.token_usage.input_tokens,
+                    plan_message.token_usage.output_tokens,
+                    plan_message.token_usage.cached_input_tokens,
+                )
             else:
-                plan_message = self.model.generate(input_messages, stop_sequences=["<end_plan>"])
+                plan_message = await self.model.generate(input_messages, stop_sequences=["<end_plan>"])
                 plan_message_content = plan_message.content
                 if plan_message.token_usage is not None:
-                    input_tokens, output_tokens = (
+                    input_tokens, output_tokens, cached_input_tokens = (
                         plan_message.token_usage.input_tokens,
                         plan_message.token_usage.output_tokens,
+                        plan_message.token_usage.cached_input_tokens,
                     )
             plan = textwrap.dedent(
                 f"""I still need to solve the task I was given:\n```\n{self.task}\n```\n\nHere are the facts I know and my new/updated plan of action to solve the task:\n```\n{plan_message_content}\n```"""
@@ -636,7 +657,9 @@ You have been provided with these additional arguments, that you can access usin
             model_input_messages=input_messages,
             plan=plan,
             model_output_message=ChatMessage(role=MessageRole.ASSISTANT, content=plan_message_content),
-            token_usage=TokenUsage(input_tokens=input_tokens, output_tokens=output_tokens),
+            token_usage=TokenUsage(input_tokens=input_tokens,
+                                   output_tokens=output_tokens,
+                                   cached_input_tokens=cached_input_tokens),
             timing=Timing(start_time=start_time, end_time=time.time()),
         )
 
@@ -673,13 +696,21 @@ You have been provided with these additional arguments, that you can access usin
         """
         Reads past llm_outputs, actions, and observations or errors from the memory into a series of messages
         that can be used as input to the LLM. Adds a number of keywords (such as PLAN, error, etc) to help
-        the LLM.
+        the LLM. Old observations are elided, and old steps dropped, when the memory exceeds the context budget.
         """
-        messages = self.memory.system_prompt.to_messages(summary_mode=summary_mode)
-        for memory_step in self.memory.steps:
-            messages.extend(memory_step.to_messages(summary_mode=summary_mode))
-        messages.extend(self.memory.user_prompt.to_messages(summary_mode=summary_mode))
-        return messages
+        return self.context_budgeter.fit(self.memory, summary_mode=summary_mode)
+
+    async def _generate_stream(self, input_messages: list[ChatMessage], **kwargs) -> AsyncGenerator[ChatMessageStreamDelta]:
+        """
+        Streams the model output, natively async when the model implements `agenerate_stream`.
+        Models only implementing the synchronous `generate_stream` are iterated as before.
+        """
+        if hasattr(self.model, "agenerate_stream"):
+            async for event in self.model.agenerate_stream(input_messages, **kwargs):
+                yield event
+        else:
+            for event in self.model.generate_stream(input_messages, **kwargs):
+                yield event
 
     @abstractmethod
     async def _step_stream(self, memory_step: ActionStep) -> AsyncGenerator[ChatMessageStreamDelta | ActionOutput | ToolOutput, None]:
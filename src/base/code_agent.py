@@ -19,7 +19,6 @@ from collections.abc import Generator
 import yaml
 import json
 from rich.console import Group
-from rich.live import Live
 from rich.markdown import Markdown
 from rich.text import Text
 
@@ -52,9 +51,9 @@ from src.utils import (
 )
 
 from src.base.multistep_agent import MultiStepAgent, PromptTemplates, populate_template, ActionOutput
-from src.models import Model, ChatMessageStreamDelta, agglomerate_stream_deltas, CODEAGENT_RESPONSE_FORMAT
+from src.models import Model, ChatMessageStreamDelta, ChatMessageStreamAccumulator, CODEAGENT_RESPONSE_FORMAT
 
-from src.logger import YELLOW_HEX
+from src.logger import StreamLive, YELLOW_HEX
 
 class CodeAgent(MultiStepAgent):
     """
@@ -187,15 +186,13 @@ class CodeAgent(MultiStepAgent):
                     stop_sequences=["<end_code>", "Observation:", "Calling tools:"],
                     **additional_args,
                 )
-                chat_message_stream_deltas: list[ChatMessageStreamDelta] = []
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
+                stream_accumulator = ChatMessageStreamAccumulator()
+                with StreamLive(console=self.logger.console, vertical_overflow="visible") as live:
                     for event in output_stream:
-                        chat_message_stream_deltas.append(event)
-                        live.update(
-                            Markdown(agglomerate_stream_deltas(chat_message_stream_deltas).render_as_markdown())
-                        )
+                        stream_accumulator.add(event)
+                        live.update_lazy(lambda: Markdown(stream_accumulator.render_as_markdown()))
                         yield event
-                chat_message = agglomerate_stream_deltas(chat_message_stream_deltas)
+                chat_message = stream_accumulator.to_chat_message()
                 memory_step.model_output_message = chat_message
                 output_text = chat_message.content
             else:
@@ -35,7 +35,6 @@ import yaml
 from huggingface_hub import create_repo, metadata_update, snapshot_download, upload_folder
 from jinja2 import StrictUndefined, Template
 from rich.console import Group
-from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.rule import Rule
@@ -55,6 +54,7 @@ from src.memory import (ActionStep,
                         TaskStep)
 from src.models import (
     ChatMessage,
+    ChatMessageStreamAccumulator,
     ChatMessageStreamDelta,
     ChatMessageToolCall,
     MessageRole,
@@ -63,6 +63,7 @@ from src.logger import (
     AgentLogger,
     LogLevel,
     Monitor,
+    StreamLive,
     Timing,
     TokenUsage,
 )
@@ -111,6 +112,14 @@ class ToolOutput:
     output: Any
     is_final_answer: bool
 
+
+@dataclass
+class ToolProgress:
+    """Progress event reported by a tool while it runs, see `report_tool_progress`."""
+    tool_name: str
+    tool_call_id: str | None
+    event: Any
+
 class PlanningPromptTemplate(TypedDict):
     """
     Prompt templates for the planning step.
@@ -188,7 +197,7 @@ class RunResult:
         output (Any | None): The final output of the agent run, if available.
         state (Literal["success", "max_steps_error"]): The final state of the agent after the run.
         messages (list[dict]): The agent's memory, as a list of messages.
-        token_usage (TokenUsage | None): Count of tokens used during the run.
+        token_usage (TokenUsage | None): Count of tokens used during the run, including the input tokens served from the provider prompt cache.
         timing (Timing): Timing details of the agent run: start time, end time, duration.
     """
 
@@ -204,6 +213,7 @@ StreamEvent: TypeAlias = Union[
     ChatMessageToolCall,
     ActionOutput,
     ToolOutput,
+    ToolProgress,
     PlanningStep,
     ActionStep,
     FinalAnswerStep,
@@ -433,6 +443,8 @@ You have been provided with these additional arguments, that you can access usin
         if self.return_full_result:
             total_input_tokens = 0
             total_output_tokens = 0
+            total_cached_input_tokens = 0
+            total_cache_creation_input_tokens = 0
             correct_token_usage = True
             for step in self.memory.steps:
                 if isinstance(step, (ActionStep, PlanningStep)):
@@ -442,8 +454,15 @@ You have been provided with these additional arguments, that you can access usin
                     else:
                         total_input_tokens += step.token_usage.input_tokens
                         total_output_tokens += step.token_usage.output_tokens
+                        total_cached_input_tokens += step.token_usage.cached_input_tokens
+                        total_cache_creation_input_tokens += step.token_usage.cache_creation_input_tokens
             if correct_token_usage:
-                token_usage = TokenUsage(input_tokens=total_input_tokens, output_tokens=total_output_tokens)
+                token_usage = TokenUsage(
+                    input_tokens=total_input_tokens,
+                    output_tokens=total_output_tokens,
+                    cached_input_tokens=total_cached_input_tokens,
+                    cache_creation_input_tokens=total_cache_creation_input_tokens,
+                )
             else:
                 token_usage = None
 
@@ -578,18 +597,19 @@ You have been provided with these additional arguments, that you can access usin
                 )
             ]
             if self.stream_outputs and hasattr(self.model, "generate_stream"):
-                plan_message_content = ""
                 output_stream = self.model.generate_stream(input_messages, stop_sequences=["<end_plan>"])  # type: ignore
-                input_tokens, output_tokens = 0, 0
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
+                stream_accumulator = ChatMessageStreamAccumulator()
+                with StreamLive(console=self.logger.console, vertical_overflow="visible") as live:
                     for event in output_stream:
-                        if event.content is not None:
-                            plan_message_content += event.content
-                            live.update(Markdown(plan_message_content))
-                            if event.token_usage:
-                                output_tokens += event.token_usage.output_tokens
-                                input_tokens = event.token_usage.input_tokens
+                        stream_accumulator.add(event)
+                        live.update_lazy(lambda: Markdown(stream_accumulator.content))
                         yield event
+                plan_message = stream_accumulator.to_chat_message()
+                plan_message_content = plan_message.content
+                input_tokens, output_tokens = (
+                    plan_message.token_usage.input_tokens,
+                    plan_message.token_usage.output_tokens,
+                )
             else:
                 plan_message = self.model.generate(input_messages, stop_sequences=["<end_plan>"])
                 plan_message_content = plan_message.content
@@ -639,20 +659,21 @@ You have been provided with these additional arguments, that you can access usin
             # remove last message from memory_messages because it is the current task
             input_messages = [plan_update_pre] + memory_messages[:-1] + [plan_update_post]
             if self.stream_outputs and hasattr(self.model, "generate_stream"):
-                plan_message_content = ""
-                input_tokens, output_tokens = 0, 0
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
+                stream_accumulator = ChatMessageStreamAccumulator()
+                with StreamLive(console=self.logger.console, vertical_overflow="visible") as live:
                     for event in self.model.generate_stream(
                         input_messages,
                         stop_sequences=["<end_plan>"],
                     ):  # type: ignore
-                        if event.content is not None:
-                            plan_message_content += event.content
-                            live.update(Markdown(plan_message_content))
-                            if event.token_usage:
-                                output_tokens += event.token_usage.output_tokens
-                                input_tokens = event.token_usage.input_tokens
+                        stream_accumulator.add(event)
+                        live.update_lazy(lambda: Markdown(stream_accumulator.content))
                         yield event
+                plan_message = stream_accumulator.to_chat_message()
+                plan_message_content = plan_message.content
+                input_tokens, output_tokens = (
+                    plan_message.token_usage.input_tokens,
+                    plan_message.token_usage.output_tokens,
+                )
             else:
                 plan_message = self.model.generate(input_messages, stop_sequences=["<end_plan>"])
                 plan_message_content = plan_message.content
@@ -699,9 +720,9 @@ You have been provided with these additional arguments, that you can access usin
         that can be used as input to the LLM. Adds a number of keywords (such as PLAN, error, etc) to help
         the LLM.
         """
-        messages = self.memory.system_prompt.to_messages(summary_mode=summary_mode)
+        messages = self.memory.system_prompt.get_messages(summary_mode=summary_mode)
         for memory_step in self.memory.steps:
-            messages.extend(memory_step.to_messages(summary_mode=summary_mode))
+            messages.extend(memory_step.get_messages(summary_mode=summary_mode))
         return messages
 
     def _step_stream(self, memory_step: ActionStep) -> Generator[ChatMessageStreamDelta | ActionOutput | ToolOutput]:
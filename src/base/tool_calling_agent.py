@@ -18,7 +18,6 @@ import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import TYPE_CHECKING, Any
 import yaml
-from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.text import Text
@@ -52,7 +51,7 @@ from src.base.multistep_agent import (MultiStepAgent,
                                       ToolOutput,
                                       StreamEvent)
 from src.models import (Model,
-                        agglomerate_stream_deltas,
+                        ChatMessageStreamAccumulator,
                         parse_json_if_needed)
 from src.utils import (
     AgentImage,
@@ -60,7 +59,7 @@ from src.utils import (
     AgentText,
 )
 
-from src.logger import logger, YELLOW_HEX
+from src.logger import logger, StreamLive, YELLOW_HEX
 
 class ToolCallingAgent(MultiStepAgent):
     """
@@ -144,15 +143,13 @@ class ToolCallingAgent(MultiStepAgent):
                     tools_to_call_from=self.tools_and_managed_agents,
                 )
 
-                chat_message_stream_deltas: list[ChatMessageStreamDelta] = []
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
+                stream_accumulator = ChatMessageStreamAccumulator()
+                with StreamLive(console=self.logger.console, vertical_overflow="visible") as live:
                     for event in output_stream:
-                        chat_message_stream_deltas.append(event)
-                        live.update(
-                            Markdown(agglomerate_stream_deltas(chat_message_stream_deltas).render_as_markdown())
-                        )
+                        stream_accumulator.add(event)
+                        live.update_lazy(lambda: Markdown(stream_accumulator.render_as_markdown()))
                         yield event
-                chat_message = agglomerate_stream_deltas(chat_message_stream_deltas)
+                chat_message = stream_accumulator.to_chat_message()
             else:
                 chat_message: ChatMessage = self.model.generate(
                     input_messages,
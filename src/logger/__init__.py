@@ -1,9 +1,10 @@
-from .logger import logger, LogLevel, AgentLogger, YELLOW_HEX
+from .logger import logger, LogLevel, AgentLogger, StreamLive, YELLOW_HEX
 from .monitor import Monitor, Timing, TokenUsage
 
 __all__ = ["logger",
            "LogLevel",
            "AgentLogger",
+           "StreamLive",
            "Monitor",
            "YELLOW_HEX",
            "Timing",
@@ -1,10 +1,12 @@
 import logging
 import json
+import time
 from enum import IntEnum
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from rich import box
-from rich.console import Console, Group
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
 from rich.panel import Panel
 from rich.rule import Rule
 from rich.syntax import Syntax
@@ -17,6 +19,8 @@ from src.utils import (
 )
 
 YELLOW_HEX = "#d4b702"
+# Frame rate of the live display of streamed model outputs
+STREAM_REFRESH_PER_SECOND = 10
 
 class LogLevel(IntEnum):
     OFF = -1  # No output
@@ -227,4 +231,33 @@ class AgentLogger(logging.Logger, metaclass=Singleton):
         build_agent_tree(main_tree, agent)
         self.console.print(main_tree)
 
-logger = AgentLogger()
\ No newline at end of file
+logger = AgentLogger()
+
+
+class StreamLive(Live):
+    """Live display of a streamed output, rebuilt at most `refresh_per_second` times.
+
+    `update_lazy` takes a callable building the renderable, so nothing is rendered for the tokens
+    arriving between two frames. The last pending renderable is always shown when the display stops.
+    """
+
+    def __init__(self, *args, refresh_per_second: float = STREAM_REFRESH_PER_SECOND, **kwargs):
+        super().__init__("", *args, refresh_per_second=refresh_per_second, **kwargs)
+        self.min_interval = 1.0 / refresh_per_second
+        self.last_update = 0.0
+        self.pending: Optional[Callable[[], RenderableType]] = None
+
+    def update_lazy(self, get_renderable: Callable[[], RenderableType]) -> None:
+        now = time.monotonic()
+        if now - self.last_update >= self.min_interval:
+            self.last_update = now
+            self.pending = None
+            self.update(get_renderable())
+        else:
+            self.pending = get_renderable
+
+    def stop(self) -> None:
+        if self.pending is not None:
+            self.update(self.pending())
+            self.pending = None
+        super().stop()
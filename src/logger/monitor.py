@@ -9,6 +9,9 @@ class TokenUsage:
 
     input_tokens: int
     output_tokens: int
+    # Part of input_tokens read from the provider prompt cache, and part written to it
+    cached_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
     total_tokens: int = field(init=False)
 
     def __post_init__(self):
@@ -18,6 +21,8 @@ class TokenUsage:
         return {
             "input_tokens": self.input_tokens,
             "output_tokens": self.output_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
             "total_tokens": self.total_tokens,
         }
 
@@ -52,17 +57,23 @@ class Monitor:
         self.logger = logger
         self.total_input_token_count = 0
         self.total_output_token_count = 0
+        self.total_cached_input_token_count = 0
+        self.total_cache_creation_input_token_count = 0
 
     def get_total_token_counts(self) -> TokenUsage:
         return TokenUsage(
             input_tokens=self.total_input_token_count,
             output_tokens=self.total_output_token_count,
+            cached_input_tokens=self.total_cached_input_token_count,
+            cache_creation_input_tokens=self.total_cache_creation_input_token_count,
         )
 
     def reset(self):
         self.step_durations = []
         self.total_input_token_count = 0
         self.total_output_token_count = 0
+        self.total_cached_input_token_count = 0
+        self.total_cache_creation_input_token_count = 0
 
     def update_metrics(self, step_log):
         """Update the metrics of the monitor.
@@ -77,8 +88,15 @@ class Monitor:
         if step_log.token_usage is not None:
             self.total_input_token_count += step_log.token_usage.input_tokens
             self.total_output_token_count += step_log.token_usage.output_tokens
+            self.total_cached_input_token_count += step_log.token_usage.cached_input_tokens
+            self.total_cache_creation_input_token_count += step_log.token_usage.cache_creation_input_tokens
             console_outputs += (
                 f"| Input tokens: {self.total_input_token_count:,} | Output tokens: {self.total_output_token_count:,}"
             )
+            if self.total_cached_input_token_count:
+                console_outputs += f" | Cached input tokens: {self.total_cached_input_token_count:,}"
+        rate_limiter = getattr(self.tracked_model, "rate_limiter", None)
+        if rate_limiter is not None and rate_limiter.total_queue_wait:
+            console_outputs += f" | Queue wait: {rate_limiter.total_queue_wait:.2f} seconds"
         console_outputs += "]"
         self.logger.log(Text(console_outputs, style="dim"), level=1)
\ No newline at end of file
@@ -9,6 +9,7 @@ from src.memory.memory import (
     FinalAnswerStep,
     ToolCall
 )
+from src.memory.context_budget import ContextBudgeter
 
 __all__ = [
     "AgentMemory",
@@ -19,5 +20,6 @@ __all__ = [
     "SystemPromptStep",
     "UserPromptStep",
     "FinalAnswerStep",
-    "ToolCall"
+    "ToolCall",
+    "ContextBudgeter",
 ]
\ No newline at end of file
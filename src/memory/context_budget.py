@@ -0,0 +1,115 @@
+import os
+from typing import List, Optional, Set
+
+from src.models import ChatMessage
+from src.logger import logger
+from src.utils import get_context_window
+from src.memory.memory import AgentMemory, ActionStep, MemoryStep, PlanningStep
+
+# Tokens kept free for the model output and the tool schemas sent along with the messages
+CONTEXT_RESERVED_TOKENS = int(os.getenv('CONTEXT_RESERVED_TOKENS', 16384))
+# Number of most recent action steps only elided when eliding everything older was not enough
+CONTEXT_KEEP_LAST_STEPS = int(os.getenv('CONTEXT_KEEP_LAST_STEPS', 3))
+
+
+class ContextBudgeter():
+    """Assembles the memory into messages that fit the model context window.
+
+    Token counts are cached on the memory steps, so only the new steps are tokenized at each call.
+    When the memory outgrows the budget, the lowest-priority content is reduced first:
+
+    1. observations repeated by a later step (e.g. the same search results), oldest first,
+    2. observations and images of the older action steps, oldest first,
+    3. observations of the recent action steps but the last one,
+    4. whole older action steps and plans, oldest first. The task, the latest plan and the last step are kept.
+
+    Parameters:
+        model_id (`str`): Model the messages are sent to, used to pick the tokenizer and the context window.
+        max_tokens (`int`, *optional*): Context window, defaults to the known window of the model.
+        reserved_tokens (`int`): Tokens kept free for the output and the tool schemas.
+        keep_last_steps (`int`): Number of recent action steps protected until step 3.
+    """
+
+    def __init__(self,
+                 model_id: str,
+                 max_tokens: Optional[int] = None,
+                 reserved_tokens: int = CONTEXT_RESERVED_TOKENS,
+                 keep_last_steps: int = CONTEXT_KEEP_LAST_STEPS):
+        self.model_id = model_id or ""
+        self.budget = (max_tokens or get_context_window(self.model_id)) - reserved_tokens
+        self.keep_last_steps = keep_last_steps
+
+    def _get_elision_order(self, steps: List[MemoryStep]) -> List[int]:
+        action_indexes = [index for index, step in enumerate(steps) if isinstance(step, ActionStep)]
+        if not action_indexes:
+            return []
+        last_index = action_indexes[-1]
+        recent_indexes = set(action_indexes[-self.keep_last_steps:]) if self.keep_last_steps > 0 else set()
+
+        seen_observations = set()
+        duplicate_indexes = []
+        for index in reversed(action_indexes):
+            observations = steps[index].observations
+            if observations:
+                if observations in seen_observations:
+                    duplicate_indexes.append(index)
+                seen_observations.add(observations)
+        duplicate_indexes.reverse()
+
+        order = duplicate_indexes
+        order += [index for index in action_indexes if index not in recent_indexes and index not in order]
+        order += [index for index in action_indexes if index != last_index and index not in order]
+        return order
+
+    def _get_drop_order(self, steps: List[MemoryStep]) -> List[int]:
+        plan_indexes = [index for index, step in enumerate(steps) if isinstance(step, PlanningStep)]
+        action_indexes = [index for index, step in enumerate(steps) if isinstance(step, ActionStep)]
+        protected = set(plan_indexes[-1:] + action_indexes[-1:])
+        return [index for index in sorted(plan_indexes + action_indexes) if index not in protected]
+
+    def fit(self, memory: AgentMemory, summary_mode: bool = False) -> List[ChatMessage]:
+        head = [memory.system_prompt]
+        tail = [memory.user_prompt] if memory.user_prompt is not None else []
+        steps = list(memory.steps)
+
+        step_token_counts = [step.get_token_count(self.model_id, summary_mode=summary_mode) for step in steps]
+        total_tokens = sum(step.get_token_count(self.model_id, summary_mode=summary_mode) for step in head + tail)
+        total_tokens += sum(step_token_counts)
+
+        elided: Set[int] = set()
+        dropped: Set[int] = set()
+        if total_tokens > self.budget:
+            initial_tokens = total_tokens
+            for index in self._get_elision_order(steps):
+                if total_tokens <= self.budget:
+                    break
+                elided_token_count = steps[index].get_token_count(self.model_id, summary_mode=summary_mode, elided=True)
+                total_tokens -= step_token_counts[index] - elided_token_count
+                step_token_counts[index] = elided_token_count
+                elided.add(index)
+            for index in self._get_drop_order(steps):
+                if total_tokens <= self.budget:
+                    break
+                total_tokens -= step_token_counts[index]
+                dropped.add(index)
+
+            logger.info(f"Context of {initial_tokens} tokens exceeds the {self.budget} tokens budget of {self.model_id}, "
+                        f"elided {len(elided - dropped)} and dropped {len(dropped)} steps ({total_tokens} tokens left)")
+            if total_tokens > self.budget:
+                logger.warning(f"Context of {total_tokens} tokens still exceeds the {self.budget} tokens budget "
+                               f"of {self.model_id}")
+
+        messages = []
+        for step in head:
+            messages.extend(step.get_messages(summary_mode=summary_mode))
+        for index, step in enumerate(steps):
+            if index not in dropped:
+                messages.extend(step.get_messages(summary_mode=summary_mode, elided=index in elided))
+        for step in tail:
+            messages.extend(step.get_messages(summary_mode=summary_mode))
+        return messages
+
+
+__all__ = [
+    "ContextBudgeter",
+]
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, TypedDict, Union, Optional
 
 from src.models import ChatMessage, MessageRole
 from src.exception import AgentError
-from src.utils import make_json_serializable
+from src.utils import make_json_serializable, truncate_content, get_message_token_count
 from src.logger import LogLevel, AgentLogger, Timing, TokenUsage
 
 
@@ -11,6 +11,9 @@ from src.logger import LogLevel, AgentLogger, Timing, TokenUsage
 if TYPE_CHECKING:
     import PIL.Image
 
+# Characters of an observation kept when it is elided to fit the context window
+ELIDED_OBSERVATION_LENGTH = 1000
+
 
 @dataclass
 class ToolCall:
@@ -31,12 +34,51 @@ class ToolCall:
 
 @dataclass
 class MemoryStep:
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Any change to the step invalidates the messages and token counts cached on it
+        self.__dict__.pop("_messages_cache", None)
+        self.__dict__.pop("_token_count_cache", None)
+        super().__setattr__(name, value)
+
     def dict(self):
         return asdict(self)
 
     def to_messages(self, summary_mode: bool = False) -> list[ChatMessage]:
         raise NotImplementedError
 
+    def to_elided_messages(self, summary_mode: bool = False) -> list[ChatMessage]:
+        """Shorter messages used when the step does not fit the context window. Defaults to `to_messages`."""
+        return self.to_messages(summary_mode=summary_mode)
+
+    def is_final(self) -> bool:
+        return True
+
+    def get_messages(self, summary_mode: bool = False, elided: bool = False) -> list[ChatMessage]:
+        """`to_messages` (or `to_elided_messages`), cached once the step is final.
+
+        Returning the same `ChatMessage` objects on every call lets the model's `MessageManager`
+        reuse their converted form instead of converting the whole history at each step.
+        """
+        to_messages = self.to_elided_messages if elided else self.to_messages
+        if not self.is_final():
+            return to_messages(summary_mode=summary_mode)
+        messages_cache = self.__dict__.setdefault("_messages_cache", {})
+        if (summary_mode, elided) not in messages_cache:
+            messages_cache[(summary_mode, elided)] = to_messages(summary_mode=summary_mode)
+        return list(messages_cache[(summary_mode, elided)])
+
+    def get_token_count(self, model: str, summary_mode: bool = False, elided: bool = False) -> int:
+        """Tokens of the step messages for the given model, cached once the step is final."""
+        key = (model, summary_mode, elided)
+        token_count_cache = self.__dict__.get("_token_count_cache", {})
+        if key in token_count_cache:
+            return token_count_cache[key]
+        token_count = sum(get_message_token_count(message, model)
+                          for message in self.get_messages(summary_mode=summary_mode, elided=elided))
+        if self.is_final():
+            self.__dict__.setdefault("_token_count_cache", {})[key] = token_count
+        return token_count
+
 
 @dataclass
 class ActionStep(MemoryStep):
@@ -72,7 +114,13 @@ class ActionStep(MemoryStep):
             "is_final_answer": self.is_final_answer,
         }
 
-    def to_messages(self, summary_mode: bool = False) -> list[ChatMessage]:
+    def is_final(self) -> bool:
+        return self.timing.end_time is not None
+
+    def to_elided_messages(self, summary_mode: bool = False) -> list[ChatMessage]:
+        return self.to_messages(summary_mode=summary_mode, elide_observations=True)
+
+    def to_messages(self, summary_mode: bool = False, elide_observations: bool = False) -> list[ChatMessage]:
         messages = []
         if self.model_output is not None and not summary_mode:
             messages.append(
@@ -92,7 +140,7 @@ class ActionStep(MemoryStep):
                 )
             )
 
-        if self.observations_images:
+        if self.observations_images and not elide_observations:
             messages.append(
                 ChatMessage(
                     role=MessageRole.USER,
@@ -107,13 +155,16 @@ class ActionStep(MemoryStep):
             )
 
         if self.observations is not None:
+            observations = self.observations
+            if elide_observations:
+                observations = truncate_content(observations, max_length=ELIDED_OBSERVATION_LENGTH)
             messages.append(
                 ChatMessage(
                     role=MessageRole.TOOL_RESPONSE,
                     content=[
                         {
                             "type": "text",
-                            "text": f"Observation:\n{self.observations}",
+                            "text": f"Observation:\n{observations}",
                         }
                     ],
                 )
@@ -6,12 +6,15 @@ from .base import (
                   Model,
                   parse_json_if_needed,
                   agglomerate_stream_deltas,
+                  ChatMessageStreamAccumulator,
                   CODEAGENT_RESPONSE_FORMAT,
                   )
 from .litellm import LiteLLMModel
 from .openaillm import OpenAIServerModel
 from .models import ModelManager
 from .message_manager import MessageManager
+from .cache import ResponseCache, response_cache
+from .router import RouterModel
 
 model_manager = ModelManager()
 
@@ -25,4 +28,7 @@ __all__ = [
     "model_manager",
     "ModelManager",
     "MessageManager",
+    "ResponseCache",
+    "response_cache",
+    "RouterModel",
 ]
\ No newline at end of file
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import contextlib
 import json
 import json5
 import logging
@@ -26,9 +27,12 @@ from threading import Thread
 from typing import TYPE_CHECKING, Any
 
 from src.logger import TokenUsage
+from src.models.cache import ResponseCache, is_deterministic, response_cache as default_response_cache
+from src.models.rate_limiter import ModelRateLimiter, estimate_prompt_tokens
 from src.utils import (_is_package_available,
-                       encode_image_base64, 
-                       make_image_url, 
+                       encode_image_cached,
+                       make_image_url_cached,
+                       get_image_policy,
                        parse_json_blob)
 
 
@@ -175,65 +179,132 @@ class MessageRole(str, Enum):
         return [r.value for r in cls]
 
 
+class ChatMessageStreamAccumulator:
+    """
+    Folds stream deltas into a message as they arrive.
+
+    Each delta is added in O(1): content and tool call arguments are kept as lists of chunks and only
+    joined when the message is built, so rendering the partial message at a fixed frame rate does not
+    re-walk the whole stream.
+    """
+
+    def __init__(self, role: MessageRole = MessageRole.ASSISTANT):
+        self.role = role
+        self.content_chunks: list[str] = []
+        self.tool_calls: dict[int, ChatMessageToolCallStreamDelta] = {}
+        self.arguments_chunks: dict[int, list[str]] = {}
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cached_input_tokens = 0
+        self.cache_creation_input_tokens = 0
+
+    def add(self, stream_delta: ChatMessageStreamDelta) -> None:
+        if stream_delta.token_usage:
+            self.input_tokens += stream_delta.token_usage.input_tokens
+            self.output_tokens += stream_delta.token_usage.output_tokens
+            self.cached_input_tokens += stream_delta.token_usage.cached_input_tokens
+            self.cache_creation_input_tokens += stream_delta.token_usage.cache_creation_input_tokens
+        if stream_delta.content:
+            self.content_chunks.append(stream_delta.content)
+        if stream_delta.tool_calls:
+            for tool_call_delta in stream_delta.tool_calls:  # Normally there should be only one call at a time
+                if tool_call_delta.index is None:
+                    raise ValueError(f"Any call index is not provided in tool delta: {tool_call_delta}")
+                if tool_call_delta.index not in self.tool_calls:
+                    self.tool_calls[tool_call_delta.index] = ChatMessageToolCallStreamDelta(
+                        id=tool_call_delta.id,
+                        type=tool_call_delta.type,
+                        function=ChatMessageToolCallFunction(name="", arguments=""),
+                    )
+                    self.arguments_chunks[tool_call_delta.index] = []
+                # Update the tool call at the specific index
+                tool_call = self.tool_calls[tool_call_delta.index]
+                if tool_call_delta.id:
+                    tool_call.id = tool_call_delta.id
+                if tool_call_delta.type:
+                    tool_call.type = tool_call_delta.type
+                if tool_call_delta.function:
+                    if tool_call_delta.function.name and len(tool_call_delta.function.name) > 0:
+                        tool_call.function.name = tool_call_delta.function.name
+                    if tool_call_delta.function.arguments:
+                        self.arguments_chunks[tool_call_delta.index].append(tool_call_delta.function.arguments)
+
+    @property
+    def content(self) -> str:
+        return self._join(self.content_chunks)
+
+    @staticmethod
+    def _join(chunks: list[str]) -> str:
+        # Collapse the chunks so the next join only covers what arrived since
+        if len(chunks) > 1:
+            chunks[:] = ["".join(chunks)]
+        return chunks[0] if chunks else ""
+
+    def to_chat_message(self) -> ChatMessage:
+        return ChatMessage(
+            role=self.role,
+            content=self.content,
+            tool_calls=[
+                ChatMessageToolCall(
+                    function=ChatMessageToolCallFunction(
+                        name=tool_call_stream_delta.function.name,
+                        arguments=self._join(self.arguments_chunks[index]),
+                    ),
+                    id=tool_call_stream_delta.id or "",
+                    type="function",
+                )
+                for index, tool_call_stream_delta in self.tool_calls.items()
+            ],
+            token_usage=TokenUsage(
+                input_tokens=self.input_tokens,
+                output_tokens=self.output_tokens,
+                cached_input_tokens=self.cached_input_tokens,
+                cache_creation_input_tokens=self.cache_creation_input_tokens,
+            ),
+        )
+
+    def render_as_markdown(self) -> str:
+        return self.to_chat_message().render_as_markdown()
+
+
 def agglomerate_stream_deltas(
     stream_deltas: list[ChatMessageStreamDelta], role: MessageRole = MessageRole.ASSISTANT
 ) -> ChatMessage:
     """
     Agglomerate a list of stream deltas into a single stream delta.
     """
-    accumulated_tool_calls: dict[int, ChatMessageToolCallStreamDelta] = {}
-    accumulated_content = ""
-    total_input_tokens = 0
-    total_output_tokens = 0
+    accumulator = ChatMessageStreamAccumulator(role=role)
     for stream_delta in stream_deltas:
-        if stream_delta.token_usage:
-            total_input_tokens += stream_delta.token_usage.input_tokens
-            total_output_tokens += stream_delta.token_usage.output_tokens
-        if stream_delta.content:
-            accumulated_content += stream_delta.content
-        if stream_delta.tool_calls:
-            for tool_call_delta in stream_delta.tool_calls:  # ?ormally there should be only one call at a time
-                # Extend accumulated_tool_calls list to accommodate the new tool call if needed
-                if tool_call_delta.index is not None:
-                    if tool_call_delta.index not in accumulated_tool_calls:
-                        accumulated_tool_calls[tool_call_delta.index] = ChatMessageToolCallStreamDelta(
-                            id=tool_call_delta.id,
-                            type=tool_call_delta.type,
-                            function=ChatMessageToolCallFunction(name="", arguments=""),
-                        )
-                    # Update the tool call at the specific index
-                    tool_call = accumulated_tool_calls[tool_call_delta.index]
-                    if tool_call_delta.id:
-                        tool_call.id = tool_call_delta.id
-                    if tool_call_delta.type:
-                        tool_call.type = tool_call_delta.type
-                    if tool_call_delta.function:
-                        if tool_call_delta.function.name and len(tool_call_delta.function.name) > 0:
-                            tool_call.function.name = tool_call_delta.function.name
-                        if tool_call_delta.function.arguments:
-                            tool_call.function.arguments += tool_call_delta.function.arguments
-                else:
-                    raise ValueError(f"Any call index is not provided in tool delta: {tool_call_delta}")
+        accumulator.add(stream_delta)
+    return accumulator.to_chat_message()
 
-    return ChatMessage(
-        role=role,
-        content=accumulated_content,
-        tool_calls=[
-            ChatMessageToolCall(
-                function=ChatMessageToolCallFunction(
-                    name=tool_call_stream_delta.function.name,
-                    arguments=tool_call_stream_delta.function.arguments,
-                ),
-                id=tool_call_stream_delta.id or "",
-                type="function",
-            )
-            for tool_call_stream_delta in accumulated_tool_calls.values()
-            if tool_call_stream_delta.function
-        ],
-        token_usage=TokenUsage(
-            input_tokens=total_input_tokens,
-            output_tokens=total_output_tokens,
-        ),
+
+def get_token_usage(usage: Any) -> TokenUsage:
+    """Build a `TokenUsage` from a provider usage object or dict.
+
+    Handles the chat completions (`prompt_tokens`) and responses (`input_tokens`) shapes, and the prompt
+    cache counters reported by OpenAI (`*_tokens_details.cached_tokens`) and Anthropic (`cache_*_input_tokens`).
+    """
+    def get(obj: Any, key: str) -> Any:
+        if obj is None:
+            return None
+        return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+    input_tokens = get(usage, "prompt_tokens")
+    if input_tokens is None:
+        input_tokens = get(usage, "input_tokens")
+    output_tokens = get(usage, "completion_tokens")
+    if output_tokens is None:
+        output_tokens = get(usage, "output_tokens")
+
+    details = get(usage, "prompt_tokens_details") or get(usage, "input_tokens_details")
+    cached_input_tokens = get(details, "cached_tokens") or get(usage, "cache_read_input_tokens")
+
+    return TokenUsage(
+        input_tokens=input_tokens or 0,
+        output_tokens=output_tokens or 0,
+        cached_input_tokens=cached_input_tokens or 0,
+        cache_creation_input_tokens=get(usage, "cache_creation_input_tokens") or 0,
     )
 
 
@@ -307,11 +378,11 @@ def get_clean_message_list(
                         element.update(
                             {
                                 "type": "image_url",
-                                "image_url": {"url": make_image_url(encode_image_base64(element.pop("image")))},
+                                "image_url": {"url": make_image_url_cached(element.pop("image"))},
                             }
                         )
                     else:
-                        element["image"] = encode_image_base64(element["image"])
+                        element["image"] = encode_image_cached(element["image"], get_image_policy(raw=True))
 
         if len(output_message_list) > 0 and message.role == output_message_list[-1]["role"]:
             assert isinstance(message.content, list), "Error: wrong content:" + str(message.content)
@@ -1033,20 +1104,72 @@ class ApiModel(Model):
             Mapping to convert  between internal role names and API-specific role names. Defaults to None.
         client (`Any`, **optional**):
             Pre-configured API client instance. If not provided, a default client will be created. Defaults to None.
+        use_cache (`bool`, **optional**):
+            Whether identical requests may be served from the response cache. Deterministic requests (temperature 0)
+            are cached by default, sampled ones only when `use_cache=True` is passed to `generate`. `False` opts the
+            model out of the cache, whatever the calls pass. Defaults to True.
+        response_cache (`ResponseCache`, **optional**):
+            Cache used for the responses. Defaults to the process-wide `response_cache`.
+        rate_limiter (`ModelRateLimiter`, **optional**):
+            Limiter shared by every caller of the model, set by `ModelManager`. Defaults to None (no limits).
         **kwargs: Additional keyword arguments to pass to the parent class.
     """
 
     def __init__(
-        self, model_id: str, custom_role_conversions: dict[str, str] | None = None, client: Any | None = None, **kwargs
+        self,
+        model_id: str,
+        custom_role_conversions: dict[str, str] | None = None,
+        client: Any | None = None,
+        use_cache: bool = True,
+        response_cache: ResponseCache | None = None,
+        rate_limiter: ModelRateLimiter | None = None,
+        **kwargs,
     ):
         super().__init__(model_id=model_id, **kwargs)
         self.custom_role_conversions = custom_role_conversions or {}
+        self.use_cache = use_cache
+        self.response_cache = response_cache or default_response_cache
+        self.rate_limiter = rate_limiter
         self.client = client or self.create_client()
 
     def create_client(self):
         """Create the API client for the specific service."""
         raise NotImplementedError("Subclasses must implement this method to create a client")
 
+    async def _get_cached_message(
+        self, completion_kwargs: dict[str, Any], use_cache: bool | None = None
+    ) -> tuple[str | None, ChatMessage | None]:
+        """Look up the prepared request in the response cache.
+
+        Returns the cache key (None when caching is off for this call) and the cached message, if any.
+        Sampled requests are only cached when `use_cache=True` is passed, replaying them would hide the
+        variety of their answers. Cached messages report zero token usage since no tokens were spent on them.
+        """
+        if use_cache is None:
+            use_cache = is_deterministic(completion_kwargs)
+        if not (self.use_cache and use_cache) or not self.response_cache.enabled:
+            return None, None
+        cache_key = self.response_cache.make_key(completion_kwargs)
+        data = await self.response_cache.aget(cache_key)
+        if data is None:
+            return cache_key, None
+        logger.debug(f"Response cache hit for model {self.model_id}")
+        return cache_key, ChatMessage.from_dict(deepcopy(data), token_usage=TokenUsage(input_tokens=0, output_tokens=0))
+
+    async def _set_cached_message(self, cache_key: str | None, message: ChatMessage) -> None:
+        if cache_key is not None:
+            await self.response_cache.aset(cache_key, get_dict_from_nested_dataclasses(message, ignore_key="raw"))
+
+    def _rate_limit(self, completion_kwargs: dict[str, Any]):
+        """Async context manager holding a slot of the model's rate limiter for one request."""
+        if self.rate_limiter is None:
+            return contextlib.nullcontext()
+        return self.rate_limiter.limit(estimate_prompt_tokens(completion_kwargs))
+
+    def _record_usage(self, token_usage: TokenUsage | None) -> None:
+        if self.rate_limiter is not None and token_usage is not None:
+            self.rate_limiter.record_usage(token_usage.output_tokens)
+
 
 class LiteLLMModel(ApiModel):
     """Model to use [LiteLLM Python SDK](https://docs.litellm.ai/docs/#litellm-python-sdk) to access hundreds of LLMs.
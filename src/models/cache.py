@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import zlib
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from src.logger import logger
+
+load_dotenv(verbose=True)
+
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join(os.path.expanduser('~'), '.cache', 'deepresearchagent', 'llm_cache.sqlite'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 1024))
+LLM_CACHE_MAX_SIZE = int(os.getenv('LLM_CACHE_MAX_SIZE', 512 * 1024 * 1024))
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', 7 * 24 * 3600))
+
+# Keys of the completion kwargs that do not change the answer of the model
+EXCLUDED_KEY_FIELDS = {"client", "http_client", "api_key", "api_base", "stream_options"}
+
+
+def is_deterministic(completion_kwargs: Dict[str, Any]) -> bool:
+    """Whether a request asks for a single greedy answer, which is safe to replay from the cache."""
+    return completion_kwargs.get("temperature") == 0 and completion_kwargs.get("n", 1) == 1
+
+
+class ResponseCache():
+    """Content-addressed cache for model responses.
+
+    Entries are keyed on a canonical hash of the prepared completion kwargs. Lookups first
+    hit an in-process LRU and then a SQLite file, which survives across runs. The disk tier
+    drops entries older than `ttl` and evicts the least recently used rows once the stored
+    payloads exceed `max_size` bytes. `aget` and `aset` run the disk tier in a thread, for use from
+    the event loop.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = LLM_CACHE_PATH,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 max_size: int = LLM_CACHE_MAX_SIZE,
+                 ttl: Optional[float] = LLM_CACHE_TTL,
+                 enabled: bool = LLM_CACHE_ENABLED):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+
+        self._memory: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        # The memory tier is never blocked by the disk I/O, which can run in threads
+        self._memory_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+    @staticmethod
+    def make_key(completion_kwargs: Dict[str, Any]) -> str:
+        payload = {k: v for k, v in completion_kwargs.items() if k not in EXCLUDED_KEY_FIELDS}
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                    "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at)")
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to open the response cache at {self.path}, using memory only: {e}")
+                self.path = None
+        return self._conn
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        with self._memory_lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._memory_lock:
+            if key not in self._memory:
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+            self.memory_hits += 1
+            return self._memory[key]
+
+    def _get_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                now = time.time()
+                row = conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if self._is_expired(created_at, now):
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        conn.commit()
+                    else:
+                        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        conn.commit()
+                        value = json.loads(zlib.decompress(value).decode("utf-8"))
+                        self._remember(key, value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+
+            self.misses += 1
+            return None
+
+    def _set_disk(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return
+            now = time.time()
+            blob = zlib.compress(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._get_memory(key)
+        return value if value is not None else self._get_disk(key)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._remember(key, value)
+        self._set_disk(key, value)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._get_memory(key)
+        return value if value is not None else await asyncio.to_thread(self._get_disk, key)
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        self._remember(key, value)
+        await asyncio.to_thread(self._set_disk, key, value)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl is not None:
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def clear(self) -> None:
+        with self._memory_lock:
+            self._memory.clear()
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+
+response_cache = ResponseCache()
+
+__all__ = [
+    "ResponseCache",
+    "is_deterministic",
+    "response_cache",
+]
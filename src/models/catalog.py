@@ -0,0 +1,265 @@
+import os
+import importlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from collections.abc import MutableMapping
+
+from dotenv import load_dotenv
+load_dotenv(verbose=True)
+
+from src.logger import logger
+
+custom_role_conversions = {"tool-call": "assistant", "tool-response": "user"}
+PLACEHOLDER = "PLACEHOLDER"
+
+# Model classes by spec type, imported only when a model of the type is first used
+MODEL_TYPES: Dict[str, Tuple[str, str]] = {
+    "litellm": ("src.models.litellm", "LiteLLMModel"),
+    "openai": ("src.models.openaillm", "OpenAIServerModel"),
+    "inference_client": ("src.models.hfllm", "InferenceClientModel"),
+    "restful": ("src.models.restful", "RestfulModel"),
+    "restful_response": ("src.models.restful", "RestfulResponseModel"),
+    "restful_transcribe": ("src.models.restful", "RestfulTranscribeModel"),
+    "restful_imagen": ("src.models.restful", "RestfulImagenModel"),
+    "restful_veo_predict": ("src.models.restful", "RestfulVeoPridictModel"),
+    "restful_veo_fetch": ("src.models.restful", "RestfulVeoFetchModel"),
+    "langchain": ("langchain_openai", "ChatOpenAI"),
+}
+
+
+@dataclass
+class ModelSpec:
+    """Lightweight description of a model, built into a client on first access.
+
+    Attributes:
+        model_name: Name the model is registered under.
+        model_type: Key of `MODEL_TYPES`.
+        model_id: Model identifier sent to the provider.
+        api_key: Environment variables of the API key, the first one falling back to the second.
+        api_base: Environment variables of the API base, the first one falling back to the second.
+        async_client: Whether to connect through an `AsyncOpenAI` client built from the key and base.
+        shared_http_client: Whether to use the pooled HTTP clients of `src.proxy`.
+        kwargs: Additional keyword arguments of the model class.
+    """
+    model_name: str
+    model_type: str
+    model_id: str
+    api_key: Optional[Tuple[str, str]] = None
+    api_base: Optional[Tuple[str, str]] = None
+    async_client: bool = False
+    shared_http_client: bool = True
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def check_local_api_key(local_api_key_name: str, remote_api_key_name: str) -> str:
+    api_key = os.getenv(local_api_key_name, PLACEHOLDER)
+    if api_key == PLACEHOLDER:
+        logger.warning(f"Local API key {local_api_key_name} is not set, using remote API key {remote_api_key_name}")
+        api_key = os.getenv(remote_api_key_name, PLACEHOLDER)
+    return api_key
+
+
+def check_local_api_base(local_api_base_name: str, remote_api_base_name: str) -> str:
+    api_base = os.getenv(local_api_base_name, PLACEHOLDER)
+    if api_base == PLACEHOLDER:
+        logger.warning(f"Local API base {local_api_base_name} is not set, using remote API base {remote_api_base_name}")
+        api_base = os.getenv(remote_api_base_name, PLACEHOLDER)
+    return api_base
+
+
+def build_model(spec: ModelSpec) -> Any:
+    """Import the model class of a spec and build the model with its client."""
+    module_name, class_name = MODEL_TYPES[spec.model_type]
+    model_class = getattr(importlib.import_module(module_name), class_name)
+
+    api_key = check_local_api_key(*spec.api_key) if spec.api_key else None
+    api_base = check_local_api_base(*spec.api_base) if spec.api_base else None
+
+    http_clients = {}
+    if spec.shared_http_client:
+        from src.proxy.local_proxy import HTTP_CLIENT, ASYNC_HTTP_CLIENT
+        http_clients = dict(http_client=HTTP_CLIENT, async_http_client=ASYNC_HTTP_CLIENT)
+
+    if spec.model_type == "langchain":
+        kwargs = dict(model=spec.model_id, api_key=api_key, base_url=api_base)
+        if http_clients:
+            kwargs.update(http_client=http_clients["http_client"], http_async_client=http_clients["async_http_client"])
+        return model_class(**kwargs, **spec.kwargs)
+
+    kwargs = dict(model_id=spec.model_id, custom_role_conversions=custom_role_conversions)
+    if spec.async_client:
+        from openai import AsyncOpenAI
+        client_kwargs = dict(http_client=http_clients["async_http_client"]) if http_clients else {}
+        kwargs["http_client"] = AsyncOpenAI(api_key=api_key, base_url=api_base, **client_kwargs)
+    elif spec.model_type.startswith("restful"):
+        kwargs.update(api_key=api_key, api_base=api_base, **http_clients)
+    else:
+        if api_key is not None:
+            kwargs["api_key"] = api_key
+        if api_base is not None:
+            kwargs["api_base"] = api_base
+    return model_class(**kwargs, **spec.kwargs)
+
+
+class ModelRegistry(MutableMapping):
+    """Models by name, each built by its factory the first time it is accessed.
+
+    Membership tests and iteration over the names never build a model, `values()` and `items()` build them all.
+    `on_build` is called with the name and the model right after a model is built.
+    """
+
+    def __init__(self, on_build: Optional[Callable[[str, Any], None]] = None):
+        self.factories: Dict[str, Callable[[], Any]] = {}
+        self.models: Dict[str, Any] = {}
+        self.on_build = on_build
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self.factories[name] = factory
+        self.models.pop(name, None)
+
+    def is_built(self, name: str) -> bool:
+        return name in self.models
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.models:
+            return self.models[name]
+        if name not in self.factories:
+            raise KeyError(name)
+        model = self.factories[name]()
+        self.models[name] = model
+        if self.on_build is not None:
+            self.on_build(name, model)
+        return model
+
+    def __setitem__(self, name: str, model: Any) -> None:
+        self.factories.pop(name, None)
+        self.models[name] = model
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self.factories.pop(name, None)
+        self.models.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.models or name in self.factories
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.factories
+        yield from (name for name in self.models if name not in self.factories)
+
+    def __len__(self) -> int:
+        return len(self.factories.keys() | self.models.keys())
+
+
+def get_model_catalog(use_local_proxy: bool = False) -> List[ModelSpec]:
+    """Specs of every model available with or without the local proxy."""
+    if use_local_proxy:
+        skywork_openai_key = ("SKYWORK_API_KEY", "OPENAI_API_KEY")
+        azure_us_base = ("SKYWORK_AZURE_US_API_BASE", "OPENAI_API_BASE")
+        skywork_anthropic_key = ("SKYWORK_API_KEY", "ANTHROPIC_API_KEY")
+        openrouter_anthropic_base = ("SKYWORK_OPENROUTER_US_API_BASE", "ANTHROPIC_API_BASE")
+        skywork_google_key = ("SKYWORK_API_KEY", "GOOGLE_API_KEY")
+        google_base = ("SKYWORK_GOOGLE_API_BASE", "GOOGLE_API_BASE")
+        skywork_deepseek_key = ("SKYWORK_API_KEY", "SKYWORK_API_KEY")
+        deepseek_base = ("SKYWORK_DEEPSEEK_API_BASE", "SKYWORK_API_BASE")
+
+        catalog = [
+            # OpenAI
+            ModelSpec("gpt-4o", "litellm", "openai/gpt-4o",
+                      api_key=skywork_openai_key, api_base=azure_us_base, async_client=True),
+            ModelSpec("gpt-4.1", "litellm", "openai/gpt-4.1",
+                      api_key=skywork_openai_key, api_base=azure_us_base, async_client=True),
+            ModelSpec("o1", "litellm", "openai/o1",
+                      api_key=skywork_openai_key, api_base=azure_us_base, async_client=True),
+            ModelSpec("o3", "restful", "openai/o3",
+                      api_key=skywork_openai_key, api_base=azure_us_base,
+                      kwargs=dict(api_type="chat/completions")),
+            ModelSpec("gpt-4o-search-preview", "litellm", "gpt-4o-search-preview",
+                      api_key=skywork_openai_key, api_base=("SKYWORK_OPENROUTER_US_API_BASE", "OPENAI_API_BASE"),
+                      async_client=True),
+            ModelSpec("whisper", "restful_transcribe", "whisper",
+                      api_key=skywork_openai_key, api_base=("SKYWORK_AZURE_BJ_API_BASE", "OPENAI_API_BASE"),
+                      kwargs=dict(api_type="whisper")),
+            ModelSpec("o3-deep-research", "restful_response", "o3-deep-research",
+                      api_key=skywork_openai_key, api_base=("SKYWORK_SHUBIAOBIAO_API_BASE", "OPENAI_API_BASE"),
+                      kwargs=dict(api_type="responses")),
+            ModelSpec("gpt-5", "litellm", "openai/gpt-5",
+                      api_key=skywork_openai_key, api_base=azure_us_base, async_client=True),
+            # Anthropic
+            ModelSpec("claude37-sonnet", "openai", "claude37-sonnet",
+                      api_key=skywork_anthropic_key, api_base=openrouter_anthropic_base, async_client=True),
+            ModelSpec("claude-3.7-sonnet-thinking", "openai", "claude-3.7-sonnet-thinking",
+                      api_key=skywork_anthropic_key, api_base=openrouter_anthropic_base, async_client=True),
+            ModelSpec("claude-4-sonnet", "openai", "claude-4-sonnet",
+                      api_key=skywork_anthropic_key, api_base=openrouter_anthropic_base, async_client=True),
+            # Google
+            ModelSpec("gemini-2.5-pro", "openai", "gemini-2.5-pro-preview-06-05",
+                      api_key=skywork_google_key, api_base=("SKYWORK_OPENROUTER_BJ_API_BASE", "GOOGLE_API_BASE"),
+                      async_client=True),
+            ModelSpec("imagen", "restful_imagen", "imagen-3.0-generate-001",
+                      api_key=skywork_google_key, api_base=google_base, kwargs=dict(api_type="imagen")),
+            ModelSpec("veo3-predict", "restful_veo_predict", "veo-3.0-generate-preview",
+                      api_key=skywork_google_key, api_base=google_base, kwargs=dict(api_type="veo/predict")),
+            ModelSpec("veo3-fetch", "restful_veo_fetch", "veo-3.0-generate-preview",
+                      api_key=skywork_google_key, api_base=google_base, kwargs=dict(api_type="veo/fetch")),
+            # LangChain
+            *[ModelSpec(f"langchain-{model_id}", "langchain", model_id,
+                        api_key=skywork_openai_key, api_base=("SKYWORK_API_BASE", "OPENAI_API_BASE"))
+              for model_id in ["gpt-4o", "gpt-4.1", "o3"]],
+            # DeepSeek
+            ModelSpec("deepseek-chat", "openai", "deepseek-chat",
+                      api_key=skywork_deepseek_key, api_base=deepseek_base, async_client=True),
+            ModelSpec("deepseek-reasoner", "openai", "deepseek-reasoner",
+                      api_key=skywork_deepseek_key, api_base=deepseek_base, async_client=True),
+        ]
+        # The remote OpenAI deployments when configured, e.g. as the alternate members of a route
+        if os.getenv("OPENAI_API_KEY") and os.getenv("OPENAI_API_BASE"):
+            catalog += [ModelSpec(f"{model_name}-remote", "litellm", model_name,
+                                  api_key=("OPENAI_API_KEY", "OPENAI_API_KEY"),
+                                  api_base=("OPENAI_API_BASE", "OPENAI_API_BASE"))
+                        for model_name in ["gpt-4o", "gpt-4.1"]]
+    else:
+        openai_key = ("OPENAI_API_KEY", "OPENAI_API_KEY")
+        openai_base = ("OPENAI_API_BASE", "OPENAI_API_BASE")
+        anthropic_key = ("ANTHROPIC_API_KEY", "ANTHROPIC_API_KEY")
+        anthropic_base = ("ANTHROPIC_API_BASE", "ANTHROPIC_API_BASE")
+
+        catalog = [
+            # OpenAI
+            *[ModelSpec(model_name, "litellm", model_name, api_key=openai_key, api_base=openai_base)
+              for model_name in ["gpt-4o", "gpt-4.1", "o1", "o3", "gpt-4o-search-preview"]],
+            # Anthropic
+            *[ModelSpec(model_name, "litellm", "claude-3-7-sonnet-20250219", api_key=anthropic_key, api_base=anthropic_base)
+              for model_name in ["claude37-sonnet", "claude37-sonnet-thinking"]],
+            # Google
+            ModelSpec("gemini-2.5-pro", "litellm", "gemini-2.5-pro-preview-06-05",
+                      api_key=("GOOGLE_API_KEY", "GOOGLE_API_KEY")),
+            # LangChain
+            *[ModelSpec(f"langchain-{model_id}", "langchain", model_id,
+                        api_key=openai_key, api_base=openai_base, shared_http_client=False)
+              for model_id in ["gpt-4o", "gpt-4.1", "o3"]],
+        ]
+
+    catalog += [
+        # Qwen through the Hugging Face inference providers
+        ModelSpec("qwen2.5-7b-instruct", "inference_client", "Qwen/Qwen2.5-7B-Instruct"),
+        ModelSpec("qwen2.5-14b-instruct", "inference_client", "Qwen/Qwen2.5-14B-Instruct"),
+        ModelSpec("qwen2.5-32b-instruct", "inference_client", "Qwen/Qwen2.5-32B-Instruct"),
+        # vLLM servers
+        ModelSpec("Qwen", "openai", "Qwen",
+                  api_key=("QWEN_API_KEY", "QWEN_API_KEY"), api_base=("QWEN_API_BASE", "QWEN_API_BASE"),
+                  async_client=True, shared_http_client=False),
+        ModelSpec("Qwen-VL", "openai", "Qwen-VL",
+                  api_key=("QWEN_VL_API_KEY", "QWEN_VL_API_KEY"), api_base=("QWEN_VL_API_BASE", "QWEN_VL_API_BASE"),
+                  async_client=True, shared_http_client=False),
+    ]
+    return catalog
+
+
+__all__ = [
+    "ModelSpec",
+    "ModelRegistry",
+    "build_model",
+    "get_model_catalog",
+]
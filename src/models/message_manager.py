@@ -1,8 +1,11 @@
-from typing import Dict, List, Optional, Any
-from copy import deepcopy
+import json
+import weakref
+from typing import Callable, Dict, List, Optional, Any
+from collections import OrderedDict
+from copy import copy, deepcopy
 
 from src.models.base import MessageRole, ChatMessage
-from src.utils import encode_image_base64, make_image_url
+from src.utils import encode_image_cached, make_image_url_cached, get_image_policy
 
 DEFAULT_ANTHROPIC_MODELS = [
     'claude37-sonnet',
@@ -17,12 +20,107 @@ UNSUPPORTED_STOP_MODELS = [
 UNSUPPORTED_TOOL_CHOICE_MODELS = [
     'claude37-sonnet',
 ]
+# Models taking explicit prompt cache breakpoints, a key also matches every model id containing it.
+# OpenAI and Gemini cache stable prefixes automatically and need no breakpoint.
+PROMPT_CACHE_CONTROL_MODELS = [
+    'claude',
+]
+
+class _CompiledToolSchema():
+    """Tool JSON schema compiled for a model family, with its pre-serialized JSON fragment."""
+    def __init__(self, tool: Any, family: str):
+        self.name = tool.name
+        self.description = tool.description
+        self.parameters = tool.parameters
+
+        properties = deepcopy(tool.parameters['properties'])
+
+        required = []
+        for key, value in properties.items():
+            if value["type"] == "any":
+                value["type"] = "string"
+            if not ("nullable" in value and value["nullable"]):
+                required.append(key)
+
+        if family == "anthropic":
+            self.schema = {
+                "name": tool.name,
+                "description": tool.description,
+                "input_schema": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": required,
+                },
+            }
+        else:
+            self.schema = {
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": {
+                        "type": "object",
+                        "properties": properties,
+                        "required": required,
+                    },
+                },
+            }
+        self.json_fragment = json.dumps(self.schema, default=str)
+
+    def matches(self, tool: Any) -> bool:
+        return (tool.parameters is self.parameters
+                and tool.name == self.name
+                and tool.description == self.description)
+
+
+# Compiled schemas per tool and model family, dropped with the tool
+_TOOL_SCHEMA_CACHE: "weakref.WeakKeyDictionary[Any, dict[str, _CompiledToolSchema]]" = weakref.WeakKeyDictionary()
+# Compiled schemas by id of their schema dict, dropped when the schema is recompiled or its tool goes away
+_TOOL_SCHEMA_FRAGMENTS: "weakref.WeakValueDictionary[int, _CompiledToolSchema]" = weakref.WeakValueDictionary()
+
+
+def dumps_completion_payload(payload: Dict[str, Any]) -> str:
+    """Serialize a request payload, reusing the pre-serialized fragments of compiled tool schemas."""
+    tools = payload.get("tools")
+    if not tools:
+        return json.dumps(payload, default=str)
+
+    fragments = []
+    for tool in tools:
+        compiled = _TOOL_SCHEMA_FRAGMENTS.get(id(tool))
+        if compiled is not None and compiled.schema is tool:
+            fragments.append(compiled.json_fragment)
+        else:
+            fragments.append(json.dumps(tool, default=str))
+
+    body = json.dumps({key: value for key, value in payload.items() if key != "tools"}, default=str)
+    separator = ", " if len(body) > 2 else ""
+    return body[:-1] + separator + '"tools": [' + ", ".join(fragments) + "]}"
+
+
+# Number of message lists (one per agent sharing the model) whose conversion is kept for reuse
+MAX_CONVERSION_CACHE_SIZE = 16
+
+
+class _ConversionState():
+    """Converted output of a message list, with a checkpoint after each input message."""
+    def __init__(self,
+                 messages: list[ChatMessage],
+                 output: list[dict[str, Any]],
+                 checkpoints: list[tuple[int, dict[str, Any]]]):
+        self.messages = messages
+        self.output = output
+        # checkpoints[i] is (len(output), output[-1]) right after converting messages[i]
+        self.checkpoints = checkpoints
+
 
 class MessageManager():
     def __init__(self, model_id: str, api_type: str = "chat/completions"):
         self.model_id = model_id
         self.api_type = api_type
 
+        self._conversion_cache: OrderedDict[tuple, _ConversionState] = OrderedDict()
+
     def get_clean_message_list(self,
             message_list: list[ChatMessage],
             role_conversions: dict[MessageRole, MessageRole] | dict[str, str] = {},
@@ -34,6 +132,10 @@ class MessageManager():
         Creates a list of messages to give as input to the LLM. These messages are dictionaries and chat template compatible with transformers LLM chat template.
         Subsequent messages with the same role will be concatenated to a single message.
 
+        Conversion is incremental: when the list starts with the same `ChatMessage` objects as a previous call
+        (memory steps return their cached messages once final), the converted prefix is reused and only the new
+        tail is processed. Input messages are never modified, and already converted dicts are never mutated.
+
         Args:
             message_list (`list[dict[str, str]]`): List of chat messages.
             role_conversions (`dict[MessageRole, MessageRole]`, *optional* ): Mapping to convert roles.
@@ -46,9 +148,96 @@ class MessageManager():
                 message_list, role_conversions, convert_images_to_image_urls, flatten_messages_as_text
             )
         else:
-            return self._get_chat_completions_message_list(
+            output_message_list = self._get_chat_completions_message_list(
                 message_list, role_conversions, convert_images_to_image_urls, flatten_messages_as_text
             )
+            if self.supports_cache_control():
+                output_message_list = self._add_cache_breakpoints(output_message_list)
+            return output_message_list
+
+    def supports_cache_control(self) -> bool:
+        model_id = self.model_id.split("/")[-1].lower()
+        return any(key in model_id for key in PROMPT_CACHE_CONTROL_MODELS)
+
+    @staticmethod
+    def _add_cache_breakpoints(message_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Marks the end of the stable prompt prefix with `cache_control` breakpoints.
+
+        Breakpoints go on the system prompt (tools and system prompt are cached together), on the message
+        before last, which is still byte-identical at the next step, and on the last message so the next
+        step can read the whole conversation from the cache. Marked dicts are copies, the converted list
+        is shared by the incremental conversion and never modified.
+        """
+        positions = {len(message_list) - 2, len(message_list) - 1}
+        if message_list and message_list[0]["role"] == MessageRole.SYSTEM:
+            positions.add(0)
+
+        output_message_list = list(message_list)
+        for position in sorted(positions):
+            if position < 0:
+                continue
+            message_dict = message_list[position]
+            content = message_dict["content"]
+            if not content:
+                continue
+            if isinstance(content, str):
+                content = [{"type": "text", "text": content}]
+            output_message_list[position] = {
+                **message_dict,
+                "content": content[:-1] + [{**content[-1], "cache_control": {"type": "ephemeral"}}],
+            }
+        return output_message_list
+
+    def _get_incremental_message_list(self,
+            api_type: str,
+            message_list: list[ChatMessage],
+            convert_message: Callable[[ChatMessage], dict[str, Any]],
+            merge_message: Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]],
+            options: tuple,
+    ) -> list[dict[str, Any]]:
+        if not message_list:
+            return []
+
+        # The first message object identifies the conversation, its state holds a reference to it so the id stays unique
+        cache_key = (api_type, options, id(message_list[0]))
+        state = self._conversion_cache.get(cache_key)
+
+        matched = 0
+        if state is not None:
+            for cached_message, message in zip(state.messages, message_list):
+                if cached_message is not message:
+                    break
+                matched += 1
+
+        if matched:
+            length, last_message_dict = state.checkpoints[matched - 1]
+            output_message_list = state.output[:length - 1] + [last_message_dict]
+            checkpoints = state.checkpoints[:matched]
+        else:
+            output_message_list, checkpoints = [], []
+
+        for message in message_list[matched:]:
+            message_dict = convert_message(message)
+            if len(output_message_list) > 0 and message_dict["role"] == output_message_list[-1]["role"]:
+                output_message_list[-1] = merge_message(output_message_list[-1], message_dict)
+            else:
+                output_message_list.append(message_dict)
+            checkpoints.append((len(output_message_list), output_message_list[-1]))
+
+        self._conversion_cache[cache_key] = _ConversionState(list(message_list), output_message_list, checkpoints)
+        self._conversion_cache.move_to_end(cache_key)
+        while len(self._conversion_cache) > MAX_CONVERSION_CACHE_SIZE:
+            self._conversion_cache.popitem(last=False)
+
+        return list(output_message_list)
+
+    @staticmethod
+    def _get_role(message: ChatMessage, role_conversions: dict[MessageRole, MessageRole] | dict[str, str]) -> str:
+        role = message.role
+        if role not in MessageRole.roles():
+            raise ValueError(f"Incorrect role {role}, only {MessageRole.roles()} are supported for now.")
+        return role_conversions.get(role, role)
 
     def _get_chat_completions_message_list(self,
             message_list: list[ChatMessage],
@@ -59,54 +248,58 @@ class MessageManager():
         """
         Creates a list of messages in chat completions format.
         """
-        output_message_list: list[dict[str, Any]] = []
-        message_list = deepcopy(message_list)  # Avoid modifying the original list
-        for message in message_list:
-            role = message.role
-            if role not in MessageRole.roles():
-                raise ValueError(f"Incorrect role {role}, only {MessageRole.roles()} are supported for now.")
-
-            if role in role_conversions:
-                message.role = role_conversions[role]  # type: ignore
+        image_policy = get_image_policy(self.model_id)
+        raw_image_policy = get_image_policy(self.model_id, raw=True)
+
+        def convert_message(message: ChatMessage) -> dict[str, Any]:
+            role = self._get_role(message, role_conversions)
+
+            content = message.content
             # encode images if needed
-            if isinstance(message.content, list):
+            if isinstance(content, list):
+                content = []
                 for element in message.content:
                     assert isinstance(element, dict), "Error: this element should be a dict:" + str(element)
                     if element["type"] == "image":
                         assert not flatten_messages_as_text, f"Cannot use images with {flatten_messages_as_text=}"
                         if convert_images_to_image_urls:
-                            element.update(
-                                {
-                                    "type": "image_url",
-                                    "image_url": {"url": make_image_url(encode_image_base64(element.pop("image")))},
-                                }
-                            )
+                            element = {
+                                **{k: v for k, v in element.items() if k != "image"},
+                                "type": "image_url",
+                                "image_url": {"url": make_image_url_cached(element["image"], image_policy)},
+                            }
                         else:
-                            element["image"] = encode_image_base64(element["image"])
+                            element = {**element, "image": encode_image_cached(element["image"], raw_image_policy)}
+                    content.append(element)
 
-            if len(output_message_list) > 0 and message.role == output_message_list[-1]["role"]:
-                assert isinstance(message.content, list), "Error: wrong content:" + str(message.content)
-                if flatten_messages_as_text:
-                    output_message_list[-1]["content"] += "\n" + message.content[0]["text"]
-                else:
-                    for el in message.content:
-                        if el["type"] == "text" and output_message_list[-1]["content"][-1]["type"] == "text":
-                            # Merge consecutive text messages rather than creating new ones
-                            output_message_list[-1]["content"][-1]["text"] += "\n" + el["text"]
-                        else:
-                            output_message_list[-1]["content"].append(el)
-            else:
-                if flatten_messages_as_text:
-                    content = message.content[0]["text"]
+            if flatten_messages_as_text:
+                content = content[0]["text"]
+            return {
+                "role": role,
+                "content": content,
+            }
+
+        def merge_message(last_message_dict: dict[str, Any], message_dict: dict[str, Any]) -> dict[str, Any]:
+            if flatten_messages_as_text:
+                return {**last_message_dict, "content": last_message_dict["content"] + "\n" + message_dict["content"]}
+
+            assert isinstance(message_dict["content"], list), "Error: wrong content:" + str(message_dict["content"])
+            content = list(last_message_dict["content"])
+            for el in message_dict["content"]:
+                if el["type"] == "text" and content[-1]["type"] == "text":
+                    # Merge consecutive text messages rather than creating new ones
+                    content[-1] = {**content[-1], "text": content[-1]["text"] + "\n" + el["text"]}
                 else:
-                    content = message.content
-                output_message_list.append(
-                    {
-                        "role": message.role,
-                        "content": content,
-                    }
-                )
-        return output_message_list
+                    content.append(el)
+            return {**last_message_dict, "content": content}
+
+        return self._get_incremental_message_list(
+            api_type="chat/completions",
+            message_list=message_list,
+            convert_message=convert_message,
+            merge_message=merge_message,
+            options=(frozenset(role_conversions.items()), convert_images_to_image_urls, flatten_messages_as_text),
+        )
 
     def _get_responses_message_list(self,
             message_list: list[ChatMessage],
@@ -117,41 +310,34 @@ class MessageManager():
         """
         Creates a list of messages in responses format (OpenAI responses API).
         """
-        output_message_list: list[dict[str, Any]] = []
-        message_list = deepcopy(message_list)  # Avoid modifying the original list
-        
-        for message in message_list:
-            role = message.role
-            if role not in MessageRole.roles():
-                raise ValueError(f"Incorrect role {role}, only {MessageRole.roles()} are supported for now.")
-
-            if role in role_conversions:
-                message.role = role_conversions[role]  # type: ignore
-            
+        image_policy = get_image_policy(self.model_id)
+        raw_image_policy = get_image_policy(self.model_id, raw=True)
+
+        def convert_message(message: ChatMessage) -> dict[str, Any]:
+            role = self._get_role(message, role_conversions)
+
             # Handle content processing
             if isinstance(message.content, list):
                 # Process each content element
                 processed_content = []
                 for element in message.content:
                     assert isinstance(element, dict), "Error: this element should be a dict:" + str(element)
-                    
+
                     if element["type"] == "image":
                         assert not flatten_messages_as_text, f"Cannot use images with {flatten_messages_as_text=}"
                         if convert_images_to_image_urls:
                             processed_content.append({
                                 "type": "image_url",
-                                "image_url": {"url": make_image_url(encode_image_base64(element.pop("image")))},
+                                "image_url": {"url": make_image_url_cached(element["image"], image_policy)},
                             })
                         else:
                             processed_content.append({
                                 "type": "image",
-                                "image": encode_image_base64(element["image"])
+                                "image": encode_image_cached(element["image"], raw_image_policy)
                             })
-                    elif element["type"] == "text":
-                        processed_content.append(element)
                     else:
                         processed_content.append(element)
-                
+
                 content = processed_content
             else:
                 # Handle string content
@@ -160,12 +346,16 @@ class MessageManager():
                 else:
                     content = [{"type": "text", "text": message.content}] if message.content else []
 
+            # Create message in responses format
+            message_dict = {
+                "role": role,
+                "content": content,
+            }
+
             # Handle tool calls for responses format
-            tool_calls = None
             if message.tool_calls:
-                tool_calls = []
-                for tool_call in message.tool_calls:
-                    tool_calls.append({
+                message_dict["tool_calls"] = [
+                    {
                         "id": tool_call.id,
                         "type": tool_call.type,
                         "function": {
@@ -173,79 +363,75 @@ class MessageManager():
                             "arguments": tool_call.function.arguments,
                             "description": tool_call.function.description
                         }
-                    })
-
-            # Create message in responses format
-            message_dict = {
-                "role": message.role,
-                "content": content,
-            }
-            
-            if tool_calls:
-                message_dict["tool_calls"] = tool_calls
+                    }
+                    for tool_call in message.tool_calls
+                ]
+            return message_dict
 
+        def merge_message(last_message_dict: dict[str, Any], message_dict: dict[str, Any]) -> dict[str, Any]:
             # Merge consecutive messages with same role
-            if len(output_message_list) > 0 and message.role == output_message_list[-1]["role"]:
-                if flatten_messages_as_text:
-                    if isinstance(content, list) and content and content[0]["type"] == "text":
-                        output_message_list[-1]["content"] += "\n" + content[0]["text"]
-                    else:
-                        output_message_list[-1]["content"] += "\n" + str(content)
+            merged_message_dict = dict(last_message_dict)
+            content = message_dict["content"]
+            if flatten_messages_as_text:
+                merged_content = copy(last_message_dict["content"])
+                if isinstance(content, list) and content and content[0]["type"] == "text":
+                    merged_content += "\n" + content[0]["text"]
                 else:
-                    # Merge content lists
-                    if isinstance(output_message_list[-1]["content"], list) and isinstance(content, list):
-                        output_message_list[-1]["content"].extend(content)
-                    else:
-                        output_message_list[-1]["content"] = content
-                
-                # Merge tool calls
-                if tool_calls and "tool_calls" in output_message_list[-1]:
-                    output_message_list[-1]["tool_calls"].extend(tool_calls)
-                elif tool_calls:
-                    output_message_list[-1]["tool_calls"] = tool_calls
+                    merged_content += "\n" + str(content)
+                merged_message_dict["content"] = merged_content
             else:
-                output_message_list.append(message_dict)
+                # Merge content lists
+                if isinstance(last_message_dict["content"], list) and isinstance(content, list):
+                    merged_message_dict["content"] = last_message_dict["content"] + content
+                else:
+                    merged_message_dict["content"] = content
 
-        return output_message_list
+            # Merge tool calls
+            tool_calls = message_dict.get("tool_calls")
+            if tool_calls and "tool_calls" in last_message_dict:
+                merged_message_dict["tool_calls"] = last_message_dict["tool_calls"] + tool_calls
+            elif tool_calls:
+                merged_message_dict["tool_calls"] = tool_calls
+            return merged_message_dict
+
+        return self._get_incremental_message_list(
+            api_type="responses",
+            message_list=message_list,
+            convert_message=convert_message,
+            merge_message=merge_message,
+            options=(frozenset(role_conversions.items()), convert_images_to_image_urls, flatten_messages_as_text),
+        )
 
     def get_tool_json_schema(self,
                              tool: Any,
                              model_id: Optional[str] = None
                              ) -> Dict:
-        properties = deepcopy(tool.parameters['properties'])
+        """
+        Returns the JSON schema of a tool in the shape expected by the model family.
 
-        required = []
-        for key, value in properties.items():
-            if value["type"] == "any":
-                value["type"] = "string"
-            if not ("nullable" in value and value["nullable"]):
-                required.append(key)
+        Schemas are compiled once per (tool, model family) and recompiled only when the tool's name,
+        description or `parameters` object changes. Call `invalidate_tool_json_schema` after editing
+        `parameters` in place. The returned dict is shared and must not be modified.
+        """
+        model_id = (model_id or self.model_id).split("/")[-1]
+        family = "anthropic" if model_id in DEFAULT_ANTHROPIC_MODELS else "openai"
 
-        model_id = model_id.split("/")[-1]
+        try:
+            compiled_schemas = _TOOL_SCHEMA_CACHE.setdefault(tool, {})
+        except TypeError:
+            # Tools that cannot be weakly referenced are compiled on every call
+            return _CompiledToolSchema(tool, family).schema
 
-        if model_id in DEFAULT_ANTHROPIC_MODELS:
-            return {
-                "name": tool.name,
-                "description": tool.description,
-                "input_schema": {
-                    "type": "object",
-                    "properties": properties,
-                    "required": required,
-                },
-            }
-        else:
-            return {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": {
-                        "type": "object",
-                        "properties": properties,
-                        "required": required,
-                    },
-                },
-            }
+        compiled = compiled_schemas.get(family)
+        if compiled is None or not compiled.matches(tool):
+            compiled = _CompiledToolSchema(tool, family)
+            compiled_schemas[family] = compiled
+            _TOOL_SCHEMA_FRAGMENTS[id(compiled.schema)] = compiled
+        return compiled.schema
+
+    @staticmethod
+    def invalidate_tool_json_schema(tool: Any) -> None:
+        _TOOL_SCHEMA_CACHE.pop(tool, None)
 
     def get_clean_completion_kwargs(self, completion_kwargs: Dict[str, Any]):
 
@@ -1,11 +1,11 @@
 from typing import Any
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from src.models.base import (ApiModel,
                              ChatMessage,
                              tool_role_conversions,
                              MessageRole,
-                             TokenUsage,
+                             get_token_usage,
                              ChatMessageStreamDelta,
                              ChatMessageToolCallStreamDelta)
 from src.models.message_manager import MessageManager
@@ -164,42 +164,69 @@ class OpenAIServerModel(ApiModel):
             model=self.model_id,
             custom_role_conversions=self.custom_role_conversions,
             convert_images_to_image_urls=True,
-            http_client=self.http_client,
             **kwargs,
         )
         for event in self.client.chat.completions.create(
             **completion_kwargs, stream=True, stream_options={"include_usage": True}
         ):
-            if event.usage:
-                self._last_input_token_count = event.usage.prompt_tokens
-                self._last_output_token_count = event.usage.completion_tokens
+            yield from self._get_stream_deltas(event)
+
+    async def agenerate_stream(
+        self,
+        messages: list[ChatMessage],
+        stop_sequences: list[str] | None = None,
+        response_format: dict[str, str] | None = None,
+        tools_to_call_from: list[Any] | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[ChatMessageStreamDelta]:
+        completion_kwargs = self._prepare_completion_kwargs(
+            messages=messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            model=self.model_id,
+            custom_role_conversions=self.custom_role_conversions,
+            convert_images_to_image_urls=True,
+            **kwargs,
+        )
+        async with self._rate_limit(completion_kwargs):
+            response = await self.client.chat.completions.create(
+                **completion_kwargs, stream=True, stream_options={"include_usage": True}
+            )
+            async for event in response:
+                for stream_delta in self._get_stream_deltas(event):
+                    yield stream_delta
+
+    def _get_stream_deltas(self, event: Any) -> Generator[ChatMessageStreamDelta]:
+        """Convert a streamed chat completion chunk into stream deltas."""
+        if event.usage:
+            self._last_input_token_count = event.usage.prompt_tokens
+            self._last_output_token_count = event.usage.completion_tokens
+            yield ChatMessageStreamDelta(
+                content="",
+                token_usage=get_token_usage(event.usage),
+            )
+        if event.choices:
+            choice = event.choices[0]
+            if choice.delta:
                 yield ChatMessageStreamDelta(
-                    content="",
-                    token_usage=TokenUsage(
-                        input_tokens=event.usage.prompt_tokens,
-                        output_tokens=event.usage.completion_tokens,
-                    ),
+                    content=choice.delta.content,
+                    tool_calls=[
+                        ChatMessageToolCallStreamDelta(
+                            index=delta.index,
+                            id=delta.id,
+                            type=delta.type,
+                            function=delta.function,
+                        )
+                        for delta in choice.delta.tool_calls
+                    ]
+                    if choice.delta.tool_calls
+                    else None,
                 )
-            if event.choices:
-                choice = event.choices[0]
-                if choice.delta:
-                    yield ChatMessageStreamDelta(
-                        content=choice.delta.content,
-                        tool_calls=[
-                            ChatMessageToolCallStreamDelta(
-                                index=delta.index,
-                                id=delta.id,
-                                type=delta.type,
-                                function=delta.function,
-                            )
-                            for delta in choice.delta.tool_calls
-                        ]
-                        if choice.delta.tool_calls
-                        else None,
-                    )
-                else:
-                    if not getattr(choice, "finish_reason", None):
-                        raise ValueError(f"No content or tool calls in event: {event}")
+            else:
+                if not getattr(choice, "finish_reason", None):
+                    raise ValueError(f"No content or tool calls in event: {event}")
+
 
     async def generate(
             self,
@@ -209,6 +236,7 @@ class OpenAIServerModel(ApiModel):
             tools_to_call_from: list[Any] | None = None,
             **kwargs,
     ) -> ChatMessage:
+        use_cache = kwargs.pop("use_cache", None)
         completion_kwargs = self._prepare_completion_kwargs(
             messages=messages,
             stop_sequences=stop_sequences,
@@ -220,18 +248,23 @@ class OpenAIServerModel(ApiModel):
             **kwargs,
         )
 
-        response = await self.client.chat.completions.create(**completion_kwargs)
+        cache_key, cached_message = await self._get_cached_message(completion_kwargs, use_cache=use_cache)
+        if cached_message is not None:
+            return cached_message
+
+        async with self._rate_limit(completion_kwargs):
+            response = await self.client.chat.completions.create(**completion_kwargs)
 
         self._last_input_token_count = response.usage.prompt_tokens
         self._last_output_token_count = response.usage.completion_tokens
-        return ChatMessage.from_dict(
+        chat_message = ChatMessage.from_dict(
             response.choices[0].message.model_dump(include={"role", "content", "tool_calls"}),
             raw=response,
-            token_usage=TokenUsage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-            ),
+            token_usage=get_token_usage(response.usage),
         )
+        self._record_usage(chat_message.token_usage)
+        await self._set_cached_message(cache_key, chat_message)
+        return chat_message
 
     async def __call__(self, *args, **kwargs) -> ChatMessage:
         """
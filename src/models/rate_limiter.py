@@ -0,0 +1,239 @@
+import os
+import time
+import json
+import asyncio
+import contextlib
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from src.logger import logger
+from src.utils.token_utils import IMAGE_TOKEN_COUNT
+
+load_dotenv(verbose=True)
+
+MODEL_MAX_CONCURRENCY = int(os.getenv('MODEL_MAX_CONCURRENCY', 16))
+MODEL_MIN_CONCURRENCY = int(os.getenv('MODEL_MIN_CONCURRENCY', 1))
+
+# Status codes that mean the provider is overloaded and the window should back off
+OVERLOAD_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+# Content parts holding an image, in the chat completions, Anthropic and responses formats
+_IMAGE_PART_TYPES = {"image", "image_url", "input_image"}
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Extract the HTTP status code from litellm, openai or httpx errors."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Whether an error is a timeout of asyncio, httpx, openai or litellm."""
+    return isinstance(error, TimeoutError) or any("Timeout" in cls.__name__ for cls in type(error).__mro__)
+
+
+def estimate_prompt_tokens(completion_kwargs: Dict[str, Any]) -> int:
+    """Cheap prompt size estimate (~4 characters per token) used to charge the TPM bucket.
+
+    Images are charged `IMAGE_TOKEN_COUNT` each rather than by the size of their base64 data.
+    """
+    prompt = completion_kwargs.get("messages", completion_kwargs.get("input", ""))
+    images = 0
+
+    def strip_images(value: Any) -> Any:
+        nonlocal images
+        if isinstance(value, dict):
+            if value.get("type") in _IMAGE_PART_TYPES:
+                images += 1
+                return None
+            return {key: strip_images(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [strip_images(item) for item in value]
+        return value
+
+    if not isinstance(prompt, str):
+        prompt = json.dumps(strip_images(prompt), ensure_ascii=False, default=str)
+    return len(prompt) // 4 + 1 + images * IMAGE_TOKEN_COUNT
+
+
+class TokenBucket():
+    """Token bucket refilled continuously at `rate_per_minute`.
+
+    `acquire` waits until enough tokens are available, `consume` charges tokens
+    without waiting and may leave the bucket in debt (e.g. for completion tokens
+    only known after the response), which delays the next callers.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # A single request larger than the bucket would wait forever, charge what fits
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= amount
+
+
+class AdaptiveConcurrencyWindow():
+    """AIMD concurrency window.
+
+    The window grows by one slot after a full window of successful requests and is
+    multiplied by `backoff` when the provider answers with 429/5xx, once per congestion
+    epoch: the requests already in flight when the window backed off cannot shrink it again.
+    Neutral releases, e.g. of cancelled or timed out requests, leave the window as is.
+    """
+
+    def __init__(self,
+                 max_concurrency: int = MODEL_MAX_CONCURRENCY,
+                 min_concurrency: int = MODEL_MIN_CONCURRENCY,
+                 initial_concurrency: Optional[int] = None,
+                 backoff: float = 0.5):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.window = float(initial_concurrency or max_concurrency)
+        self.backoff = backoff
+        self.in_flight = 0
+        self._started = 0
+        # Requests started up to this one belong to the congestion epoch of the last back off
+        self._epoch_end = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> int:
+        """Wait for a slot, and return the ticket of the request to pass to `release`."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.window))
+            self.in_flight += 1
+            self._started += 1
+            return self._started
+
+    async def release(self, ticket: int = 0, overloaded: bool = False, neutral: bool = False) -> bool:
+        """Free the slot of a request, and return whether the window backed off."""
+        backed_off = False
+        async with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                if ticket > self._epoch_end:
+                    self.window = max(self.min_concurrency, self.window * self.backoff)
+                    self._epoch_end = self._started
+                    backed_off = True
+            elif not neutral:
+                self.window = min(self.max_concurrency, self.window + 1.0 / self.window)
+            self._condition.notify_all()
+        return backed_off
+
+
+class ModelRateLimiter():
+    """Shared limiter of a model: RPM and TPM token buckets plus an adaptive concurrency window.
+
+    Parameters:
+        model_id (`str`): The model the limits apply to, used in logs.
+        rpm (`int`, *optional*): Requests per minute, unlimited if not set.
+        tpm (`int`, *optional*): Tokens per minute, unlimited if not set.
+        max_concurrency (`int`): Upper bound of the concurrency window.
+        min_concurrency (`int`): Lower bound of the concurrency window.
+        initial_concurrency (`int`, *optional*): Starting window, defaults to `max_concurrency`.
+    """
+
+    def __init__(self,
+                 model_id: str,
+                 rpm: Optional[int] = None,
+                 tpm: Optional[int] = None,
+                 max_concurrency: int = MODEL_MAX_CONCURRENCY,
+                 min_concurrency: int = MODEL_MIN_CONCURRENCY,
+                 initial_concurrency: Optional[int] = None):
+        self.model_id = model_id
+        self.rpm_bucket = TokenBucket(rpm) if rpm else None
+        self.tpm_bucket = TokenBucket(tpm) if tpm else None
+        self.window = AdaptiveConcurrencyWindow(max_concurrency=max_concurrency,
+                                                min_concurrency=min_concurrency,
+                                                initial_concurrency=initial_concurrency)
+
+        self.requests = 0
+        self.overloads = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    @contextlib.asynccontextmanager
+    async def limit(self, estimated_tokens: int = 0):
+        """Wait for a slot and budget, then run the request.
+
+        Usage:
+            async with limiter.limit(estimate_prompt_tokens(completion_kwargs)):
+                response = await client.acompletion(**completion_kwargs)
+        """
+        start = time.monotonic()
+        if self.rpm_bucket is not None:
+            await self.rpm_bucket.acquire(1)
+        if self.tpm_bucket is not None and estimated_tokens:
+            await self.tpm_bucket.acquire(estimated_tokens)
+        ticket = await self.window.acquire()
+
+        queue_wait = time.monotonic() - start
+        self.requests += 1
+        self.total_queue_wait += queue_wait
+        self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+
+        overloaded = False
+        neutral = False
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Cancelled requests, e.g. hedge losers, say nothing about the provider load
+            neutral = True
+            raise
+        except Exception as e:
+            overloaded = get_status_code(e) in OVERLOAD_STATUS_CODES
+            neutral = not overloaded and is_timeout(e)
+            if overloaded:
+                self.overloads += 1
+            raise
+        finally:
+            if await self.window.release(ticket, overloaded=overloaded, neutral=neutral):
+                logger.warning(f"{self.model_id} is overloaded, concurrency window reduced to {int(self.window.window)}")
+
+    def record_usage(self, output_tokens: int) -> None:
+        """Charge completion tokens, only known once the response is back, to the TPM bucket."""
+        if self.tpm_bucket is not None and output_tokens:
+            self.tpm_bucket.consume(output_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "overloads": self.overloads,
+            "concurrency_window": int(self.window.window),
+            "in_flight": self.window.in_flight,
+            "total_queue_wait": self.total_queue_wait,
+            "avg_queue_wait": self.total_queue_wait / self.requests if self.requests else 0.0,
+            "max_queue_wait": self.max_queue_wait,
+        }
+
+
+__all__ = [
+    "TokenBucket",
+    "AdaptiveConcurrencyWindow",
+    "ModelRateLimiter",
+    "estimate_prompt_tokens",
+    "get_status_code",
+    "is_timeout",
+]
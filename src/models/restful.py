@@ -1,46 +1,140 @@
 import json
 from typing import Dict, List, Optional, Any
-from collections.abc import Generator
-from openai.types.chat import ChatCompletion
-import requests
+from collections.abc import AsyncGenerator, Generator
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+import httpx
 import os
 from PIL import Image
 
 from src.models.base import (ApiModel,
                              Model,
                              ChatMessage,
+                             ChatMessageToolCallFunction,
                              tool_role_conversions,
                              ChatMessageStreamDelta,
-                             ChatMessageToolCallStreamDelta)
-from src.models.message_manager import MessageManager
-from src.logger import TokenUsage, logger
+                             ChatMessageToolCallStreamDelta,
+                             get_token_usage)
+from src.models.message_manager import MessageManager, dumps_completion_payload
+from src.logger import logger
 from src.utils import encode_image_base64
+from src.proxy import HTTP_CLIENT, ASYNC_HTTP_CLIENT
 
 
-class RestfulClient():
+class SSEDecoder():
+    """Incremental decoder of server-sent events, fed one line at a time."""
+    def __init__(self):
+        self._data: List[str] = []
+
+    def decode(self, line: str) -> Optional[str]:
+        """Returns the data of an event once its terminating blank line is read."""
+        if not line:
+            return self.flush()
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        if field == "data":
+            self._data.append(value[1:] if value.startswith(" ") else value)
+        return None
+
+    def flush(self) -> Optional[str]:
+        if not self._data:
+            return None
+        data = "\n".join(self._data)
+        self._data = []
+        return data
+
+
+def _load_sse_data(data: Optional[str]) -> Optional[Dict[str, Any]]:
+    if data is None or data.strip() == "[DONE]":
+        return None
+    return json.loads(data)
+
+
+class RestfulBaseClient():
+    """Shared HTTP plumbing for the Restful* clients.
+
+    Requests go through the process-wide pooled clients from `src.proxy`, so keep-alive
+    connections are reused and `acompletion` never blocks the event loop.
+    """
     def __init__(self,
                  api_base: str,
                  api_key: str,
-                 api_type: str = "chat/completions",
-                 model_id: str = "o3",
-                 http_client=None):
+                 api_type: str,
+                 model_id: str,
+                 http_client: httpx.Client | None = None,
+                 async_http_client: httpx.AsyncClient | None = None):
         self.api_base = api_base
         self.api_key = api_key
         self.api_type = api_type
         self.model_id = model_id
 
-        self.http_client = http_client
+        self.http_client = http_client or HTTP_CLIENT
+        self.async_http_client = async_http_client or ASYNC_HTTP_CLIENT
 
-    def completion(self,
-                   model,
-                   messages,
-                   **kwargs):
+    @property
+    def url(self) -> str:
+        return f"{self.api_base}/{self.api_type}"
 
+    def _get_headers(self, json_body: bool = True) -> Dict[str, str]:
         headers = {
             "app_key": self.api_key,
-            "Content-Type": "application/json"
         }
-
+        if json_body:
+            headers["Content-Type"] = "application/json"
+        return headers
+
+    def _post(self, json_body: bool = True, **request_kwargs) -> httpx.Response:
+        response = self.http_client.post(self.url, headers=self._get_headers(json_body), **request_kwargs)
+        response.raise_for_status()
+        return response
+
+    async def _apost(self, json_body: bool = True, **request_kwargs) -> httpx.Response:
+        response = await self.async_http_client.post(self.url, headers=self._get_headers(json_body), **request_kwargs)
+        response.raise_for_status()
+        return response
+
+    def _stream(self, json_body: bool = True, **request_kwargs) -> Generator[Dict[str, Any]]:
+        """POST and yield the JSON events of the server-sent event stream as they arrive."""
+        decoder = SSEDecoder()
+        with self.http_client.stream("POST", self.url, headers=self._get_headers(json_body), **request_kwargs) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                event = _load_sse_data(decoder.decode(line))
+                if event is not None:
+                    yield event
+        event = _load_sse_data(decoder.flush())
+        if event is not None:
+            yield event
+
+    async def _astream(self, json_body: bool = True, **request_kwargs) -> AsyncGenerator[Dict[str, Any]]:
+        decoder = SSEDecoder()
+        async with self.async_http_client.stream("POST", self.url, headers=self._get_headers(json_body), **request_kwargs) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                event = _load_sse_data(decoder.decode(line))
+                if event is not None:
+                    yield event
+        event = _load_sse_data(decoder.flush())
+        if event is not None:
+            yield event
+
+
+class RestfulClient(RestfulBaseClient):
+    def __init__(self,
+                 api_base: str,
+                 api_key: str,
+                 api_type: str = "chat/completions",
+                 model_id: str = "o3",
+                 http_client=None,
+                 async_http_client=None):
+        super().__init__(api_base=api_base,
+                         api_key=api_key,
+                         api_type=api_type,
+                         model_id=model_id,
+                         http_client=http_client,
+                         async_http_client=async_http_client)
+
+    def _build_data(self, model, messages, **kwargs) -> Dict[str, Any]:
         model = model.split("/")[-1]
         data = {
             "model": model,
@@ -50,40 +144,53 @@ class RestfulClient():
         # Add any additional kwargs to the data
         if kwargs:
             data.update(kwargs)
+        return data
 
-        response = requests.post(
-            f"{self.api_base}/{self.api_type}",
-            json=data,
-            headers=headers,
-        )
+    def completion(self,
+                   model,
+                   messages,
+                   **kwargs):
+        response = self._post(content=dumps_completion_payload(self._build_data(model, messages, **kwargs)))
+        return response.json()
 
+    async def acompletion(self,
+                          model,
+                          messages,
+                          **kwargs):
+        response = await self._apost(content=dumps_completion_payload(self._build_data(model, messages, **kwargs)))
         return response.json()
 
-class RestfulResponseClient():
+    def stream_completion(self,
+                          model,
+                          messages,
+                          **kwargs) -> Generator[Dict[str, Any]]:
+        data = self._build_data(model, messages, stream=True, **kwargs)
+        yield from self._stream(content=dumps_completion_payload(data))
+
+    async def astream_completion(self,
+                                 model,
+                                 messages,
+                                 **kwargs) -> AsyncGenerator[Dict[str, Any]]:
+        data = self._build_data(model, messages, stream=True, **kwargs)
+        async for event in self._astream(content=dumps_completion_payload(data)):
+            yield event
+
+class RestfulResponseClient(RestfulBaseClient):
     def __init__(self,
                  api_base: str,
                  api_key: str,
                  api_type: str = "responses",
                  model_id: str = "o3",
-                 http_client=None):
-        self.api_base = api_base
-        self.api_key = api_key
-        self.api_type = api_type
-        self.model_id = model_id
-
-        self.http_client = http_client
-
-    def completion(self,
-                   model,
-                   input,
-                   tools,
-                   **kwargs):
-
-        headers = {
-            "app_key": self.api_key,
-            "Content-Type": "application/json"
-        }
-
+                 http_client=None,
+                 async_http_client=None):
+        super().__init__(api_base=api_base,
+                         api_key=api_key,
+                         api_type=api_type,
+                         model_id=model_id,
+                         http_client=http_client,
+                         async_http_client=async_http_client)
+
+    def _build_data(self, model, input, tools, **kwargs) -> Dict[str, Any]:
         model = model.split("/")[-1]
         data = {
             "model": model,
@@ -95,76 +202,95 @@ class RestfulResponseClient():
         # Add any additional kwargs to the data
         if kwargs:
             data.update(kwargs)
+        return data
 
-        response = requests.post(
-            f"{self.api_base}/{self.api_type}",
-            json=data,
-            headers=headers,
-        )
-
-        response_text = response.text
-        for line in response_text.split('\n'):
-            if line.strip():
-                try:
-                    json_line = line.strip()
-                    if json_line.startswith("data: ") and "response.completed" in json_line:
-                        json_line = json_line.replace("data: ", "").strip()
-                        res = json.loads(json_line)['response']
-                        return res
-                except Exception as e:
-                    logger.error(f"Error parsing line: {line}, error: {e}")
-
-
-class RestfulTranscribeClient():
+    def completion(self,
+                   model,
+                   input,
+                   tools,
+                   **kwargs):
+        data = self._build_data(model, input, tools, **kwargs)
+        for event in self._stream(content=dumps_completion_payload(data)):
+            if event.get("type") == "response.completed":
+                return event["response"]
+
+    async def acompletion(self,
+                          model,
+                          input,
+                          tools,
+                          **kwargs):
+        data = self._build_data(model, input, tools, **kwargs)
+        async for event in self._astream(content=dumps_completion_payload(data)):
+            if event.get("type") == "response.completed":
+                return event["response"]
+
+    def stream_completion(self,
+                          model,
+                          input,
+                          tools,
+                          **kwargs) -> Generator[Dict[str, Any]]:
+        data = self._build_data(model, input, tools, **kwargs)
+        data["stream"] = True
+        yield from self._stream(content=dumps_completion_payload(data))
+
+    async def astream_completion(self,
+                                 model,
+                                 input,
+                                 tools,
+                                 **kwargs) -> AsyncGenerator[Dict[str, Any]]:
+        data = self._build_data(model, input, tools, **kwargs)
+        data["stream"] = True
+        async for event in self._astream(content=dumps_completion_payload(data)):
+            yield event
+
+
+class RestfulTranscribeClient(RestfulBaseClient):
     def __init__(self,
                  api_base: str,
                  api_key: str,
                  api_type: str = "wisper",
                  model_id: str = "wisper",
-                 http_client=None):
-        self.api_base = api_base
-        self.api_key = api_key
-        self.api_type = api_type
-        self.model_id = model_id
-
-        self.http_client = http_client
+                 http_client=None,
+                 async_http_client=None):
+        super().__init__(api_base=api_base,
+                         api_key=api_key,
+                         api_type=api_type,
+                         model_id=model_id,
+                         http_client=http_client,
+                         async_http_client=async_http_client)
 
     def completion(self,
                    model,
                    file_stream,
                    **kwargs):
-
         files = {'file': file_stream}
-        headers = {
-            "app_key": self.api_key,
-        }
-        response = requests.post(f"{self.api_base}/{self.api_type}", headers=headers, files=files)
+        response = self._post(json_body=False, files=files)
+        return response.json()
 
+    async def acompletion(self,
+                          model,
+                          file_stream,
+                          **kwargs):
+        files = {'file': file_stream}
+        response = await self._apost(json_body=False, files=files)
         return response.json()
 
-class RestfulImagenClient():
+class RestfulImagenClient(RestfulBaseClient):
     def __init__(self,
                  api_base: str,
                  api_key: str,
                  api_type: str = "imagen",
                  model_id: str = "imagen",
-                 http_client=None):
-        self.api_base = api_base
-        self.api_key = api_key
-        self.api_type = api_type
-        self.model_id = model_id
-
-        self.http_client = http_client
-
-    def completion(self,
-                   model,
-                   prompt: str,
-                   **kwargs):
-        headers = {
-            "app_key": self.api_key,
-            "Content-Type": "application/json"
-        }
-
+                 http_client=None,
+                 async_http_client=None):
+        super().__init__(api_base=api_base,
+                         api_key=api_key,
+                         api_type=api_type,
+                         model_id=model_id,
+                         http_client=http_client,
+                         async_http_client=async_http_client)
+
+    def _build_data(self, model, prompt: str, **kwargs) -> Dict[str, Any]:
         data = {
             "model": model,
             "instances": [
@@ -180,40 +306,39 @@ class RestfulImagenClient():
         # Add any additional kwargs to the data
         if kwargs:
             data.update(kwargs)
+        return data
 
-        response = requests.post(
-            f"{self.api_base}/{self.api_type}",
-            json=data,
-            headers=headers,
-        )
+    def completion(self,
+                   model,
+                   prompt: str,
+                   **kwargs):
+        response = self._post(json=self._build_data(model, prompt, **kwargs))
+        return response.json()
 
+    async def acompletion(self,
+                          model,
+                          prompt: str,
+                          **kwargs):
+        response = await self._apost(json=self._build_data(model, prompt, **kwargs))
         return response.json()
 
 
-class RestfulVeoPredictClient():
+class RestfulVeoPredictClient(RestfulBaseClient):
     def __init__(self,
                  api_base: str,
                  api_key: str,
                  api_type: str = "veo/predict",
                  model_id: str = "veo3",
-                 http_client=None):
-        self.api_base = api_base
-        self.api_key = api_key
-        self.api_type = api_type
-        self.model_id = model_id
-
-        self.http_client = http_client
-
-    def completion(self,
-                   model,
-                   prompt: str,
-                   image: str = None,
-                   **kwargs):
-        headers = {
-            "app_key": self.api_key,
-            "Content-Type": "application/json"
-        }
-
+                 http_client=None,
+                 async_http_client=None):
+        super().__init__(api_base=api_base,
+                         api_key=api_key,
+                         api_type=api_type,
+                         model_id=model_id,
+                         http_client=http_client,
+                         async_http_client=async_http_client)
+
+    def _build_data(self, model, prompt: str, image: str = None, **kwargs) -> Dict[str, Any]:
         data = {
             "model": model,
             "instances": [
@@ -237,38 +362,40 @@ class RestfulVeoPredictClient():
         # Add any additional kwargs to the data
         if kwargs:
             data.update(kwargs)
+        return data
 
-        response = requests.post(
-            f"{self.api_base}/{self.api_type}",
-            json=data,
-            headers=headers,
-        )
+    def completion(self,
+                   model,
+                   prompt: str,
+                   image: str = None,
+                   **kwargs):
+        response = self._post(json=self._build_data(model, prompt, image=image, **kwargs))
+        return response.json()
 
+    async def acompletion(self,
+                          model,
+                          prompt: str,
+                          image: str = None,
+                          **kwargs):
+        response = await self._apost(json=self._build_data(model, prompt, image=image, **kwargs))
         return response.json()
 
-class RestfulVeoFetchClient():
+class RestfulVeoFetchClient(RestfulBaseClient):
     def __init__(self,
                  api_base: str,
                  api_key: str,
                  api_type: str = "veo/fetch",
                  model_id: str = "veo3",
-                 http_client=None):
-        self.api_base = api_base
-        self.api_key = api_key
-        self.api_type = api_type
-        self.model_id = model_id
-
-        self.http_client = http_client
-
-    def completion(self,
-                   model,
-                   name: str,
-                   **kwargs):
-        headers = {
-            "app_key": self.api_key,
-            "Content-Type": "application/json"
-        }
-
+                 http_client=None,
+                 async_http_client=None):
+        super().__init__(api_base=api_base,
+                         api_key=api_key,
+                         api_type=api_type,
+                         model_id=model_id,
+                         http_client=http_client,
+                         async_http_client=async_http_client)
+
+    def _build_data(self, model, name: str, **kwargs) -> Dict[str, Any]:
         data = {
             "operationName": name,
         }
@@ -276,13 +403,20 @@ class RestfulVeoFetchClient():
         # Add any additional kwargs to the data
         if kwargs:
             data.update(kwargs)
+        return data
 
-        response = requests.post(
-            f"{self.api_base}/{self.api_type}",
-            json=data,
-            headers=headers,
-        )
+    def completion(self,
+                   model,
+                   name: str,
+                   **kwargs):
+        response = self._post(json=self._build_data(model, name, **kwargs))
+        return response.json()
 
+    async def acompletion(self,
+                          model,
+                          name: str,
+                          **kwargs):
+        response = await self._apost(json=self._build_data(model, name, **kwargs))
         return response.json()
 
 class RestfulModel(ApiModel):
@@ -319,6 +453,7 @@ class RestfulModel(ApiModel):
         custom_role_conversions: dict[str, str] | None = None,
         flatten_messages_as_text: bool = False,
         http_client=None,
+        async_http_client=None,
         **kwargs,
     ):
         self.model_id = model_id
@@ -332,6 +467,7 @@ class RestfulModel(ApiModel):
         )
 
         self.http_client = http_client
+        self.async_http_client = async_http_client
 
         self.message_manager = MessageManager(model_id=model_id)
 
@@ -347,7 +483,8 @@ class RestfulModel(ApiModel):
                              api_key=self.api_key,
                              api_type=self.api_type,
                              model_id=self.model_id,
-                             http_client=self.http_client)
+                             http_client=self.http_client,
+                             async_http_client=self.async_http_client)
 
     def _prepare_completion_kwargs(
             self,
@@ -424,37 +561,63 @@ class RestfulModel(ApiModel):
             **kwargs,
         )
 
-        for event in self.client.completion(**completion_kwargs, stream=True, stream_options={"include_usage": True}):
-            if getattr(event, "usage", None):
-                self._last_input_token_count = event.usage.prompt_tokens
-                self._last_output_token_count = event.usage.completion_tokens
+        for event in self.client.stream_completion(**completion_kwargs, stream_options={"include_usage": True}):
+            yield from self._get_stream_deltas(event)
+
+    async def agenerate_stream(self,
+                               messages: list[ChatMessage],
+                               stop_sequences: list[str] | None = None,
+                               response_format: dict[str, str] | None = None,
+                               tools_to_call_from: list[Any] | None = None,
+                               **kwargs,
+                               ) -> AsyncGenerator[ChatMessageStreamDelta]:
+
+        completion_kwargs = self._prepare_completion_kwargs(
+            messages=messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            model=self.model_id,
+            custom_role_conversions=self.custom_role_conversions,
+            convert_images_to_image_urls=True,
+            **kwargs,
+        )
+
+        async with self._rate_limit(completion_kwargs):
+            async for event in self.client.astream_completion(**completion_kwargs, stream_options={"include_usage": True}):
+                for stream_delta in self._get_stream_deltas(event):
+                    yield stream_delta
+
+    def _get_stream_deltas(self, event: Dict[str, Any]) -> Generator[ChatMessageStreamDelta]:
+        """Convert a chat completion chunk into stream deltas."""
+        event = ChatCompletionChunk.model_validate(event)
+        if getattr(event, "usage", None):
+            self._last_input_token_count = event.usage.prompt_tokens
+            self._last_output_token_count = event.usage.completion_tokens
+            yield ChatMessageStreamDelta(
+                content="",
+                token_usage=get_token_usage(event.usage),
+            )
+        if event.choices:
+            choice = event.choices[0]
+            if choice.delta:
                 yield ChatMessageStreamDelta(
-                    content="",
-                    token_usage=TokenUsage(
-                        input_tokens=event.usage.prompt_tokens,
-                        output_tokens=event.usage.completion_tokens,
-                    ),
+                    content=choice.delta.content,
+                    tool_calls=[
+                        ChatMessageToolCallStreamDelta(
+                            index=delta.index,
+                            id=delta.id,
+                            type=delta.type,
+                            function=delta.function,
+                        )
+                        for delta in choice.delta.tool_calls
+                    ]
+                    if choice.delta.tool_calls
+                    else None,
                 )
-            if event.choices:
-                choice = event.choices[0]
-                if choice.delta:
-                    yield ChatMessageStreamDelta(
-                        content=choice.delta.content,
-                        tool_calls=[
-                            ChatMessageToolCallStreamDelta(
-                                index=delta.index,
-                                id=delta.id,
-                                type=delta.type,
-                                function=delta.function,
-                            )
-                            for delta in choice.delta.tool_calls
-                        ]
-                        if choice.delta.tool_calls
-                        else None,
-                    )
-                else:
-                    if not getattr(choice, "finish_reason", None):
-                        raise ValueError(f"No content or tool calls in event: {event}")
+            else:
+                if not getattr(choice, "finish_reason", None):
+                    raise ValueError(f"No content or tool calls in event: {event}")
 
 
     async def generate(
@@ -465,6 +628,7 @@ class RestfulModel(ApiModel):
         tools_to_call_from: list[Any] | None = None,
         **kwargs,
     ) -> ChatMessage:
+        use_cache = kwargs.pop("use_cache", None)
 
         completion_kwargs = self._prepare_completion_kwargs(
             messages=messages,
@@ -477,21 +641,26 @@ class RestfulModel(ApiModel):
             **kwargs,
         )
 
-        # Async call to the LiteLLM client for completion
-        response = self.client.completion(**completion_kwargs)
+        cache_key, cached_message = await self._get_cached_message(completion_kwargs, use_cache=use_cache)
+        if cached_message is not None:
+            return cached_message
+
+        # Async call to the Restful client for completion
+        async with self._rate_limit(completion_kwargs):
+            response = await self.client.acompletion(**completion_kwargs)
 
         response = ChatCompletion.model_validate(response)
 
         self._last_input_token_count = response.usage.prompt_tokens
         self._last_output_token_count = response.usage.completion_tokens
-        return ChatMessage.from_dict(
+        chat_message = ChatMessage.from_dict(
             response.choices[0].message.model_dump(include={"role", "content", "tool_calls"}),
             raw=response,
-            token_usage=TokenUsage(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-            ),
+            token_usage=get_token_usage(response.usage),
         )
+        self._record_usage(chat_message.token_usage)
+        await self._set_cached_message(cache_key, chat_message)
+        return chat_message
 
     async def __call__(self, *args, **kwargs) -> ChatMessage:
         """
@@ -521,6 +690,7 @@ class RestfulTranscribeModel(ApiModel):
                  api_key: Optional[str] = None,
                  api_type: str = "wisper",
                  http_client=None,
+                 async_http_client=None,
                  **kwargs):
         self.model_id = model_id
         self.api_base = api_base
@@ -528,6 +698,7 @@ class RestfulTranscribeModel(ApiModel):
         self.api_type = api_type
 
         self.http_client = http_client
+        self.async_http_client = async_http_client
 
         super().__init__(model_id=model_id, **kwargs)
 
@@ -536,7 +707,8 @@ class RestfulTranscribeModel(ApiModel):
                                        api_key=self.api_key,
                                        api_type=self.api_type,
                                        model_id=self.model_id,
-                                       http_client=self.http_client)
+                                       http_client=self.http_client,
+                                       async_http_client=self.async_http_client)
 
     def generate(
         self,
@@ -568,6 +740,22 @@ class RestfulTranscribeModel(ApiModel):
         """
         return self.generate(*args, **kwargs)
 
+    async def agenerate(
+        self,
+        file_stream: Any,
+        **kwargs,
+    ) -> str:
+        """
+        Async counterpart of `generate`, the request goes through the shared async HTTP client.
+        """
+        response = await self.client.acompletion(
+            model=self.model_id,
+            file_stream=file_stream,
+            **kwargs,
+        )
+
+        return response.get("text", "No transcription available.")
+
 
 class RestfulImagenModel(ApiModel):
     """This model connects to an OpenAI-compatible API server for transcription.
@@ -589,6 +777,7 @@ class RestfulImagenModel(ApiModel):
                  api_key: Optional[str] = None,
                  api_type: str = "imagen",
                  http_client=None,
+                 async_http_client=None,
                  **kwargs):
         self.model_id = model_id
         self.api_base = api_base
@@ -596,6 +785,7 @@ class RestfulImagenModel(ApiModel):
         self.api_type = api_type
 
         self.http_client = http_client
+        self.async_http_client = async_http_client
 
         super().__init__(model_id=model_id, **kwargs)
 
@@ -604,7 +794,8 @@ class RestfulImagenModel(ApiModel):
                                    api_key=self.api_key,
                                    api_type=self.api_type,
                                    model_id=self.model_id,
-                                   http_client=self.http_client)
+                                   http_client=self.http_client,
+                                   async_http_client=self.async_http_client)
 
     def generate(
         self,
@@ -638,6 +829,24 @@ class RestfulImagenModel(ApiModel):
         """
         return self.generate(*args, **kwargs)
 
+    async def agenerate(
+        self,
+        prompt: str,
+        **kwargs,
+    ) -> str:
+        """
+        Async counterpart of `generate`, the request goes through the shared async HTTP client.
+        """
+        response = await self.client.acompletion(
+            model=self.model_id,
+            prompt=prompt,
+            **kwargs,
+        )
+
+        base64 = response['resp_data']['predictions'][0]["bytesBase64Encoded"]
+
+        return base64
+
 
 class RestfulVeoPridictModel(ApiModel):
     """This model connects to an OpenAI-compatible API server for transcription.
@@ -659,6 +868,7 @@ class RestfulVeoPridictModel(ApiModel):
                  api_key: Optional[str] = None,
                  api_type: str = "veo/predict",
                  http_client=None,
+                 async_http_client=None,
                  **kwargs):
 
 
@@ -668,6 +878,7 @@ class RestfulVeoPridictModel(ApiModel):
         self.api_type = api_type
 
         self.http_client = http_client
+        self.async_http_client = async_http_client
 
         super().__init__(model_id=model_id, **kwargs)
 
@@ -676,7 +887,8 @@ class RestfulVeoPridictModel(ApiModel):
                                        api_key=self.api_key,
                                        api_type=self.api_type,
                                        model_id=self.model_id,
-                                       http_client=self.http_client)
+                                       http_client=self.http_client,
+                                       async_http_client=self.async_http_client)
 
     def generate(
         self,
@@ -713,6 +925,27 @@ class RestfulVeoPridictModel(ApiModel):
         """
         return self.generate(*args, **kwargs)
 
+    async def agenerate(
+        self,
+        prompt: str,
+        image: str = None,
+        **kwargs,
+    ) -> str:
+        """
+        Async counterpart of `generate`, the request goes through the shared async HTTP client.
+        """
+        logger.info(f"Generating with model {self.model_id} using prompt: {prompt} and image: {image}, please wait...")
+        response = await self.client.acompletion(
+            model=self.model_id,
+            prompt=prompt,
+            image=image,
+            **kwargs,
+        )
+
+        name = response['resp_data']['name']
+
+        return name
+
 class RestfulVeoFetchModel(ApiModel):
     """This model connects to an OpenAI-compatible API server for transcription.
 
@@ -733,6 +966,7 @@ class RestfulVeoFetchModel(ApiModel):
                  api_key: Optional[str] = None,
                  api_type: str = "veo/fetch",
                  http_client=None,
+                 async_http_client=None,
                  **kwargs):
 
         self.model_id = model_id
@@ -741,6 +975,7 @@ class RestfulVeoFetchModel(ApiModel):
         self.api_type = api_type
 
         self.http_client = http_client
+        self.async_http_client = async_http_client
 
         super().__init__(model_id=model_id, **kwargs)
 
@@ -749,7 +984,8 @@ class RestfulVeoFetchModel(ApiModel):
                                        api_key=self.api_key,
                                        api_type=self.api_type,
                                        model_id=self.model_id,
-                                       http_client=self.http_client)
+                                       http_client=self.http_client,
+                                       async_http_client=self.async_http_client)
 
     def generate(
         self,
@@ -784,6 +1020,25 @@ class RestfulVeoFetchModel(ApiModel):
         """
         return self.generate(*args, **kwargs)
 
+    async def agenerate(
+        self,
+        name: str,
+        **kwargs,
+    ) -> str:
+        """
+        Async counterpart of `generate`, the request goes through the shared async HTTP client.
+        """
+        logger.info(f"Fetching with model {self.model_id} using name: {name}, please wait...")
+        response = await self.client.acompletion(
+            model=self.model_id,
+            name=name,
+            **kwargs,
+        )
+
+        base64 = response['resp_data']['response']["videos"][0]["bytesBase64Encoded"]
+
+        return base64
+
 
 class RestfulResponseModel(ApiModel):
     """This model connects to an OpenAI-compatible API server.
@@ -819,6 +1074,7 @@ class RestfulResponseModel(ApiModel):
         custom_role_conversions: dict[str, str] | None = None,
         flatten_messages_as_text: bool = False,
         http_client=None,
+        async_http_client=None,
         **kwargs,
     ):
         self.model_id = model_id
@@ -832,6 +1088,7 @@ class RestfulResponseModel(ApiModel):
         )
 
         self.http_client = http_client
+        self.async_http_client = async_http_client
 
         self.message_manager = MessageManager(model_id=model_id)
 
@@ -847,7 +1104,8 @@ class RestfulResponseModel(ApiModel):
                              api_key=self.api_key,
                              api_type=self.api_type,
                              model_id=self.model_id,
-                             http_client=self.http_client)
+                             http_client=self.http_client,
+                             async_http_client=self.async_http_client)
 
     def _prepare_completion_kwargs(
             self,
@@ -932,37 +1190,70 @@ class RestfulResponseModel(ApiModel):
             **kwargs,
         )
 
-        for event in self.client.completion(**completion_kwargs, stream=True, stream_options={"include_usage": True}):
-            if getattr(event, "usage", None):
-                self._last_input_token_count = event.usage.prompt_tokens
-                self._last_output_token_count = event.usage.completion_tokens
-                yield ChatMessageStreamDelta(
-                    content="",
-                    token_usage=TokenUsage(
-                        input_tokens=event.usage.prompt_tokens,
-                        output_tokens=event.usage.completion_tokens,
-                    ),
-                )
-            if event.choices:
-                choice = event.choices[0]
-                if choice.delta:
-                    yield ChatMessageStreamDelta(
-                        content=choice.delta.content,
-                        tool_calls=[
-                            ChatMessageToolCallStreamDelta(
-                                index=delta.index,
-                                id=delta.id,
-                                type=delta.type,
-                                function=delta.function,
-                            )
-                            for delta in choice.delta.tool_calls
-                        ]
-                        if choice.delta.tool_calls
-                        else None,
+        for event in self.client.stream_completion(**completion_kwargs):
+            yield from self._get_stream_deltas(event)
+
+    async def agenerate_stream(self,
+                               messages: list[ChatMessage],
+                               stop_sequences: list[str] | None = None,
+                               response_format: dict[str, str] | None = None,
+                               tools_to_call_from: list[Any] | None = None,
+                               **kwargs,
+                               ) -> AsyncGenerator[ChatMessageStreamDelta]:
+
+        completion_kwargs = self._prepare_completion_kwargs(
+            messages=messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            model=self.model_id,
+            custom_role_conversions=self.custom_role_conversions,
+            convert_images_to_image_urls=True,
+            **kwargs,
+        )
+
+        async with self._rate_limit(completion_kwargs):
+            async for event in self.client.astream_completion(**completion_kwargs):
+                for stream_delta in self._get_stream_deltas(event):
+                    yield stream_delta
+
+    def _get_stream_deltas(self, event: Dict[str, Any]) -> Generator[ChatMessageStreamDelta]:
+        """Convert a responses API stream event into stream deltas."""
+        event_type = event.get("type")
+        if event_type == "response.output_text.delta":
+            yield ChatMessageStreamDelta(content=event["delta"])
+        elif event_type == "response.output_item.added" and event["item"].get("type") == "function_call":
+            item = event["item"]
+            yield ChatMessageStreamDelta(
+                tool_calls=[
+                    ChatMessageToolCallStreamDelta(
+                        index=event["output_index"],
+                        id=item.get("call_id"),
+                        type="function",
+                        function=ChatMessageToolCallFunction(name=item.get("name", ""),
+                                                             arguments=item.get("arguments", "")),
+                    )
+                ]
+            )
+        elif event_type == "response.function_call_arguments.delta":
+            yield ChatMessageStreamDelta(
+                tool_calls=[
+                    ChatMessageToolCallStreamDelta(
+                        index=event["output_index"],
+                        function=ChatMessageToolCallFunction(name="", arguments=event["delta"]),
                     )
-                else:
-                    if not getattr(choice, "finish_reason", None):
-                        raise ValueError(f"No content or tool calls in event: {event}")
+                ]
+            )
+        elif event_type == "response.completed":
+            usage = event["response"].get("usage") or {}
+            self._last_input_token_count = usage.get("input_tokens", 0)
+            self._last_output_token_count = usage.get("output_tokens", 0)
+            yield ChatMessageStreamDelta(
+                content="",
+                token_usage=get_token_usage(usage),
+            )
+        elif event_type in ("response.failed", "error"):
+            raise ValueError(f"Error event in response stream: {event}")
 
 
     async def generate(
@@ -973,6 +1264,7 @@ class RestfulResponseModel(ApiModel):
         tools_to_call_from: list[Any] | None = None,
         **kwargs,
     ) -> ChatMessage:
+        use_cache = kwargs.pop("use_cache", None)
 
         completion_kwargs = self._prepare_completion_kwargs(
             messages=messages,
@@ -985,8 +1277,13 @@ class RestfulResponseModel(ApiModel):
             **kwargs,
         )
 
-        # Async call to the LiteLLM client for completion
-        response = self.client.completion(**completion_kwargs)
+        cache_key, cached_message = await self._get_cached_message(completion_kwargs, use_cache=use_cache)
+        if cached_message is not None:
+            return cached_message
+
+        # Async call to the Restful client for completion
+        async with self._rate_limit(completion_kwargs):
+            response = await self.client.acompletion(**completion_kwargs)
 
         self._last_input_token_count = response["usage"]["input_tokens"]
         self._last_output_token_count = response["usage"]["output_tokens"]
@@ -995,14 +1292,14 @@ class RestfulResponseModel(ApiModel):
         res_dict['content'] = res_dict['content'][-1]['text']
         res_dict['tool_calls'] = []
 
-        return ChatMessage.from_dict(
+        chat_message = ChatMessage.from_dict(
             res_dict,
             raw=response,
-            token_usage=TokenUsage(
-                input_tokens=response["usage"]["input_tokens"],
-                output_tokens=response["usage"]["output_tokens"],
-            ),
+            token_usage=get_token_usage(response["usage"]),
         )
+        self._record_usage(chat_message.token_usage)
+        await self._set_cached_message(cache_key, chat_message)
+        return chat_message
 
     async def __call__(self, *args, **kwargs) -> ChatMessage:
         """
@@ -0,0 +1,314 @@
+import os
+import time
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator, Generator
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from src.logger import logger
+from src.models.base import Model, ChatMessage, ChatMessageStreamDelta
+
+load_dotenv(verbose=True)
+
+ROUTER_LATENCY_WINDOW = int(os.getenv('ROUTER_LATENCY_WINDOW', 100))
+ROUTER_MIN_SAMPLES = int(os.getenv('ROUTER_MIN_SAMPLES', 10))
+ROUTER_HEDGE_DELAY = float(os.getenv('ROUTER_HEDGE_DELAY', 30))
+ROUTER_MAX_ERROR_RATE = float(os.getenv('ROUTER_MAX_ERROR_RATE', 0.5))
+
+
+class LatencyStats():
+    """Rolling latency and error rate of a router member over its last `window` requests."""
+
+    def __init__(self, window: int = ROUTER_LATENCY_WINDOW):
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0
+        self.wins = 0
+        self.censored = 0
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+
+    def record_error(self) -> None:
+        self.requests += 1
+        self.errors += 1
+        self.outcomes.append(False)
+
+    def record_censored(self, latency: float) -> None:
+        """Record a request cancelled after `latency` seconds, which would have taken at least as long."""
+        self.requests += 1
+        self.censored += 1
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.5)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "p50": self.p50,
+            "p95": self.p95,
+            "hedges": self.hedges,
+            "wins": self.wins,
+            "censored": self.censored,
+        }
+
+
+class RouterModel(Model):
+    """Routes requests across a group of interchangeable models, e.g. the same model served by two providers.
+
+    Members are tried in order of health (error rate below `max_error_rate` first) and median latency.
+    When the first member has not answered after its p95 latency, a hedged duplicate request is sent to
+    the next member and the first answer wins, the other request being cancelled and its elapsed time
+    recorded as a latency, since it would have taken at least as long. Errors fail over to
+    the next member. Streaming calls only fail over, since a stream cannot be taken back once yielded.
+
+    Parameters:
+        model_id (`str`):
+            Name of the route.
+        models (`list[Model]`):
+            The equivalent member models, in order of preference.
+        hedge_delay (`float`):
+            Delay before hedging used until a member has `min_samples` latencies to compute its p95.
+        min_samples (`int`):
+            Number of latencies needed before the member p95 is trusted.
+        max_error_rate (`float`):
+            Members above this rolling error rate are only tried after the healthy ones.
+        max_hedged_requests (`int`):
+            Maximum number of requests of a call in flight at the same time.
+        latency_window (`int`):
+            Number of recent requests used for the latency percentiles and the error rate.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        models: List[Model],
+        hedge_delay: float = ROUTER_HEDGE_DELAY,
+        min_samples: int = ROUTER_MIN_SAMPLES,
+        max_error_rate: float = ROUTER_MAX_ERROR_RATE,
+        max_hedged_requests: int = 2,
+        latency_window: int = ROUTER_LATENCY_WINDOW,
+        **kwargs,
+    ):
+        if not models:
+            raise ValueError(f"Router {model_id} needs at least one model")
+        super().__init__(model_id=model_id, **kwargs)
+        self.models = models
+        self.hedge_delay = hedge_delay
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.max_hedged_requests = max(1, max_hedged_requests)
+        self.latency_stats = [LatencyStats(window=latency_window) for _ in models]
+
+    def _ranked_members(self) -> List[int]:
+        # Members without latencies yet rank at the median of the others, neither first nor last
+        sampled = sorted(stats.p50 for stats in self.latency_stats if stats.p50 is not None)
+        default_p50 = sampled[len(sampled) // 2] if sampled else 0.0
+
+        def score(index: int):
+            stats = self.latency_stats[index]
+            p50 = stats.p50
+            return (stats.error_rate > self.max_error_rate, p50 if p50 is not None else default_p50)
+        return sorted(range(len(self.models)), key=score)
+
+    def _get_hedge_delay(self, index: int) -> float:
+        stats = self.latency_stats[index]
+        if len(stats.latencies) < self.min_samples:
+            return self.hedge_delay
+        return stats.p95
+
+    async def _timed_generate(self, index: int, *args, **kwargs) -> ChatMessage:
+        start = time.monotonic()
+        try:
+            response = await self.models[index].generate(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.latency_stats[index].record_error()
+            raise
+        self.latency_stats[index].record_success(time.monotonic() - start)
+        return response
+
+    async def generate(
+        self,
+        messages: list[ChatMessage],
+        stop_sequences: list[str] | None = None,
+        response_format: dict[str, str] | None = None,
+        tools_to_call_from: list[Any] | None = None,
+        **kwargs,
+    ) -> ChatMessage:
+        members = deque(self._ranked_members())
+        pending: Dict[asyncio.Task, int] = {}
+        start_times: Dict[asyncio.Task, float] = {}
+        last_error: Exception | None = None
+
+        def launch():
+            index = members.popleft()
+            task = asyncio.create_task(self._timed_generate(
+                index,
+                messages,
+                stop_sequences=stop_sequences,
+                response_format=response_format,
+                tools_to_call_from=tools_to_call_from,
+                **kwargs,
+            ))
+            pending[task] = index
+            start_times[task] = time.monotonic()
+            return index
+
+        try:
+            primary = launch()
+            while pending:
+                # Hedge only while fewer than max_hedged_requests are in flight
+                can_hedge = members and len(pending) < self.max_hedged_requests
+                timeout = self._get_hedge_delay(primary) if can_hedge else None
+                done, _ = await asyncio.wait(pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    index = launch()
+                    self.latency_stats[index].hedges += 1
+                    logger.warning(f"{self.model_id}: {self.models[primary].model_id} exceeded "
+                                   f"{timeout:.1f}s, hedging with {self.models[index].model_id}")
+                    primary = index
+                    continue
+
+                for task in done:
+                    index = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        self.latency_stats[index].wins += 1
+                        # The losers took at least as long as the winner, so a stalled member is ranked down
+                        for loser, loser_index in pending.items():
+                            self.latency_stats[loser_index].record_censored(time.monotonic() - start_times[loser])
+                        return task.result()
+                    last_error = error
+                    logger.warning(f"{self.model_id}: {self.models[index].model_id} failed with {error!r}")
+
+                # Fail over when nothing is left in flight
+                if not pending and members:
+                    primary = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the cancelled requests so that their exceptions are retrieved
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        raise last_error
+
+    def _failover_members(self):
+        members = self._ranked_members()
+        for position, index in enumerate(members):
+            yield index, position == len(members) - 1
+
+    def generate_stream(
+        self,
+        messages: list[ChatMessage],
+        stop_sequences: list[str] | None = None,
+        response_format: dict[str, str] | None = None,
+        tools_to_call_from: list[Any] | None = None,
+        **kwargs,
+    ) -> Generator[ChatMessageStreamDelta]:
+        for index, is_last in self._failover_members():
+            started = False
+            try:
+                for event in self.models[index].generate_stream(
+                    messages,
+                    stop_sequences=stop_sequences,
+                    response_format=response_format,
+                    tools_to_call_from=tools_to_call_from,
+                    **kwargs,
+                ):
+                    started = True
+                    yield event
+                return
+            except Exception as e:
+                self.latency_stats[index].record_error()
+                if started or is_last:
+                    raise
+                logger.warning(f"{self.model_id}: {self.models[index].model_id} failed with {e!r}")
+
+    async def agenerate_stream(
+        self,
+        messages: list[ChatMessage],
+        stop_sequences: list[str] | None = None,
+        response_format: dict[str, str] | None = None,
+        tools_to_call_from: list[Any] | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[ChatMessageStreamDelta]:
+        for index, is_last in self._failover_members():
+            model = self.models[index]
+            if hasattr(model, "agenerate_stream"):
+                output_stream = model.agenerate_stream(
+                    messages,
+                    stop_sequences=stop_sequences,
+                    response_format=response_format,
+                    tools_to_call_from=tools_to_call_from,
+                    **kwargs,
+                )
+            else:
+                output_stream = _iterate_async(model.generate_stream(
+                    messages,
+                    stop_sequences=stop_sequences,
+                    response_format=response_format,
+                    tools_to_call_from=tools_to_call_from,
+                    **kwargs,
+                ))
+
+            started = False
+            start = time.monotonic()
+            try:
+                async for event in output_stream:
+                    started = True
+                    yield event
+                self.latency_stats[index].record_success(time.monotonic() - start)
+                return
+            except Exception as e:
+                self.latency_stats[index].record_error()
+                if started or is_last:
+                    raise
+                logger.warning(f"{self.model_id}: {model.model_id} failed with {e!r}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [{"model_id": model.model_id, **stats.stats()} for model, stats in zip(self.models, self.latency_stats)]
+
+    async def __call__(self, *args, **kwargs) -> ChatMessage:
+        return await self.generate(*args, **kwargs)
+
+
+async def _iterate_async(generator: Generator) -> AsyncGenerator:
+    for event in generator:
+        yield event
+
+
+__all__ = [
+    "LatencyStats",
+    "RouterModel",
+]
@@ -1,8 +1,17 @@
-from src.proxy.local_proxy import HTTP_CLIENT, ASYNC_HTTP_CLIENT, PROXY_URL, proxy_env
+from src.proxy.local_proxy import (HTTP_CLIENT,
+                                   ASYNC_HTTP_CLIENT,
+                                   PROXY_URL,
+                                   proxy_env,
+                                   build_http_client,
+                                   build_async_http_client,
+                                   HostLimitedAsyncTransport)
 
 __all__ = [
     "HTTP_CLIENT",
     "ASYNC_HTTP_CLIENT",
     "PROXY_URL",
     "proxy_env",
-]
\ No newline at end of file
+    "build_http_client",
+    "build_async_http_client",
+    "HostLimitedAsyncTransport",
+]
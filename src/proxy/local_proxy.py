@@ -1,18 +1,174 @@
 import os
+import asyncio
 import httpx
+import ipaddress
 import contextlib
+import importlib.util
+import urllib.request
+from typing import Dict, Optional
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
 load_dotenv(verbose=True)
 
 PROXY_URL = os.getenv('LOCAL_PROXY_BASE', None)
 
-if PROXY_URL:
-    HTTP_CLIENT = httpx.Client(proxy=PROXY_URL, timeout=httpx.Timeout(600.0, connect=60.0))
-    ASYNC_HTTP_CLIENT = httpx.AsyncClient(proxy=PROXY_URL, timeout=httpx.Timeout(600.0, connect=60.0))
-else:
-    HTTP_CLIENT = httpx.Client()
-    ASYNC_HTTP_CLIENT = httpx.AsyncClient()
+# Connection pool settings shared by every HTTP client of the process
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 600.0))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 60.0))
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', 100))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', 20))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', 20))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', 30.0))
+HTTP2 = os.getenv('HTTP2', 'false').lower() in ('1', 'true', 'yes')
+
+
+def _http2_enabled(http2: bool) -> bool:
+    # HTTP/2 needs the optional `h2` package, fall back to HTTP/1.1 without it
+    return http2 and importlib.util.find_spec("h2") is not None
+
+
+def _get_environment_proxies() -> Dict[str, Optional[str]]:
+    """httpx mounts of the HTTP(S)_PROXY/ALL_PROXY environment variables, NO_PROXY hosts mapped to None.
+
+    Clients given a transport skip the proxies of the environment, so they are resolved here like httpx does.
+    """
+    proxies = urllib.request.getproxies()
+    mounts: Dict[str, Optional[str]] = {}
+    for scheme in ("http", "https", "all"):
+        if proxies.get(scheme):
+            proxy_url = proxies[scheme]
+            mounts[f"{scheme}://"] = proxy_url if "://" in proxy_url else f"http://{proxy_url}"
+
+    for hostname in [hostname.strip() for hostname in proxies.get("no", "").split(",")]:
+        if hostname == "*":
+            return {}
+        if not hostname:
+            continue
+        if "://" in hostname:
+            mounts[hostname] = None
+            continue
+        try:
+            address = ipaddress.ip_address(hostname)
+            mounts[f"all://[{hostname}]" if address.version == 6 else f"all://{hostname}"] = None
+        except ValueError:
+            mounts[f"all://{hostname}" if hostname.lower() == "localhost" else f"all://*{hostname}"] = None
+    return mounts
+
+
+class _ReleasingByteStream(httpx.AsyncByteStream):
+    """Response stream that gives back the host slot once the body is consumed or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class HostLimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async transport that caps the number of in-flight requests per host.
+
+    httpx only limits the pool as a whole, so a single slow provider could take
+    every connection. Each host gets its own semaphore here and the slot is held
+    until the response body has been read (this keeps streaming responses honest).
+    """
+
+    def __init__(self,
+                 max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+                 semaphores: Optional[Dict[str, asyncio.Semaphore]] = None,
+                 **transport_kwargs):
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+        self.max_connections_per_host = max_connections_per_host
+        # Shared by the transports of a client, e.g. one per proxy, so that a host has a single cap
+        self._semaphores: Dict[str, asyncio.Semaphore] = {} if semaphores is None else semaphores
+
+    def _get_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._semaphores[host]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._get_semaphore(request.url.host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingByteStream(response.stream, semaphore),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def build_http_client(proxy: Optional[str] = PROXY_URL,
+                      timeout: float = HTTP_TIMEOUT,
+                      connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                      max_connections: int = HTTP_MAX_CONNECTIONS,
+                      max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                      http2: bool = HTTP2) -> httpx.Client:
+    """Build a keep-alive, pooled synchronous HTTP client."""
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_keepalive_connections,
+                          keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+    return httpx.Client(proxy=proxy,
+                        limits=limits,
+                        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+                        http2=_http2_enabled(http2))
+
+
+def build_async_http_client(proxy: Optional[str] = PROXY_URL,
+                            timeout: float = HTTP_TIMEOUT,
+                            connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                            max_connections: int = HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                            max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+                            http2: bool = HTTP2) -> httpx.AsyncClient:
+    """Build a keep-alive, pooled asynchronous HTTP client with per-host connection limits.
+
+    Without `proxy`, the proxies of the HTTP(S)_PROXY, ALL_PROXY and NO_PROXY environment variables are used.
+    """
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_keepalive_connections,
+                          keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+    semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def build_transport(proxy_url: Optional[str]) -> HostLimitedAsyncTransport:
+        return HostLimitedAsyncTransport(max_connections_per_host=max_connections_per_host,
+                                         semaphores=semaphores,
+                                         proxy=proxy_url,
+                                         limits=limits,
+                                         http2=_http2_enabled(http2))
+
+    # Mounts without a proxy fall back to the default transport
+    mounts = {} if proxy is not None else {
+        pattern: build_transport(proxy_url) if proxy_url is not None else None
+        for pattern, proxy_url in _get_environment_proxies().items()
+    }
+    return httpx.AsyncClient(transport=build_transport(proxy),
+                             mounts=mounts,
+                             timeout=httpx.Timeout(timeout, connect=connect_timeout))
+
+
+HTTP_CLIENT = build_http_client()
+ASYNC_HTTP_CLIENT = build_async_http_client()
 
 @contextlib.contextmanager
 def proxy_env(proxy_url: str = PROXY_URL):
@@ -28,5 +184,8 @@ __all__ = [
     "PROXY_URL",
     "HTTP_CLIENT",
     "ASYNC_HTTP_CLIENT",
+    "build_http_client",
+    "build_async_http_client",
+    "HostLimitedAsyncTransport",
     "proxy_env",
-]
\ No newline at end of file
+]
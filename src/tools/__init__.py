@@ -1,4 +1,10 @@
-from src.tools.tools import Tool, ToolResult, AsyncTool, make_tool_instance
+from src.tools.tools import (Tool,
+                             ToolResult,
+                             AsyncTool,
+                             make_tool_instance,
+                             report_tool_progress,
+                             stream_progress,
+                             tool_progress_callback)
 from src.tools.deep_analyzer import DeepAnalyzerTool
 from src.tools.deep_researcher import DeepResearcherTool
 from src.tools.python_interpreter import PythonInterpreterTool
@@ -14,6 +20,9 @@ __all__ = [
     "Tool",
     "ToolResult",
     "AsyncTool",
+    "report_tool_progress",
+    "stream_progress",
+    "tool_progress_callback",
     "DeepAnalyzerTool",
     "DeepResearcherTool",
     "PythonInterpreterTool",
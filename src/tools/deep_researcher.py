@@ -2,14 +2,21 @@ import json
 import json5
 import re
 import time
-from typing import List, Optional, Set, Tuple
+import heapq
+import asyncio
+import itertools
+from contextvars import ContextVar
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-from src.models import model_manager, ChatMessage
+from src.models import model_manager, ChatMessage, RouterModel
+from src.models.base import ApiModel
 from src.tools.web_searcher import WebSearcherTool, SearchResult
-from src.tools import AsyncTool, ToolResult
+from src.tools.research_memo import research_memo
+from src.tools import AsyncTool, ToolResult, report_tool_progress
 from src.logger import logger
 from src.registry import TOOL
+from src.utils import NearDuplicateIndex, split_passages, bm25_scores, rank_passages, get_token_cost
 
 
 _DEEP_RESEARCHER_DESCRIPTION = """Performs comprehensive research on a topic through multi-level web searches and content analysis. 
@@ -56,6 +63,9 @@ Each query should be concise and focused on a specific aspect of the research to
 DEFAULT_RELEVANCE_SCORE = 1.0
 FALLBACK_RELEVANCE_SCORE = 0.7
 FALLBACK_CONTENT_LIMIT = 500
+MAX_INSIGHTS_PER_CONTENT = 3
+# Separator of the non-contiguous passages sent for analysis
+PASSAGE_SEPARATOR = "\n\n[...]\n\n"
 # Pattern to detect start of an insight (number., -, *, •) and capture content
 INSIGHT_MARKER_PATTERN = re.compile(r"^\s*(?:\d+\.|-|\*|•)\s*(.*)")
 # Pattern to detect relevance score, capturing the number (case-insensitive)
@@ -78,14 +88,82 @@ class ResearchInsight(BaseModel):
         source = self.source_title or self.source_url
         return f"{self.content} [Source: {source}]"
 
+class ResearchBudget():
+    """Tokens and dollars spent by a research run, against optional limits."""
+
+    def __init__(self, max_tokens: Optional[int] = None, max_cost: Optional[float] = None):
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.tokens = 0
+        self.cost = 0.0
+        self.calls = 0
+
+    def record(self, model_id: str, token_usage: Any) -> None:
+        self.calls += 1
+        if token_usage is None:
+            return
+        self.tokens += token_usage.total_tokens
+        self.cost += get_token_cost(model_id,
+                                    token_usage.input_tokens,
+                                    token_usage.output_tokens,
+                                    getattr(token_usage, "cached_input_tokens", 0))
+
+    @property
+    def exhausted(self) -> bool:
+        return ((self.max_tokens is not None and self.tokens >= self.max_tokens)
+                or (self.max_cost is not None and self.cost >= self.max_cost))
+
+    def __str__(self) -> str:
+        return f"{self.tokens} tokens, ${self.cost:.4f} over {self.calls} calls"
+
+
+# Budget of the research run of the current task, charged by every model call of the run
+_research_budget: ContextVar[Optional[ResearchBudget]] = ContextVar("research_budget", default=None)
+
+
 class ResearchContext(BaseModel):
     """Research context for tracking research progress."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     query: str = Field(description="The original research query")
     insights: List[ResearchInsight] = Field(default_factory=list, description="Key insights discovered")
     follow_up_queries: List[str] = Field(default_factory=list, description="Generated follow-up queries")
     visited_urls: Set[str] = Field(default_factory=set, description="URLs visited during research")
     current_depth: int = Field(default=0, description="Current depth of research exploration", ge=0)
     max_depth: int = Field(default=2, description="Maximum depth of research to reach", ge=1)
+    content_index: NearDuplicateIndex = Field(default_factory=NearDuplicateIndex,
+                                              description="Fingerprints of the contents analyzed during research")
+    budget: ResearchBudget = Field(default_factory=ResearchBudget, description="Tokens and dollars spent")
+
+class ResearchEvent(BaseModel):
+    """Progress of a research run, reported while it runs. See `AsyncTool.forward_stream`."""
+    type: str = Field(description="Kind of event")
+
+class ResearchQueryEvent(ResearchEvent):
+    """A query of the research graph starts being researched."""
+    type: Literal["query"] = "query"
+    query: str = Field(description="The query searched")
+    depth: int = Field(description="Depth of the query in the research graph", ge=0)
+
+class ResearchFetchEvent(ResearchEvent):
+    """A search result of a query was fetched."""
+    type: Literal["fetch"] = "fetch"
+    query: str = Field(description="The query the result was found for")
+    url: str = Field(description="URL of the result")
+    title: Optional[str] = Field(default=None, description="Title of the result")
+    has_content: bool = Field(description="Whether content could be fetched from the URL")
+
+class ResearchInsightEvent(ResearchEvent):
+    """An insight was found."""
+    type: Literal["insight"] = "insight"
+    insight: ResearchInsight = Field(description="The insight found")
+
+class ResearchSummaryEvent(ResearchEvent):
+    """Summary of the insights found so far, or the final summary."""
+    type: Literal["summary"] = "summary"
+    content: str = Field(description="The summary")
+    partial: bool = Field(description="Whether the research is still running")
 
 class ResearchSummary(BaseModel):
     """Comprehensive summary of deep research results."""
@@ -252,19 +330,48 @@ class DeepResearcherTool(AsyncTool):
                  max_insights: int = 20,
                  time_limit_seconds: int = 120,
                  max_follow_ups: int = 3,
+                 max_branches: int = 2,
+                 max_concurrency: int = 4,
+                 max_concurrent_analyses: int = 5,
+                 duplicate_threshold: float = 0.8,
+                 max_content_length: int = 32768,
+                 passage_length: int = 1000,
+                 top_k_passages: int = 4,
+                 map_reduce_passages: int = 24,
+                 max_map_chunks: int = 3,
+                 max_tokens: Optional[int] = None,
+                 max_cost: Optional[float] = None,
+                 min_marginal_gain: float = 0.0,
+                 marginal_gain_window: int = 3,
+                 max_depth: Optional[int] = None,
                  **kwargs):
 
         super(DeepResearcherTool, self).__init__()
 
         self.model_id = model_id
-        self.max_depth = maxt_depth
+        self.max_depth = max_depth or maxt_depth
         self.max_insights = max_insights
         self.time_limit_seconds = time_limit_seconds
         self.max_follow_ups = max_follow_ups
+        self.max_branches = max_branches  # Follow-up queries researched per node
+        self.max_concurrency = max(1, max_concurrency)  # Nodes researched at the same time
+        self.max_concurrent_analyses = max(1, max_concurrent_analyses)  # Contents analyzed at the same time per node
+        self.duplicate_threshold = duplicate_threshold  # Similarity from which a content is not analyzed again
+        self.passage_length = passage_length  # Characters per passage ranked against the query
+        self.top_k_passages = top_k_passages  # Passages analyzed per LLM call
+        self.map_reduce_passages = map_reduce_passages  # Contents with more passages are analyzed in several chunks
+        self.max_map_chunks = max_map_chunks
+        self.max_tokens = max_tokens  # Tokens a research run may spend, unlimited if None
+        self.max_cost = max_cost  # Dollars a research run may spend, unlimited if None
+        # Expansion stops once the last `marginal_gain_window` nodes found less new relevance than this on average
+        self.min_marginal_gain = min_marginal_gain
+        self.marginal_gain_window = max(1, marginal_gain_window)
 
         self.model = model_manager.registed_models[self.model_id]
         self.web_searcher = WebSearcherTool()
         self.web_searcher.fetch_content = True # Enable content fetching
+        self.web_searcher.max_length = max_content_length # Passages are selected from the whole fetched content
+        self.memo = research_memo
 
     async def forward(
         self,
@@ -275,8 +382,12 @@ class DeepResearcherTool(AsyncTool):
         max_depth = max(1, min(self.max_depth, 5))
 
         # Initialize research context and set deadline
-        context = ResearchContext(query=query, max_depth=max_depth)
+        context = ResearchContext(query=query,
+                                  max_depth=max_depth,
+                                  content_index=NearDuplicateIndex(threshold=self.duplicate_threshold),
+                                  budget=ResearchBudget(max_tokens=self.max_tokens, max_cost=self.max_cost))
         deadline = time.time() + self.time_limit_seconds
+        budget_token = _research_budget.set(context.budget)
 
         try:
             optimized_query, filter_year = await self._generate_optimized_query(query)
@@ -286,6 +397,7 @@ class DeepResearcherTool(AsyncTool):
                                        deadline=deadline
                                        )
         except Exception as e:
+            _research_budget.reset(budget_token)
             res_str = f"DeepResearchTool failed to complete the research cycle: {str(e)}"
             logger.error(res_str)
             return ToolResult(
@@ -294,14 +406,14 @@ class DeepResearcherTool(AsyncTool):
             )
 
         # Prepare final summary reference
-        reference = ResearchSummary(
-            query=query,
-            insights=sorted(context.insights, key=lambda x: x.relevance_score, reverse=True)[:self.max_insights],
-            visited_urls=context.visited_urls,
-            depth_reached=context.current_depth,
-        )
+        reference = self._get_reference(context)
 
-        output = await self._summary(query, reference.output)
+        try:
+            output = await self._summary(query, reference.output)
+        finally:
+            _research_budget.reset(budget_token)
+        logger.info(f"DeepResearchTool research used {context.budget}.")
+        report_tool_progress(ResearchSummaryEvent(content=output, partial=False))
 
         result = ToolResult(
             output=output,
@@ -310,6 +422,28 @@ class DeepResearcherTool(AsyncTool):
 
         return result
 
+    def _get_reference(self, context: ResearchContext) -> ResearchSummary:
+        """Summarize the most relevant insights found so far."""
+        return ResearchSummary(
+            query=context.query,
+            insights=sorted(context.insights, key=lambda x: x.relevance_score, reverse=True)[:self.max_insights],
+            visited_urls=context.visited_urls,
+            depth_reached=context.current_depth,
+        )
+
+    async def _call_model(self, model: Any, use_cache: bool = False, **kwargs) -> ChatMessage:
+        """Call a model and charge its token usage to the budget of the current research run.
+
+        With `use_cache`, identical calls are answered from the response cache, e.g. when rerunning a task.
+        """
+        if use_cache and isinstance(model, (ApiModel, RouterModel)):
+            kwargs["use_cache"] = True
+        response = await model(**kwargs)
+        budget = _research_budget.get()
+        if budget is not None and response is not None:
+            budget.record(model.model_id, getattr(response, "token_usage", None))
+        return response
+
     async def _generate_optimized_query(self, query: str) -> Tuple[str, Optional[int]]:
         """Generate an optimized search query using LLM."""
         try:
@@ -323,8 +457,10 @@ class DeepResearcherTool(AsyncTool):
                 OptimizedQueryTool()
             ]
 
-            response = await self.model(
-                messages = messages,
+            response = await self._call_model(
+                self.model,
+                use_cache=True,
+                messages=messages,
                 tools_to_call_from=tools
             )
 
@@ -358,18 +494,108 @@ class DeepResearcherTool(AsyncTool):
         filter_year: Optional[int] = None,
         deadline: Optional[float] = None,
     ) -> None:
-        """Run a complete research cycle (search, analyze, generate follow-ups)."""
-        # Check termination conditions
-        if time.time() >= deadline or context.current_depth >= context.max_depth:
-            return
+        """Explore the research graph best first from the query.
+
+        Up to `max_concurrency` nodes are researched at the same time. Each node adds up to
+        `max_branches` follow-up queries to the frontier until `max_depth` is reached, prioritized by
+        the relevance of the new insights they were generated from. Expansion stops when the token or
+        dollar budget is exhausted or when the recent nodes stop finding new relevant insights, and
+        the running nodes are then left to finish. Nodes still running at the deadline are cancelled,
+        keeping the insights found so far.
+        """
+        order = itertools.count()
+        # Frontier entries are (-priority, depth, insertion order, query), the root having the highest priority
+        frontier: List[Tuple[float, int, int, str]] = [(-1.0, 0, next(order), query)]
+        seen_queries = {query.strip().lower()}
+        seen_insights: Set[str] = set()
+        gains: List[float] = []
+        running: Dict[asyncio.Task, Tuple[str, int]] = {}
 
-        logger.info(f"DeepResearchTool Research cycle at depth {context.current_depth + 1} - Query: {query}")
+        try:
+            while frontier or running:
+                while frontier and len(running) < self.max_concurrency:
+                    _, depth, _, node_query = heapq.heappop(frontier)
+                    task = asyncio.create_task(self._research_node(context=context,
+                                                                   query=node_query,
+                                                                   depth=depth,
+                                                                   filter_year=filter_year,
+                                                                   deadline=deadline))
+                    running[task] = (node_query, depth)
+
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    logger.info(f"DeepResearchTool reached its time limit with {len(running)} running "
+                                f"and {len(frontier)} pending queries")
+                    break
+
+                done, _ = await asyncio.wait(running.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_query, depth = running.pop(task)
+                    if task.exception() is not None:
+                        logger.warning(f"DeepResearchTool failed to research {node_query}: {task.exception()}")
+                        continue
+
+                    follow_up_queries, insights = task.result()
+                    new_insights = []
+                    for insight in insights:
+                        key = insight.content.strip().lower()
+                        if key not in seen_insights:
+                            seen_insights.add(key)
+                            new_insights.append(insight)
+                    gains.append(sum(insight.relevance_score for insight in new_insights))
+                    if new_insights:
+                        report_tool_progress(ResearchSummaryEvent(content=self._get_reference(context).output,
+                                                                  partial=True))
+
+                    if depth + 1 >= context.max_depth or not new_insights:
+                        continue
+                    priority = sum(insight.relevance_score for insight in new_insights) / len(new_insights)
+                    for follow_up in follow_up_queries[:self.max_branches]:
+                        key = follow_up.strip().lower()
+                        if key and key not in seen_queries:
+                            seen_queries.add(key)
+                            heapq.heappush(frontier, (-priority, depth + 1, next(order), follow_up))
+
+                stop_reason = self._get_stop_reason(context, gains)
+                if stop_reason and frontier:
+                    logger.info(f"DeepResearchTool stops expanding with {len(frontier)} pending queries: {stop_reason}")
+                    frontier.clear()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def _get_stop_reason(self, context: ResearchContext, gains: List[float]) -> Optional[str]:
+        """Return why the research graph should not be expanded further, if it should not."""
+        if context.budget.exhausted:
+            return f"budget exhausted after {context.budget}"
+        if len(gains) >= self.marginal_gain_window:
+            recent_gain = sum(gains[-self.marginal_gain_window:]) / self.marginal_gain_window
+            if recent_gain < self.min_marginal_gain:
+                return f"the last {self.marginal_gain_window} nodes found {recent_gain:.2f} new relevance on average"
+        return None
+
+    async def _research_node(
+        self,
+        context: ResearchContext,
+        query: str,
+        depth: int,
+        filter_year: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[List[str], List[ResearchInsight]]:
+        """Run a research cycle (search, analyze, generate follow-ups) and return the follow-up queries and the insights."""
+        logger.info(f"DeepResearchTool Research cycle at depth {depth + 1} - Query: {query}")
+        report_tool_progress(ResearchQueryEvent(query=query, depth=depth))
 
         # 1. Web search
         search_results = await self._search_web(query, filter_year)
+        for rst in search_results:
+            report_tool_progress(ResearchFetchEvent(query=query, url=rst.url, title=rst.title,
+                                                    has_content=bool(rst.raw_content)))
 
         if not search_results:
-            return
+            return [], []
 
         # 2. Extract insights
         new_insights = await self._extract_insights(
@@ -379,8 +605,8 @@ class DeepResearcherTool(AsyncTool):
             deadline
         )
 
-        if not new_insights:
-            return
+        if not new_insights or context.budget.exhausted:
+            return [], new_insights
 
         # 3. Generate follow-up queries
         follow_up_queries = await self._generate_follow_ups(
@@ -389,25 +615,9 @@ class DeepResearcherTool(AsyncTool):
             context.query
         )
         context.follow_up_queries.extend(follow_up_queries)
+        context.current_depth = max(context.current_depth, depth + 1)
 
-        # Update depth and proceed to next level
-        context.current_depth += 1
-
-        # 4. Continue research with follow-up queries
-        if follow_up_queries and context.current_depth < context.max_depth:
-            tasks = []  # Create a list to hold the tasks
-            for follow_up in follow_up_queries[:2]:  # Limit branching factor
-                if time.time() >= deadline:
-                    break
-
-                # Create a coroutine for the recursive research call
-                task = await self._research_graph(
-                    context=context,
-                    query=follow_up,
-                    filter_year=filter_year,
-                    deadline=deadline,
-                )
-                tasks.append(task)  # Add the task to the list
+        return follow_up_queries, new_insights
 
     async def _search_web(self,
                     query: str,
@@ -426,9 +636,26 @@ class DeepResearcherTool(AsyncTool):
         original_query: str,
         deadline: float,
     ) -> List[ResearchInsight]:
-        """Extract insights from search results."""
+        """Extract insights from search results, analyzing up to `max_concurrent_analyses` results at a time.
+
+        Near-duplicates of a content already analyzed during the research are skipped. Insights are merged into the context as each analysis completes. Analyses still running at
+        the deadline are cancelled.
+        """
         all_insights = []
+        semaphore = asyncio.Semaphore(self.max_concurrent_analyses)
+
+        async def analyze(rst: SearchResult) -> List[ResearchInsight]:
+            async with semaphore:
+                if context.budget.exhausted:
+                    return []
+                return await self._analyze_content(
+                    content=rst.raw_content,
+                    url=rst.url,
+                    title=rst.title,
+                    query=original_query,
+                )
 
+        running: Dict[asyncio.Task, SearchResult] = {}
         for rst in results:
             # Skip if URL already visited or time exceeded
             if rst.url in context.visited_urls or time.time() >= deadline:
@@ -440,19 +667,43 @@ class DeepResearcherTool(AsyncTool):
             if not rst.raw_content:
                 continue
 
-            # Extract insights using LLM
-            insights = await self._analyze_content(
-                content=rst.raw_content,  # Limit content size
-                url=rst.url,
-                title=rst.title,
-                query=original_query,
-            )
+            # Skip mirrors and syndicated copies of an already analyzed content
+            duplicate = context.content_index.add(rst.url, rst.raw_content)
+            if duplicate is not None:
+                duplicate_url, similarity = duplicate
+                logger.info(f"DeepResearchTool skipped {rst.url}, a near-duplicate of {duplicate_url} "
+                            f"({similarity:.2f} similarity).")
+                continue
+
+            running[asyncio.create_task(analyze(rst))] = rst
 
-            all_insights.extend(insights)
-            context.insights.extend(insights)
+        try:
+            while running:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    logger.info(f"DeepResearchTool reached its time limit with {len(running)} contents left to analyze.")
+                    break
 
-            # Log discovered insights
-            logger.info(f"DeepResearchTool found {len(insights)} insights in {rst.title or rst.url}.")
+                done, _ = await asyncio.wait(running.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    rst = running.pop(task)
+                    if task.exception() is not None:
+                        logger.warning(f"DeepResearchTool failed to analyze {rst.url}: {task.exception()}")
+                        continue
+
+                    insights = task.result()
+                    all_insights.extend(insights)
+                    context.insights.extend(insights)
+                    for insight in insights:
+                        report_tool_progress(ResearchInsightEvent(insight=insight))
+
+                    # Log discovered insights
+                    logger.info(f"DeepResearchTool found {len(insights)} insights in {rst.title or rst.url}.")
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
 
         return all_insights
 
@@ -485,7 +736,9 @@ class DeepResearcherTool(AsyncTool):
         ]
 
         # Get follow-up queries from LLM using structured output
-        response = await self.model(
+        response = await self._call_model(
+            self.model,
+            use_cache=True,
             messages=messages,
             tools_to_call_from=tools
         )
@@ -498,12 +751,87 @@ class DeepResearcherTool(AsyncTool):
 
         return queries[:min(len(queries), self.max_follow_ups)]
 
+    def _select_chunks(self, content: str, query: str) -> List[str]:
+        """Reduce a content to its passages most relevant to the query, ranked with BM25.
+
+        Contents of at most `top_k_passages` passages are kept whole. Longer ones keep their `top_k_passages`
+        best passages, and contents of more than `map_reduce_passages` passages are split into up to
+        `max_map_chunks` chunks of relevant passages analyzed separately. Passages keep their document order.
+        """
+        passages = split_passages(content, self.passage_length)
+        if len(passages) <= self.top_k_passages:
+            return [content]
+
+        num_chunks = 1
+        if len(passages) > self.map_reduce_passages:
+            relevant_passages = int((bm25_scores(query, passages) > 0).sum())
+            num_chunks = max(1, min(self.max_map_chunks, -(-relevant_passages // self.top_k_passages)))
+
+        ranked = rank_passages(query, passages, self.top_k_passages * num_chunks)
+        chunks = [sorted(ranked[i:i + self.top_k_passages]) for i in range(0, len(ranked), self.top_k_passages)]
+        return [PASSAGE_SEPARATOR.join(passages[index] for index in chunk) for chunk in chunks]
+
     async def _analyze_content(
         self, content: str, url: str, title: str, query: str
     ) -> List[ResearchInsight]:
-        """Extract insights from content based on relevance to query."""
+        """Extract insights from content based on relevance to query.
+
+        Only the passages most relevant to the query are analyzed. When they are split into several chunks,
+        the chunks are analyzed concurrently and their most relevant insights kept. Insights are memoized
+        per content, query and model across runs.
+        """
+        memo_insights = await self.memo.aget_insights(content, query, self.model_id)
+        if memo_insights is not None:
+            logger.info(f"DeepResearchTool reused {len(memo_insights)} memoized insights for {url}.")
+            return [ResearchInsight(source_url=url, source_title=title, **insight) for insight in memo_insights]
+
+        chunks = self._select_chunks(content, query)
+        if len(chunks) == 1:
+            insights = await self._analyze_chunk(chunks[0], url, title, query)
+        else:
+            logger.info(f"DeepResearchTool analyzes {url} in {len(chunks)} chunks.")
+            results = await asyncio.gather(*[self._analyze_chunk(chunk, url, title, query) for chunk in chunks],
+                                           return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if len(errors) == len(results):
+                raise errors[0]
+
+            # Reduce: keep the most relevant distinct insights across chunks
+            insights = {}
+            for result in results:
+                if not isinstance(result, BaseException):
+                    for insight in result:
+                        kept = insights.get(insight.content)
+                        if kept is None or kept.relevance_score < insight.relevance_score:
+                            insights[insight.content] = insight
+            insights = sorted(insights.values(), key=lambda x: x.relevance_score, reverse=True)[:MAX_INSIGHTS_PER_CONTENT]
+
+        if insights:
+            await self.memo.aset_insights(content, query, self.model_id,
+                                          [insight.model_dump(include={"content", "relevance_score"}) for insight in insights])
+
+        # Fallback: if no structured insights found, use fallback approach
+        if not insights:
+            logger.info(f"Could not parse structured insights from LLM response for {url}. Using fallback.")
+            insights.append(
+                ResearchInsight(
+                    content=f"Failed to extract structured insights from content about {title or url}."[
+                        :FALLBACK_CONTENT_LIMIT
+                    ],
+                    source_url=url,
+                    source_title=title,
+                    relevance_score=FALLBACK_RELEVANCE_SCORE,
+                )
+            )
+
+        return insights
+
+    async def _analyze_chunk(
+        self, content: str, url: str, title: str, query: str
+    ) -> List[ResearchInsight]:
+        """Extract insights from a chunk of content with the LLM."""
         prompt = EXTRACT_INSIGHTS_PROMPT.format(
-            query=query, content=content  # Limit content size
+            query=query, content=content
         )
 
         messages = [
@@ -514,7 +842,9 @@ class DeepResearcherTool(AsyncTool):
             ExtractInsightsTool()
         ]
 
-        response = await self.model(
+        response = await self._call_model(
+            self.model,
+            use_cache=True,
             messages=messages,
             tools_to_call_from=tools
         )
@@ -538,20 +868,6 @@ class DeepResearcherTool(AsyncTool):
                     )
                 )
 
-        # Fallback: if no structured insights found, use fallback approach
-        if not insights:
-            logger.info(f"Could not parse structured insights from LLM response for {url}. Using fallback.")
-            insights.append(
-                ResearchInsight(
-                    content=f"Failed to extract structured insights from content about {title or url}."[
-                        :FALLBACK_CONTENT_LIMIT
-                    ],
-                    source_url=url,
-                    source_title=title,
-                    relevance_score=FALLBACK_RELEVANCE_SCORE,
-                )
-            )
-
         return insights
 
     async def _summary(self, query: str, reference_materials: str) -> str:
@@ -562,7 +878,8 @@ class DeepResearcherTool(AsyncTool):
             {"role": "user", "content": query}
         ]
         messages = [ChatMessage.from_dict(m) for m in messages] # Convert to ChatMessage format
-        response = await model(
+        response = await self._call_model(
+            model,
             messages=messages,
         )
         content = response.content
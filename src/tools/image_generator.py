@@ -145,7 +145,7 @@ class ImageGeneratorTool(AsyncTool):
 
         # Use the generator model to create the image
         try:
-            response = self.generator_model(prompt)
+            response = await self.generator_model.agenerate(prompt)
             if response:
                 image_data = base64.b64decode(response)
                 save_path = os.path.join(config.exp_path, save_name)
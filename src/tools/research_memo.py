@@ -0,0 +1,179 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from src.logger import logger
+
+load_dotenv(verbose=True)
+
+RESEARCH_MEMO_ENABLED = os.getenv('RESEARCH_MEMO_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RESEARCH_MEMO_PATH = os.getenv('RESEARCH_MEMO_PATH', os.path.join(os.path.expanduser('~'), '.cache', 'deepresearchagent', 'research_memo.sqlite'))
+# Search results go stale quickly, insights only depend on the page content.
+# Fetched pages are cached by `src.utils.fetch_cache`.
+RESEARCH_MEMO_SEARCH_TTL = float(os.getenv('RESEARCH_MEMO_SEARCH_TTL', 24 * 3600))
+RESEARCH_MEMO_INSIGHT_TTL = float(os.getenv('RESEARCH_MEMO_INSIGHT_TTL', 30 * 24 * 3600))
+# Expired rows are never returned, they are deleted at most once per interval
+RESEARCH_MEMO_PURGE_INTERVAL = float(os.getenv('RESEARCH_MEMO_PURGE_INTERVAL', 3600))
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS searches ("
+    "query TEXT NOT NULL, params TEXT NOT NULL, results TEXT NOT NULL, created_at REAL NOT NULL, "
+    "PRIMARY KEY (query, params))",
+    "CREATE TABLE IF NOT EXISTS insights ("
+    "content_hash TEXT NOT NULL, query TEXT NOT NULL, model_id TEXT NOT NULL, insights TEXT NOT NULL, "
+    "created_at REAL NOT NULL, PRIMARY KEY (content_hash, query, model_id))",
+    "CREATE INDEX IF NOT EXISTS searches_created_at ON searches(created_at)",
+    "CREATE INDEX IF NOT EXISTS insights_created_at ON insights(created_at)",
+]
+
+
+def normalize_query(query: str) -> str:
+    return _WHITESPACE_PATTERN.sub(" ", query).strip().lower()
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ResearchMemo():
+    """Persistent memo of the web research work, shared across runs and processes.
+
+    Search results are keyed on the normalized query and the search parameters, and extracted
+    insights on the content hash of the page, the normalized research query and the model.
+    Each kind has its own TTL, expired rows are never returned and are purged every `purge_interval`
+    seconds. The `a`-prefixed methods run the SQLite I/O in a thread, for use from the event loop.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = RESEARCH_MEMO_PATH,
+                 search_ttl: Optional[float] = RESEARCH_MEMO_SEARCH_TTL,
+                 insight_ttl: Optional[float] = RESEARCH_MEMO_INSIGHT_TTL,
+                 purge_interval: float = RESEARCH_MEMO_PURGE_INTERVAL,
+                 enabled: bool = RESEARCH_MEMO_ENABLED):
+        self.path = path
+        self.ttls = {"searches": search_ttl, "insights": insight_ttl}
+        self.purge_interval = purge_interval
+        self.enabled = enabled
+        self._purged_at = {table: 0.0 for table in self.ttls}
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.hits = {table: 0 for table in self.ttls}
+        self.misses = {table: 0 for table in self.ttls}
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.enabled and self.path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to open the research memo at {self.path}, disabling it: {e}")
+                self.enabled = False
+        return self._conn
+
+    def _min_created_at(self, table: str) -> float:
+        ttl = self.ttls[table]
+        return time.time() - ttl if ttl is not None else float("-inf")
+
+    def _get(self, table: str, column: str, where: str, args: tuple) -> Optional[Any]:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return None
+            row = conn.execute(f"SELECT {column} FROM {table} WHERE {where} AND created_at >= ?",
+                               args + (self._min_created_at(table),)).fetchone()
+            if row is None:
+                self.misses[table] += 1
+                return None
+            self.hits[table] += 1
+            return row[0]
+
+    def _set(self, table: str, values: Dict[str, Any]) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return
+            values = {**values, "created_at": time.time()}
+            conn.execute(f"INSERT OR REPLACE INTO {table} ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})",
+                         tuple(values.values()))
+            if values["created_at"] - self._purged_at[table] >= self.purge_interval:
+                conn.execute(f"DELETE FROM {table} WHERE created_at < ?", (self._min_created_at(table),))
+                self._purged_at[table] = values["created_at"]
+            conn.commit()
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+    def get_search(self, query: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        results = self._get("searches", "results", "query = ? AND params = ?",
+                            (normalize_query(query), self._dumps(params)))
+        return json.loads(results) if results is not None else None
+
+    def set_search(self, query: str, params: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        self._set("searches", {"query": normalize_query(query), "params": self._dumps(params),
+                               "results": self._dumps(results)})
+
+    def get_insights(self, content: str, query: str, model_id: str) -> Optional[List[Dict[str, Any]]]:
+        insights = self._get("insights", "insights", "content_hash = ? AND query = ? AND model_id = ?",
+                             (get_content_hash(content), normalize_query(query), model_id))
+        return json.loads(insights) if insights is not None else None
+
+    def set_insights(self, content: str, query: str, model_id: str, insights: List[Dict[str, Any]]) -> None:
+        self._set("insights", {"content_hash": get_content_hash(content), "query": normalize_query(query),
+                               "model_id": model_id, "insights": self._dumps(insights)})
+
+    async def aget_search(self, query: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.get_search, query, params)
+
+    async def aset_search(self, query: str, params: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(self.set_search, query, params, results)
+
+    async def aget_insights(self, content: str, query: str, model_id: str) -> Optional[List[Dict[str, Any]]]:
+        return await asyncio.to_thread(self.get_insights, content, query, model_id)
+
+    async def aset_insights(self, content: str, query: str, model_id: str, insights: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(self.set_insights, content, query, model_id, insights)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                for table in self.ttls:
+                    conn.execute(f"DELETE FROM {table}")
+                conn.commit()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for table in self.ttls:
+            total = self.hits[table] + self.misses[table]
+            stats[table] = {
+                "hits": self.hits[table],
+                "misses": self.misses[table],
+                "hit_rate": self.hits[table] / total if total else 0.0,
+            }
+        return stats
+
+
+research_memo = ResearchMemo()
+
+__all__ = [
+    "ResearchMemo",
+    "research_memo",
+]
@@ -3,7 +3,7 @@ from .bing_search import BingSearchEngine
 from .google_search import GoogleSearchEngine
 from .ddg_search import DuckDuckGoSearchEngine
 from .firecrawl_search import FirecrawlSearchEngine
-from .base import SearchItem, WebSearchEngine
+from .base import SearchItem, WebSearchEngine, run_in_search_thread
 
 
 
@@ -14,5 +14,6 @@ __all__ = [
     "DuckDuckGoSearchEngine",
     "SearchItem",
     "WebSearchEngine",
+    "run_in_search_thread",
     "FirecrawlSearchEngine"
 ]
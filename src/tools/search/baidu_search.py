@@ -1,6 +1,6 @@
 from baidusearch.baidusearch import search
 
-from src.tools.search.base import WebSearchEngine, SearchItem
+from src.tools.search.base import WebSearchEngine, SearchItem, run_in_search_thread
 
 class BaiduSearchEngine(WebSearchEngine):
     async def perform_search(self, query: str, num_results: int = 10, *args, **kwargs):
@@ -9,7 +9,8 @@ class BaiduSearchEngine(WebSearchEngine):
 
         Returns results formatted according to SearchItem model.
         """
-        raw_results = search(query, num_results=num_results)
+        # baidusearch only has a blocking API
+        raw_results = await run_in_search_thread(search, query, num_results=num_results)
 
         # Convert raw results to SearchItem format
         results = []
@@ -1,5 +1,30 @@
-from typing import List, Any, Optional
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Callable, Optional, TypeVar
 from pydantic import BaseModel, Field
+from dotenv import load_dotenv
+
+from src.proxy import build_async_http_client
+
+load_dotenv(verbose=True)
+
+# Searches of the libraries without an async API run in this many threads, shared by every engine
+SEARCH_MAX_THREADS = int(os.getenv('SEARCH_MAX_THREADS', 8))
+SEARCH_TIMEOUT = float(os.getenv('SEARCH_TIMEOUT', 30.0))
+
+# Long-lived client of the engines scraping the search pages, without the model API proxy
+SEARCH_HTTP_CLIENT = build_async_http_client(proxy=None, timeout=SEARCH_TIMEOUT, connect_timeout=SEARCH_TIMEOUT)
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=SEARCH_MAX_THREADS, thread_name_prefix="search")
+
+T = TypeVar("T")
+
+
+async def run_in_search_thread(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking search call in the shared search thread pool, without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_SEARCH_EXECUTOR, functools.partial(func, *args, **kwargs))
 
 class SearchItem(BaseModel):
     """Represents a single search result item"""
@@ -1,9 +1,9 @@
 from typing import List, Optional, Tuple
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
 
-from src.tools.search.base import WebSearchEngine, SearchItem
+from src.tools.search.base import WebSearchEngine, SearchItem, SEARCH_HTTP_CLIENT
 
 
 ABSTRACT_MAX_LENGTH = 300
@@ -35,17 +35,17 @@ BING_SEARCH_URL = "https://www.bing.com/search?q="
 
 
 class BingSearchEngine(WebSearchEngine):
-    session: Optional[requests.Session] = None
+    client: Optional[httpx.AsyncClient] = None
 
     def __init__(self, **data):
-        """Initialize the BingSearch tool with a requests session."""
+        """Initialize the BingSearch tool with the long-lived search HTTP client."""
         super().__init__(**data)
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        if self.client is None:
+            self.client = SEARCH_HTTP_CLIENT
 
-    def _search_sync(self, query: str, num_results: int = 10) -> List[SearchItem]:
+    async def _search(self, query: str, num_results: int = 10) -> List[SearchItem]:
         """
-        Synchronous Bing search implementation to retrieve search results.
+        Bing search implementation to retrieve search results.
 
         Args:
             query (str): The search query to submit to Bing.
@@ -62,7 +62,7 @@ class BingSearchEngine(WebSearchEngine):
         next_url = BING_SEARCH_URL + query
 
         while len(list_result) < num_results:
-            data, next_url = self._parse_html(
+            data, next_url = await self._parse_html(
                 next_url, rank_start=len(list_result), first=first
             )
             if data:
@@ -73,7 +73,7 @@ class BingSearchEngine(WebSearchEngine):
 
         return list_result[:num_results]
 
-    def _parse_html(
+    async def _parse_html(
         self, url: str, rank_start: int = 0, first: int = 1
     ) -> Tuple[List[SearchItem], str]:
         """
@@ -83,7 +83,7 @@ class BingSearchEngine(WebSearchEngine):
             tuple: (List of SearchItem objects, next page URL or None)
         """
         try:
-            res = self.session.get(url=url)
+            res = await self.client.get(url, headers=HEADERS, follow_redirects=True)
             res.encoding = "utf-8"
             root = BeautifulSoup(res.text, "lxml")
 
@@ -140,4 +140,4 @@ class BingSearchEngine(WebSearchEngine):
 
         Returns results formatted according to SearchItem model.
         """
-        return self._search_sync(query, num_results=num_results)
+        return await self._search(query, num_results=num_results)
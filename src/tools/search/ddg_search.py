@@ -1,8 +1,19 @@
+import threading
 from typing import List
 
 from duckduckgo_search import DDGS
 
-from src.tools.search.base import WebSearchEngine, SearchItem
+from src.tools.search.base import WebSearchEngine, SearchItem, run_in_search_thread
+
+# A DDGS client per search thread, reused across searches
+_local = threading.local()
+
+
+def _text_search(query: str, max_results: int) -> list:
+    if getattr(_local, "ddgs", None) is None:
+        _local.ddgs = DDGS()
+    return _local.ddgs.text(query, max_results=max_results)
+
 
 class DuckDuckGoSearchEngine(WebSearchEngine):
     async def perform_search(
@@ -13,7 +24,8 @@ class DuckDuckGoSearchEngine(WebSearchEngine):
 
         Returns results formatted according to SearchItem model.
         """
-        raw_results = DDGS().text(query, max_results=num_results)
+        # duckduckgo_search only has a blocking API
+        raw_results = await run_in_search_thread(_text_search, query, max_results=num_results)
 
         results = []
         for i, item in enumerate(raw_results):
@@ -4,20 +4,21 @@ import time
 from dotenv import load_dotenv
 load_dotenv(verbose=True)
 
-from typing import List
+from typing import List, Optional
 from firecrawl import FirecrawlApp
 import asyncio
 
-from src.tools.search.base import WebSearchEngine, SearchItem
+from src.tools.search.base import WebSearchEngine, SearchItem, run_in_search_thread
 
-def search(params):
+def search(params, app: Optional[FirecrawlApp] = None):
     """
     Perform a Google search using the provided parameters.
     Returns a list of SearchItem objects.
     """
-    app = FirecrawlApp(
-        api_key=os.getenv("FIRECRAWL_API_KEY"),
-    )
+    if app is None:
+        app = FirecrawlApp(
+            api_key=os.getenv("FIRECRAWL_API_KEY"),
+        )
 
     response = app.search(
         query=params["q"],
@@ -39,6 +40,14 @@ def search(params):
     return results
 
 class FirecrawlSearchEngine(WebSearchEngine):
+    app: Optional[FirecrawlApp] = None
+
+    def _get_app(self) -> FirecrawlApp:
+        # Built on first use, so that the engine can be created without an API key
+        if self.app is None:
+            self.app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
+        return self.app
+
     async def perform_search(
         self,
         query: str,
@@ -58,7 +67,8 @@ class FirecrawlSearchEngine(WebSearchEngine):
         if filter_year is not None:
             params["tbs"] = f"cdr:1,cd_min:01/01/{filter_year},cd_max:12/31/{filter_year}"
 
-        results = search(params)
+        # The Firecrawl client only has a blocking API
+        results = await run_in_search_thread(search, params, self._get_app())
 
         return results
 
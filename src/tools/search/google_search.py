@@ -1,18 +1,18 @@
-from typing import List
+from typing import List, Optional
 from dotenv import load_dotenv
 load_dotenv(verbose=True)
 
-import requests
+import httpx
 import os
+import asyncio
 from bs4 import BeautifulSoup
 from urllib.parse import unquote
-from time import sleep
 
-from src.tools.search.base import WebSearchEngine, SearchItem
-from src.proxy import PROXY_URL, proxy_env
+from src.tools.search.base import WebSearchEngine, SearchItem, SEARCH_HTTP_CLIENT
+from src.proxy import ASYNC_HTTP_CLIENT
 from googlesearch.user_agents import get_useragent
 
-def _req(term, results, tbs, lang, start, proxies, timeout, safe, ssl_verify, region):
+async def _req(client, term, results, tbs, lang, start, timeout, safe, region):
     
     params = {
         "q": term,
@@ -25,26 +25,22 @@ def _req(term, results, tbs, lang, start, proxies, timeout, safe, ssl_verify, re
     if tbs is not None:
         params["tbs"] = tbs
         
-    resp = requests.get(
-        url="https://www.google.com/search",
+    resp = await client.get(
+        "https://www.google.com/search",
         headers={
             "User-Agent": get_useragent(),
-            "Accept": "*/*"
+            "Accept": "*/*",
+            "Cookie": "CONSENT=PENDING+987; SOCS=CAESHAgBEhIaAB", # Bypasses the consent page
         },
-        params=params,
-        proxies=proxies,
+        params={key: value for key, value in params.items() if value is not None},
         timeout=timeout,
-        verify=ssl_verify,
-        cookies = {
-            'CONSENT': 'PENDING+987', # Bypasses the consent page
-            'SOCS': 'CAESHAgBEhIaAB',
-        }
+        follow_redirects=True,
     )
     resp.raise_for_status()
     return resp
 
 
-def google_search(term, 
+async def google_search(term, 
                   num_results=10, 
                   tbs=None,
                   lang="en", 
@@ -56,28 +52,44 @@ def google_search(term,
                   ssl_verify=None,
                   region=None, 
                   start_num=0, 
-                  unique=False):
+                  unique=False,
+                  client=None):
     """Search the Google search engine"""
 
-    # Proxy setup
-    proxies = {"https": proxy, "http": proxy} if proxy and (proxy.startswith("https") or proxy.startswith("http")) else None
-
+    # Proxy and SSL verification are set per client, the shared search client is used without them
+    proxy = proxy if proxy and proxy.startswith("http") else None
+    own_client = client is None and (proxy is not None or ssl_verify is not None)
+    if own_client:
+        client = httpx.AsyncClient(proxy=proxy, verify=ssl_verify if ssl_verify is not None else True)
+    elif client is None:
+        client = SEARCH_HTTP_CLIENT
+
+    try:
+        async for item in _google_search(client, term, num_results, tbs, lang, advanced, sleep_interval,
+                                         timeout, safe, region, start_num, unique):
+            yield item
+    finally:
+        if own_client:
+            await client.aclose()
+
+
+async def _google_search(client, term, num_results, tbs, lang, advanced, sleep_interval,
+                         timeout, safe, region, start_num, unique):
     start = start_num
     fetched_results = 0  # Keep track of the total fetched results
     fetched_links = set() # to keep track of links that are already seen previously
 
     while fetched_results < num_results:
         # Send request
-        resp = _req(term,
-                    num_results - start,
-                    tbs,
-                    lang, 
-                    start, 
-                    proxies, 
-                    timeout, 
-                    safe, 
-                    ssl_verify, 
-                    region)
+        resp = await _req(client,
+                          term,
+                          num_results - start,
+                          tbs,
+                          lang,
+                          start,
+                          timeout,
+                          safe,
+                          region)
         
         # put in file - comment for debugging purpose
         # with open('google.html', 'w') as f:
@@ -137,9 +149,9 @@ def google_search(term,
             break  # Break the loop if no new results were found in this iteration
 
         start += 10  # Prepare for the next set of results
-        sleep(sleep_interval)
+        await asyncio.sleep(sleep_interval)
 
-def search(params):
+async def search(params, client=None):
     """
     Mock function to simulate Google search results.
     In a real-world scenario, this would interface with the Google Search API.
@@ -150,45 +162,44 @@ def search(params):
     query = params.get("q", "")
     filter_year = params.get("filter_year", None)
     
-    # Use local google search api
+    # Use local google search api, through the proxy
     if base_url is not None:
-        with proxy_env():
-            response = requests.get(base_url, params=params)
-            
-            if response.status_code == 200:
-                items = response.json()
+        response = await ASYNC_HTTP_CLIENT.get(base_url, params=params)
+
+        if response.status_code == 200:
+            items = response.json()
+        else:
+            raise ValueError(response.json())
+
+        if "organic" not in items.keys():
+            if filter_year is not None:
+                raise Exception(
+                    f"No results found for query: '{query}' with filtering on year={filter_year}. Use a less restrictive query or do not filter on year."
+                )
             else:
-                raise ValueError(response.json())
+                raise Exception(f"No results found for query: '{query}'. Use a less restrictive query.")
 
-            if "organic" not in items.keys():
-                if filter_year is not None:
-                    raise Exception(
-                        f"No results found for query: '{query}' with filtering on year={filter_year}. Use a less restrictive query or do not filter on year."
-                    )
-                else:
-                    raise Exception(f"No results found for query: '{query}'. Use a less restrictive query.")
-
-            results = []
-            if "organic" in items:
-                for idx, page in enumerate(items["organic"]):
-                    title = page.get("title", f"Google Result {idx + 1}")
-                    url = page.get("link", "")
-                    position = page.get("position", idx + 1)
-                    description = page.get("snippet", None)
-                    date = page.get("date", None)
-                    source = page.get("source", None)
-
-                    results.append(
-                        SearchItem(
-                            title=title,
-                            url=url,
-                            date=date,
-                            position=position,
-                            source=source,
-                            description=description,
-                        )
+        results = []
+        if "organic" in items:
+            for idx, page in enumerate(items["organic"]):
+                title = page.get("title", f"Google Result {idx + 1}")
+                url = page.get("link", "")
+                position = page.get("position", idx + 1)
+                description = page.get("snippet", None)
+                date = page.get("date", None)
+                source = page.get("source", None)
+
+                results.append(
+                    SearchItem(
+                        title=title,
+                        url=url,
+                        date=date,
+                        position=position,
+                        source=source,
+                        description=description,
                     )
-            return results
+                )
+        return results
     
     else: # Use remote google search api
         response = google_search(
@@ -200,15 +211,24 @@ def search(params):
             advanced=True,
             sleep_interval=0,
             timeout=5,
+            client=client,
         )
         
         results = []
-        for item in response:
+        async for item in response:
             results.append(item)
         
         return results
 
 class GoogleSearchEngine(WebSearchEngine):
+    client: Optional[httpx.AsyncClient] = None
+
+    def __init__(self, **data):
+        """Initialize the GoogleSearch tool with the long-lived search HTTP client."""
+        super().__init__(**data)
+        if self.client is None:
+            self.client = SEARCH_HTTP_CLIENT
+
     async def perform_search(
         self,
         query: str,
@@ -228,6 +248,6 @@ class GoogleSearchEngine(WebSearchEngine):
         if filter_year is not None:
             params["tbs"] = f"cdr:1,cd_min:01/01/{filter_year},cd_max:12/31/{filter_year}"
 
-        results = search(params)
+        results = await search(params, client=self.client)
 
         return results
\ No newline at end of file
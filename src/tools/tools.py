@@ -15,6 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import ast
+import asyncio
 import inspect
 import json
 import logging
@@ -23,7 +24,9 @@ import sys
 import tempfile
 import textwrap
 import types
+from collections.abc import AsyncGenerator
 from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
@@ -735,10 +738,50 @@ class Tool:
         return LangChainToolWrapper(langchain_tool)
     
     
+# Receives the progress events reported by the running tool, set by the caller of the tool
+tool_progress_callback: ContextVar[Optional[Callable[[Any], None]]] = ContextVar("tool_progress_callback", default=None)
+_PROGRESS_DONE = object()
+
+
+def report_tool_progress(event: Any) -> None:
+    """Report a progress event of the running tool to its caller, if the caller listens to them."""
+    callback = tool_progress_callback.get()
+    if callback is not None:
+        callback(event)
+
+
+async def stream_progress(events: asyncio.Queue, future: asyncio.Future) -> AsyncGenerator[Any]:
+    """Yield the events put in the queue until the future is done. The future is cancelled if the consumer stops early."""
+    future.add_done_callback(lambda _: events.put_nowait(_PROGRESS_DONE))
+    try:
+        while (event := await events.get()) is not _PROGRESS_DONE:
+            yield event
+    finally:
+        if not future.done():
+            future.cancel()
+            await asyncio.gather(future, return_exceptions=True)
+
+
 class AsyncTool(Tool):
     async def forward(self, *args, **kwargs):
         return NotImplementedError("Write this method in your subclass of `Tool`.")
 
+    async def forward_stream(self, *args, **kwargs) -> AsyncGenerator[Any]:
+        """Run the tool, yielding the progress events it reports and then its output.
+
+        Closing the generator before the output cancels the tool.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def run():
+            tool_progress_callback.set(events.put_nowait)
+            return await self(*args, **kwargs)
+
+        task = asyncio.create_task(run())
+        async for event in stream_progress(events, task):
+            yield event
+        yield task.result()
+
     async def __call__(self, *args, sanitize_inputs_outputs: bool = False, **kwargs):
         if not self.is_initialized:
             self.setup()
@@ -1278,6 +1321,9 @@ __all__ = [
     "AUTHORIZED_TYPES",
     "Tool",
     "AsyncTool",
+    "report_tool_progress",
+    "stream_progress",
+    "tool_progress_callback",
     "tool",
     "load_tool",
     "launch_gradio_demo",
@@ -183,7 +183,7 @@ class VideoGeneratorTool(AsyncTool):
         # Use the generator model to create the image
         try:
             # Veo3 Predict
-            response = self.predict_model(
+            response = await self.predict_model.agenerate(
                 prompt=prompt,
                 image=image_path,  # Optional image reference
             )
@@ -194,7 +194,7 @@ class VideoGeneratorTool(AsyncTool):
             while video_data is None:
                 try:
                     # Veo3 Fetch
-                    response = model_manager.registed_models["veo3-fetch"](
+                    response = await model_manager.registed_models["veo3-fetch"].agenerate(
                         name=name,
                     )
                     video_data = base64.b64decode(response)
@@ -1,17 +1,24 @@
 from typing import Any, Dict, List, Optional
+from urllib.parse import urldefrag, urlsplit
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from tenacity import retry, stop_after_attempt, wait_exponential
-import time
+import random
 import asyncio
+import itertools
 
 from src.tools.web_fetcher import WebFetcherTool
+from src.tools.research_memo import research_memo
 from src.tools.search import (
+    BaiduSearchEngine,
+    BingSearchEngine,
+    DuckDuckGoSearchEngine,
     GoogleSearchEngine,
     FirecrawlSearchEngine,
     WebSearchEngine,
     SearchItem
 )
 from src.tools import AsyncTool, ToolResult
+from src.utils import FetchPriority, fetch_priority
 from src.logger import logger
 from src.registry import TOOL
 
@@ -40,6 +47,34 @@ class SearchResult(BaseModel):
         return f"{self.title} ({self.url})"
 
 
+def normalize_url(url: str) -> str:
+    """Normalize a URL to detect the same page returned by several engines."""
+    url = urldefrag(url.strip())[0]
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower().removeprefix("www.")
+    return f"{netloc}{parts.path.rstrip('/')}" + (f"?{parts.query}" if parts.query else "")
+
+
+def merge_search_results(result_lists: List[List[SearchResult]], num_results: int) -> List[SearchResult]:
+    """Interleave the result lists of several engines rank by rank, dropping the URLs already merged."""
+    merged = []
+    seen_urls = set()
+    for results in itertools.zip_longest(*result_lists):
+        for result in results:
+            if result is None:
+                continue
+            url = normalize_url(result.url)
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            merged.append(result)
+
+    merged = merged[:num_results]
+    for position, result in enumerate(merged, 1):
+        result.position = position
+    return merged
+
+
 class SearchMetadata(BaseModel):
     """Metadata about the search operation."""
 
@@ -124,8 +159,13 @@ class WebSearcherTool(AsyncTool):
                  engine: str = "Firecrawl",
                  fallback_engines=["DuckDuckGo", "Baidu", "Bing"],
                  max_length: int = 4096,
-                 retry_delay: int = 10,
+                 retry_delay: float = 10,
+                 max_retry_delay: float = 60,
+                 retry_jitter: float = 0.5,
                  max_retries: int = 3,
+                 race: bool = False,
+                 merge_results: bool = False,
+                 merge_window: float = 1.0,
                  lang: str = "en",
                  country: str = "us",
                  num_results: int = 5,
@@ -141,7 +181,12 @@ class WebSearcherTool(AsyncTool):
 
         self.max_length = max_length
         self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.retry_jitter = retry_jitter
         self.max_retries = max_retries
+        self.race = race
+        self.merge_results = merge_results
+        self.merge_window = merge_window
         self.lang = lang
         self.country = country
         self.num_results = num_results
@@ -149,8 +194,13 @@ class WebSearcherTool(AsyncTool):
 
         self._search_engine: dict[str, WebSearchEngine] = {
             "firecrawl": FirecrawlSearchEngine(),
+            "google": GoogleSearchEngine(),
+            "bing": BingSearchEngine(),
+            "duckduckgo": DuckDuckGoSearchEngine(),
+            "baidu": BaiduSearchEngine(),
         }
         self.content_fetcher: WebFetcherTool = WebFetcherTool()
+        self.memo = research_memo
 
     async def forward(
         self,
@@ -175,9 +225,21 @@ class WebSearcherTool(AsyncTool):
         if filter_year is not None:
             search_params["filter_year"] = filter_year
 
+        # Reuse the results of a recent identical search
+        memo_params = {**search_params, "num_results": self.num_results, "engines": self._get_engine_order()}
+        memo_results = await self.memo.aget_search(query, memo_params)
+        if memo_results is not None:
+            logger.info(f"🔎 Reusing memoized search results for: {query}")
+
         # Try searching with retries when all engines fail
         for retry_count in range(self.max_retries + 1):
-            results = await self._try_all_engines(query, self.num_results, search_params)
+            if memo_results is not None:
+                results = [SearchResult(**result) for result in memo_results]
+            else:
+                results = await self._try_all_engines(query, self.num_results, search_params)
+                if results:
+                    await self.memo.aset_search(query, memo_params,
+                                                [result.model_dump(exclude={"raw_content"}) for result in results])
             if results:
                 # Fetch content if requested
                 if self.fetch_content:
@@ -195,10 +257,11 @@ class WebSearcherTool(AsyncTool):
                 )
 
             if retry_count < self.max_retries:
-                # All engines failed, wait and retry
-                res = f"All search engines failed. Waiting {self.retry_delay} seconds before retry {retry_count + 1}/{self.max_retries}..."
+                # All engines failed, wait and retry without blocking the other searches of the event loop
+                delay = self._get_retry_delay(retry_count)
+                res = f"All search engines failed. Waiting {delay:.1f} seconds before retry {retry_count + 1}/{self.max_retries}..."
                 logger.warning(res)
-                time.sleep(self.retry_delay)
+                await asyncio.sleep(delay)
             else:
                 res = f"All search engines failed after {self.max_retries} retries. Giving up."
                 logger.error(res)
@@ -209,45 +272,114 @@ class WebSearcherTool(AsyncTool):
                     results=[],
                 )
 
+    def _get_retry_delay(self, retry_count: int) -> float:
+        """Exponential backoff, jittered so that concurrent searches do not retry in lockstep."""
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** retry_count)
+        return delay * (1 - self.retry_jitter * random.random())
+
     async def _try_all_engines(
         self, query: str, num_results: int, search_params: Dict[str, Any]
     ) -> List[SearchResult]:
-        """Try all search engines in the configured order."""
+        """Try all search engines in the configured order, or race them."""
+        if self.race:
+            return await self._race_engines(query, num_results, search_params)
+
         engine_order = self._get_engine_order()
         failed_engines = []
 
         for engine_name in engine_order:
-            engine = self._search_engine[engine_name]
             logger.info(f"🔎 Attempting search with {engine_name.capitalize()}...")
-            search_items = await self._perform_search_with_engine(
-                engine, query, num_results, search_params
-            )
+            results = await self._search_with_engine(engine_name, query, num_results, search_params)
 
-            if not search_items:
+            if not results:
+                failed_engines.append(engine_name)
                 continue
 
             if failed_engines:
                 logger.info(
                     f"Search successful with {engine_name.capitalize()} after trying: {', '.join(failed_engines)}"
                 )
-
-            # Transform search items into structured results
-            return [
-                SearchResult(
-                    position=i + 1,
-                    url=item.url,
-                    title=item.title
-                    or f"Result {i+1}",  # Ensure we always have a title
-                    description=item.description or "",
-                    source=engine_name,
-                )
-                for i, item in enumerate(search_items)
-            ]
+            return results
 
         if failed_engines:
             logger.error(f"All search engines failed: {', '.join(failed_engines)}")
         return []
 
+    async def _race_engines(
+        self, query: str, num_results: int, search_params: Dict[str, Any]
+    ) -> List[SearchResult]:
+        """Query all search engines concurrently and keep the first non-empty results.
+
+        With `merge_results`, the results of the engines completing within `merge_window` seconds of the
+        first one are merged into it. The engines still running are cancelled.
+        """
+        engine_order = self._get_engine_order()
+        logger.info(f"🔎 Racing search engines: {', '.join(name.capitalize() for name in engine_order)}...")
+        tasks = {
+            asyncio.create_task(self._search_with_engine(engine_name, query, num_results, search_params)): engine_name
+            for engine_name in engine_order
+        }
+
+        loop = asyncio.get_running_loop()
+        merge_deadline = None
+        engine_results: Dict[str, List[SearchResult]] = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = None if merge_deadline is None else max(0.0, merge_deadline - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+
+                # Engines completing together are ranked in the configured order
+                for task in sorted(done, key=lambda task: engine_order.index(tasks[task])):
+                    if task.result():
+                        engine_results[tasks[task]] = task.result()
+
+                if engine_results:
+                    if not self.merge_results:
+                        break
+                    if merge_deadline is None:
+                        merge_deadline = loop.time() + self.merge_window
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if not engine_results:
+            logger.error(f"All search engines failed: {', '.join(engine_order)}")
+            return []
+
+        logger.info(f"Search successful with {', '.join(name.capitalize() for name in engine_results)}")
+        if len(engine_results) == 1:
+            return next(iter(engine_results.values()))
+        return merge_search_results(list(engine_results.values()), num_results)
+
+    async def _search_with_engine(
+        self, engine_name: str, query: str, num_results: int, search_params: Dict[str, Any]
+    ) -> List[SearchResult]:
+        """Search with a single engine, returning no results when it fails."""
+        try:
+            search_items = await self._perform_search_with_engine(
+                self._search_engine[engine_name], query, num_results, search_params
+            )
+        except Exception as e:
+            logger.warning(f"Search with {engine_name.capitalize()} failed: {e}")
+            return []
+
+        # Transform search items into structured results
+        return [
+            SearchResult(
+                position=i + 1,
+                url=item.url,
+                title=item.title
+                or f"Result {i+1}",  # Ensure we always have a title
+                description=item.description or "",
+                source=engine_name,
+            )
+            for i, item in enumerate(search_items)
+        ]
+
     async def _fetch_content_for_results(
             self, results: List[SearchResult]
     ) -> List[SearchResult]:
@@ -255,11 +387,15 @@ class WebSearcherTool(AsyncTool):
         if not results:
             return []
 
-        # Create tasks for each result
-        # fetched_results = [await self._fetch_single_result_content(result) for result in results]
-        fetched_results = await asyncio.gather(
-            *[self._fetch_single_result_content(result) for result in results]
-        )
+        # Contents are prefetched for all the results, the fetch scheduler bounds the fetches per domain and
+        # lets the fetches an agent step waits for go first
+        token = fetch_priority.set(FetchPriority.BACKGROUND)
+        try:
+            fetched_results = await asyncio.gather(
+                *[self._fetch_single_result_content(result) for result in results]
+            )
+        finally:
+            fetch_priority.reset(token)
 
         # Explicit validation of return type
         return [
@@ -274,6 +410,7 @@ class WebSearcherTool(AsyncTool):
     async def _fetch_single_result_content(self, result: SearchResult) -> SearchResult:
         """Fetch content for a single search result."""
         if result.url:
+            # Pages are cached by the fetcher, see `src.utils.fetch_cache`
             res = await self.content_fetcher.forward(result.url)
             content = res.text_content
             if content:
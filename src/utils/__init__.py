@@ -1,6 +1,15 @@
 from .path_utils import assemble_project_path
-from .token_utils import get_token_count
-from .image_utils import download_image
+from .token_utils import (get_token_count,
+                          get_message_token_count,
+                          get_context_window,
+                          get_token_cost)
+from .image_utils import (download_image,
+                          ImagePolicy,
+                          get_image_policy,
+                          set_image_policy,
+                          encode_image_cached,
+                          make_image_url_cached,
+                          image_encoding_cache)
 from .utils import (escape_code_brackets,
                              _is_package_available,
                              BASE_BUILTIN_MODULES,
@@ -26,12 +35,26 @@ from .agent_types import (AgentType,
                            AgentImage,
                            handle_agent_output_types,
                            handle_agent_input_types)
+from .fetch_cache import CachedPage, FetchCache, fetch_cache
+from .crawler_pool import CrawlerPool, crawler_pool
+from .fetch_scheduler import FetchPriority, FetchScheduler, fetch_priority, fetch_scheduler
 from .url_utils import fetch_url
+from .fingerprint_utils import get_shingles, MinHasher, NearDuplicateIndex
+from .ranking_utils import split_passages, bm25_scores, rank_passages
 
 __all__ = [
     "assemble_project_path",
     "get_token_count",
+    "get_message_token_count",
+    "get_context_window",
+    "get_token_cost",
     "download_image",
+    "ImagePolicy",
+    "get_image_policy",
+    "set_image_policy",
+    "encode_image_cached",
+    "make_image_url_cached",
+    "image_encoding_cache",
     "escape_code_brackets",
     "_is_package_available",
     "BASE_BUILTIN_MODULES",
@@ -56,5 +79,20 @@ __all__ = [
     "AgentAudio",
     "handle_agent_output_types",
     "handle_agent_input_types",
+    "CachedPage",
+    "FetchCache",
+    "fetch_cache",
+    "CrawlerPool",
+    "crawler_pool",
+    "FetchPriority",
+    "FetchScheduler",
+    "fetch_priority",
+    "fetch_scheduler",
     "fetch_url",
+    "get_shingles",
+    "MinHasher",
+    "NearDuplicateIndex",
+    "split_passages",
+    "bm25_scores",
+    "rank_passages",
 ]
\ No newline at end of file
@@ -0,0 +1,173 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv(verbose=True)
+
+logger = logging.getLogger(__name__)
+
+# Headless browsers kept alive by the pool, and pages crawled at the same time in each of them
+CRAWLER_POOL_SIZE = int(os.getenv('CRAWLER_POOL_SIZE', 1))
+CRAWLER_MAX_CONCURRENT_PAGES = int(os.getenv('CRAWLER_MAX_CONCURRENT_PAGES', 8))
+# Browsers leak memory over time, they are replaced after crawling this many pages
+CRAWLER_RECYCLE_AFTER = int(os.getenv('CRAWLER_RECYCLE_AFTER', 200))
+CRAWLER_HEALTH_CHECK_INTERVAL = float(os.getenv('CRAWLER_HEALTH_CHECK_INTERVAL', 60.0))
+CRAWLER_HEALTH_CHECK_TIMEOUT = float(os.getenv('CRAWLER_HEALTH_CHECK_TIMEOUT', 10.0))
+
+# Rendered without network access, to check that a browser still works
+_HEALTH_CHECK_URL = "raw:<html><body>ok</body></html>"
+
+
+def _build_crawler() -> Any:
+    from crawl4ai import AsyncWebCrawler
+    return AsyncWebCrawler()
+
+
+class _PooledCrawler():
+
+    def __init__(self, crawler: Any):
+        self.crawler = crawler
+        self.active = 0
+        self.pages = 0
+        self.last_used = time.monotonic()
+        self.retired = False
+
+
+class CrawlerPool():
+    """Pool of long-lived crawl4ai crawlers, each driving a headless browser.
+
+    Browsers are started on first use and crawl up to `max_concurrent_pages` pages at the same time,
+    requests going to the least busy one. A browser is retired once it crawled `recycle_after` pages,
+    or when it fails a health check, which runs after a failed crawl and before reusing a browser idle
+    for more than `health_check_interval` seconds. Retired browsers are closed once their last pages
+    are crawled, and replaced on the next request.
+    """
+
+    def __init__(self,
+                 size: int = CRAWLER_POOL_SIZE,
+                 max_concurrent_pages: int = CRAWLER_MAX_CONCURRENT_PAGES,
+                 recycle_after: int = CRAWLER_RECYCLE_AFTER,
+                 health_check_interval: float = CRAWLER_HEALTH_CHECK_INTERVAL,
+                 health_check_timeout: float = CRAWLER_HEALTH_CHECK_TIMEOUT,
+                 crawler_factory: Callable[[], Any] = _build_crawler):
+        self.size = size
+        self.max_concurrent_pages = max_concurrent_pages
+        self.recycle_after = recycle_after
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.crawler_factory = crawler_factory
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._locks: List[asyncio.Lock] = []
+        self._crawlers: List[Optional[_PooledCrawler]] = []
+        # Requests waiting for each browser to be started or health checked
+        self._reserved: List[int] = []
+
+        self.started = 0
+        self.retired = 0
+
+    def _bind_loop(self) -> None:
+        # Browsers are driven from the event loop that started them, a new loop gets new browsers
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.size * self.max_concurrent_pages)
+            self._locks = [asyncio.Lock() for _ in range(self.size)]
+            self._crawlers = [None] * self.size
+            self._reserved = [0] * self.size
+
+    def _load(self, index: int) -> int:
+        pooled = self._crawlers[index]
+        return self._reserved[index] + (pooled.active if pooled is not None else 0)
+
+    async def _get_crawler(self, index: int) -> _PooledCrawler:
+        async with self._locks[index]:
+            pooled = self._crawlers[index]
+            if (pooled is not None
+                    and pooled.active == 0
+                    and time.monotonic() - pooled.last_used > self.health_check_interval
+                    and not await self._is_healthy(pooled)):
+                await self._retire(index, pooled)
+                pooled = None
+
+            if pooled is None:
+                crawler = self.crawler_factory()
+                await crawler.start()
+                pooled = self._crawlers[index] = _PooledCrawler(crawler)
+                self.started += 1
+            return pooled
+
+    async def _is_healthy(self, pooled: _PooledCrawler) -> bool:
+        try:
+            result = await asyncio.wait_for(pooled.crawler.arun(url=_HEALTH_CHECK_URL),
+                                            timeout=self.health_check_timeout)
+            return bool(getattr(result, "success", True))
+        except Exception as e:
+            logger.warning(f"Crawler failed its health check: {e}")
+            return False
+
+    async def _retire(self, index: int, pooled: _PooledCrawler) -> None:
+        if not pooled.retired:
+            pooled.retired = True
+            self.retired += 1
+            if self._crawlers[index] is pooled:
+                self._crawlers[index] = None
+        if pooled.active == 0:
+            await self._close(pooled)
+
+    @staticmethod
+    async def _close(pooled: _PooledCrawler) -> None:
+        try:
+            await pooled.crawler.close()
+        except Exception as e:
+            logger.warning(f"Failed to close a crawler: {e}")
+
+    async def arun(self, url: str, **kwargs) -> Any:
+        """Crawl a URL with the least busy browser of the pool, see `AsyncWebCrawler.arun`."""
+        self._bind_loop()
+        async with self._semaphore:
+            # At most size * max_concurrent_pages pages run, so the least busy browser has a free page.
+            # The page is reserved while the browser starts, so that concurrent requests spread over the pool
+            index = min(range(self.size), key=self._load)
+            self._reserved[index] += 1
+            try:
+                pooled = await self._get_crawler(index)
+                pooled.active += 1
+            finally:
+                self._reserved[index] -= 1
+
+            failed = False
+            try:
+                result = await pooled.crawler.arun(url=url, **kwargs)
+                failed = not getattr(result, "success", True)
+                return result
+            except Exception:
+                failed = True
+                raise
+            finally:
+                pooled.active -= 1
+                pooled.pages += 1
+                pooled.last_used = time.monotonic()
+                if pooled.pages >= self.recycle_after or pooled.retired or (failed and not await self._is_healthy(pooled)):
+                    await self._retire(index, pooled)
+
+    async def close(self) -> None:
+        """Close every browser of the pool."""
+        crawlers = [pooled for pooled in self._crawlers if pooled is not None]
+        self._crawlers = [None] * len(self._crawlers)
+        for pooled in crawlers:
+            pooled.retired = True
+            await self._close(pooled)
+
+
+crawler_pool = CrawlerPool()
+
+__all__ = [
+    "CrawlerPool",
+    "crawler_pool",
+]
@@ -0,0 +1,323 @@
+import os
+import mmap
+import logging
+import time
+import zlib
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urldefrag, urlsplit, urlunsplit
+
+from dotenv import load_dotenv
+
+from src.proxy import build_async_http_client
+
+load_dotenv(verbose=True)
+
+logger = logging.getLogger(__name__)
+
+FETCH_CACHE_ENABLED = os.getenv('FETCH_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+FETCH_CACHE_DIR = os.getenv('FETCH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'deepresearchagent', 'fetch_cache'))
+# Pages younger than the TTL are served as is, older ones are revalidated with their ETag/Last-Modified
+FETCH_CACHE_TTL = float(os.getenv('FETCH_CACHE_TTL', 24 * 3600))
+FETCH_CACHE_MAX_SIZE = int(os.getenv('FETCH_CACHE_MAX_SIZE', 1024 * 1024 * 1024))
+FETCH_CACHE_REVALIDATE_TIMEOUT = float(os.getenv('FETCH_CACHE_REVALIDATE_TIMEOUT', 10.0))
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS entries ("
+    "url_key TEXT PRIMARY KEY, url TEXT NOT NULL, content_hash TEXT NOT NULL, title TEXT, "
+    "etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries(accessed_at)",
+    "CREATE INDEX IF NOT EXISTS entries_content_hash ON entries(content_hash)",
+    "CREATE TABLE IF NOT EXISTS blobs (content_hash TEXT PRIMARY KEY, size INTEGER NOT NULL)",
+]
+
+
+def get_url_key(url: str) -> str:
+    """Normalize a URL into a cache key: no fragment, lower case scheme and host, no default port, sorted query."""
+    parts = urlsplit(urldefrag(url.strip())[0])
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port is not None and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+@dataclass
+class CachedPage:
+    url: str
+    markdown: str
+    title: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    is_fresh: bool
+
+
+class FetchCache():
+    """On-disk cache of the fetched web pages, converted to markdown, shared across runs and processes.
+
+    Pages are keyed on their normalized URL. Their markdown is stored compressed in content-addressed
+    blobs, shared by the URLs serving the same content and memory-mapped on read, while a SQLite index
+    keeps the title, the ETag/Last-Modified validators and the fetch and access times of each URL.
+    Stale pages can be revalidated with a conditional request instead of being fetched and converted
+    again. The least recently used pages are evicted once the blobs exceed `max_size` bytes.
+    The `a`-prefixed methods run the disk I/O in a thread, for use from the event loop.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = FETCH_CACHE_DIR,
+                 ttl: Optional[float] = FETCH_CACHE_TTL,
+                 max_size: int = FETCH_CACHE_MAX_SIZE,
+                 enabled: bool = FETCH_CACHE_ENABLED):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.enabled = enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._http_client = None
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.enabled and self.path:
+            try:
+                os.makedirs(os.path.join(self.path, "blobs"), exist_ok=True)
+                conn = sqlite3.connect(os.path.join(self.path, "index.sqlite"), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Failed to open the fetch cache at {self.path}, disabling it: {e}")
+                self.enabled = False
+        return self._conn
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.path, "blobs", content_hash[:2], content_hash)
+
+    def _read_blob(self, content_hash: str) -> Optional[str]:
+        try:
+            with open(self._blob_path(content_hash), "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as blob:
+                return zlib.decompress(blob).decode("utf-8")
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Failed to read the fetch cache blob {content_hash}: {e}")
+            return None
+
+    def _write_blob(self, conn: sqlite3.Connection, content_hash: str, markdown: str) -> None:
+        path = self._blob_path(content_hash)
+        if conn.execute("SELECT 1 FROM blobs WHERE content_hash = ?", (content_hash,)).fetchone() and os.path.exists(path):
+            return
+        data = zlib.compress(markdown.encode("utf-8"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        conn.execute("INSERT OR REPLACE INTO blobs (content_hash, size) VALUES (?, ?)", (content_hash, len(data)))
+
+    def _delete_entry(self, conn: sqlite3.Connection, url_key: str, content_hash: str) -> None:
+        conn.execute("DELETE FROM entries WHERE url_key = ?", (url_key,))
+        if conn.execute("SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone():
+            return
+        conn.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+        try:
+            os.remove(self._blob_path(content_hash))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection, keep: str) -> None:
+        """Evict the least recently used pages until the blobs fit in `max_size`, keeping the page just stored."""
+        size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        while size > self.max_size:
+            row = conn.execute("SELECT url_key, content_hash FROM entries WHERE url_key != ? "
+                               "ORDER BY accessed_at LIMIT 1", (keep,)).fetchone()
+            if row is None:
+                break
+            self._delete_entry(conn, *row)
+            size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Get the cached page of a URL, fresh or stale, or None when it is not cached."""
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return None
+            url_key = get_url_key(url)
+            row = conn.execute("SELECT content_hash, title, etag, last_modified, fetched_at FROM entries "
+                               "WHERE url_key = ?", (url_key,)).fetchone()
+            markdown = self._read_blob(row[0]) if row is not None else None
+            if markdown is None:
+                if row is not None:
+                    self._delete_entry(conn, url_key, row[0])
+                    conn.commit()
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE url_key = ?", (time.time(), url_key))
+            conn.commit()
+            self.hits += 1
+            content_hash, title, etag, last_modified, fetched_at = row
+            return CachedPage(url=url,
+                              markdown=markdown,
+                              title=title,
+                              etag=etag,
+                              last_modified=last_modified,
+                              fetched_at=fetched_at,
+                              is_fresh=self.ttl is None or time.time() - fetched_at < self.ttl)
+
+    def set(self,
+            url: str,
+            markdown: str,
+            title: Optional[str] = None,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return
+            url_key = get_url_key(url)
+            content_hash = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+            try:
+                self._write_blob(conn, content_hash, markdown)
+            except OSError as e:
+                logger.warning(f"Failed to write the fetch cache blob of {url}: {e}")
+                return
+
+            previous = conn.execute("SELECT content_hash FROM entries WHERE url_key = ?", (url_key,)).fetchone()
+            now = time.time()
+            conn.execute("INSERT OR REPLACE INTO entries (url_key, url, content_hash, title, etag, last_modified, "
+                         "fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (url_key, url, content_hash, title, etag, last_modified, now, now))
+            if previous is not None and previous[0] != content_hash and not conn.execute(
+                    "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (previous[0],)).fetchone():
+                conn.execute("DELETE FROM blobs WHERE content_hash = ?", (previous[0],))
+                try:
+                    os.remove(self._blob_path(previous[0]))
+                except FileNotFoundError:
+                    pass
+            self._evict(conn, keep=url_key)
+            conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Mark the cached page of a URL as fresh again, after a successful revalidation."""
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return
+            now = time.time()
+            conn.execute("UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE url_key = ?",
+                         (now, now, get_url_key(url)))
+            conn.commit()
+
+    async def aget(self, url: str) -> Optional[CachedPage]:
+        return await asyncio.to_thread(self.get, url)
+
+    async def aset(self,
+                   url: str,
+                   markdown: str,
+                   title: Optional[str] = None,
+                   etag: Optional[str] = None,
+                   last_modified: Optional[str] = None) -> None:
+        await asyncio.to_thread(self.set, url, markdown, title=title, etag=etag, last_modified=last_modified)
+
+    async def atouch(self, url: str) -> None:
+        await asyncio.to_thread(self.touch, url)
+
+    def _get_http_client(self):
+        if self._http_client is None:
+            self._http_client = build_async_http_client(proxy=None,
+                                                        timeout=FETCH_CACHE_REVALIDATE_TIMEOUT,
+                                                        connect_timeout=FETCH_CACHE_REVALIDATE_TIMEOUT)
+        return self._http_client
+
+    async def get_validators(self, url: str) -> Dict[str, Optional[str]]:
+        """Get the ETag and Last-Modified validators of a URL with a HEAD request, empty when unavailable."""
+        if not self.enabled:
+            return {}
+        try:
+            response = await self._get_http_client().head(url, follow_redirects=True)
+        except Exception as e:
+            logger.debug(f"Failed to get the validators of {url}: {e}")
+            return {}
+        if response.status_code != 200:
+            return {}
+        return {"etag": response.headers.get("etag"), "last_modified": response.headers.get("last-modified")}
+
+    async def revalidate(self, page: CachedPage) -> bool:
+        """Check with a conditional request whether a stale page is unchanged, and mark it fresh if so."""
+        headers = {}
+        if page.etag:
+            headers["If-None-Match"] = page.etag
+        if page.last_modified:
+            headers["If-Modified-Since"] = page.last_modified
+        if not headers:
+            return False
+
+        try:
+            response = await self._get_http_client().head(page.url, headers=headers, follow_redirects=True)
+        except Exception as e:
+            logger.debug(f"Failed to revalidate {page.url}: {e}")
+            return False
+
+        # Some servers ignore the conditional headers of HEAD requests, but still send the validators
+        unchanged = response.status_code == 304 or (
+            response.status_code == 200
+            and bool(page.etag)
+            and response.headers.get("etag") == page.etag
+        )
+        if unchanged:
+            self.revalidations += 1
+            await self.atouch(page.url)
+        return unchanged
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return
+            for (content_hash,) in conn.execute("SELECT content_hash FROM blobs").fetchall():
+                try:
+                    os.remove(self._blob_path(content_hash))
+                except FileNotFoundError:
+                    pass
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM blobs")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._get_conn()
+            entries, size = (0, 0) if conn is None else conn.execute(
+                "SELECT (SELECT COUNT(*) FROM entries), (SELECT COALESCE(SUM(size), 0) FROM blobs)").fetchone()
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "revalidations": self.revalidations,
+        }
+
+
+fetch_cache = FetchCache()
+
+__all__ = [
+    "CachedPage",
+    "FetchCache",
+    "fetch_cache",
+    "get_url_key",
+]
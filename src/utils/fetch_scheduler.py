@@ -0,0 +1,270 @@
+import os
+import time
+import heapq
+import asyncio
+import itertools
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from dotenv import load_dotenv
+
+from src.utils.fetch_cache import get_url_key
+
+load_dotenv(verbose=True)
+
+# Page fetches running at the same time, in total and per domain
+FETCH_MAX_IN_FLIGHT = int(os.getenv('FETCH_MAX_IN_FLIGHT', 16))
+FETCH_MAX_PER_DOMAIN = int(os.getenv('FETCH_MAX_PER_DOMAIN', 2))
+# Minimum delay between two fetches starting on the same domain
+FETCH_DOMAIN_INTERVAL = float(os.getenv('FETCH_DOMAIN_INTERVAL', 0.5))
+FETCH_LATENCY_WINDOW = int(os.getenv('FETCH_LATENCY_WINDOW', 100))
+
+T = TypeVar("T")
+
+
+class FetchPriority(IntEnum):
+    """Priority class of a fetch, lower values are scheduled first."""
+    INTERACTIVE = 0  # Fetches an agent step is waiting for
+    BACKGROUND = 1  # Prefetches, e.g. the contents of all the results of a search
+
+
+# Priority of the fetches of the current task, set by the callers fetching in the background
+fetch_priority: ContextVar[FetchPriority] = ContextVar("fetch_priority", default=FetchPriority.INTERACTIVE)
+
+
+def get_domain(url: str) -> str:
+    return (urlsplit(url.strip()).hostname or "").lower()
+
+
+@dataclass(order=True)
+class _FetchRequest:
+    priority: int
+    order: int
+    domain: str = field(compare=False)
+    started: asyncio.Future = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class _Flight():
+    """A scheduled fetch and the number of callers waiting for it."""
+
+    def __init__(self, task: asyncio.Task, request: _FetchRequest):
+        self.task = task
+        self.request = request
+        self.waiters = 0
+
+
+class _DomainState():
+
+    def __init__(self, latency_window: int):
+        self.active = 0
+        self.next_start = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "active": self.active,
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_latency": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "max_latency": latencies[-1] if latencies else 0.0,
+        }
+
+
+class FetchScheduler():
+    """Central scheduler of the page fetches, polite to the fetched domains.
+
+    At most `max_in_flight` fetches run at the same time, at most `max_per_domain` of them on the same
+    domain, and fetches on a domain start at least `domain_interval` seconds apart. Waiting fetches
+    start by priority class, then in arrival order, skipping those whose domain is busy. Fetches of a
+    URL already scheduled are coalesced with it, and raise its priority class if needed.
+    """
+
+    def __init__(self,
+                 max_in_flight: int = FETCH_MAX_IN_FLIGHT,
+                 max_per_domain: int = FETCH_MAX_PER_DOMAIN,
+                 domain_interval: float = FETCH_DOMAIN_INTERVAL,
+                 latency_window: int = FETCH_LATENCY_WINDOW):
+        self.max_in_flight = max_in_flight
+        self.max_per_domain = max_per_domain
+        self.domain_interval = domain_interval
+        self.latency_window = latency_window
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: List[_FetchRequest] = []
+        self._flights: Dict[str, _Flight] = {}
+        self._domains: Dict[str, _DomainState] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._order = itertools.count()
+
+        self.in_flight = 0
+        self.coalesced = 0
+
+    def _bind_loop(self) -> None:
+        # Waiting fetches are futures of the event loop that scheduled them, a new loop starts afresh
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._queue = []
+            self._flights = {}
+            self._timer = None
+            self.in_flight = 0
+            for domain in self._domains.values():
+                domain.active = 0
+
+    def _get_domain_state(self, domain: str) -> _DomainState:
+        if domain not in self._domains:
+            self._domains[domain] = _DomainState(self.latency_window)
+        return self._domains[domain]
+
+    def _dispatch(self) -> None:
+        """Start the waiting fetches allowed to run, best priority first."""
+        now = time.monotonic()
+        next_start = None
+        skipped = []
+        while self._queue and self.in_flight < self.max_in_flight:
+            request = heapq.heappop(self._queue)
+            # A cancelled caller cancels `started` at once, before its `_schedule` marks the request cancelled
+            if request.cancelled or request.started.done():
+                continue
+            domain = self._get_domain_state(request.domain)
+            if domain.active >= self.max_per_domain:
+                skipped.append(request)
+                continue
+            if domain.next_start > now:
+                skipped.append(request)
+                next_start = domain.next_start if next_start is None else min(next_start, domain.next_start)
+                continue
+
+            domain.active += 1
+            domain.next_start = now + self.domain_interval
+            self.in_flight += 1
+            request.started.set_result(None)
+
+        for request in skipped:
+            heapq.heappush(self._queue, request)
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if next_start is not None:
+            self._timer = self._loop.call_later(next_start - now, self._dispatch)
+
+    def _release(self, domain: str, latency: Optional[float] = None, failed: bool = False) -> None:
+        state = self._get_domain_state(domain)
+        state.active -= 1
+        self.in_flight -= 1
+        if latency is not None:
+            state.requests += 1
+            state.latencies.append(latency)
+            if failed:
+                state.errors += 1
+        self._dispatch()
+
+    def try_acquire(self, url: str) -> bool:
+        """Take a slot for a side request to the domain of `url` if one is free right now, without waiting.
+
+        A slot is only free when no waiting fetch could use it. It must be given back with `release`.
+        """
+        self._bind_loop()
+        now = time.monotonic()
+        domain = self._get_domain_state(get_domain(url))
+        if (self.in_flight >= self.max_in_flight
+                or domain.active >= self.max_per_domain
+                or domain.next_start > now):
+            return False
+        domain.active += 1
+        domain.next_start = now + self.domain_interval
+        self.in_flight += 1
+        return True
+
+    def release(self, url: str) -> None:
+        """Give back a slot taken with `try_acquire`."""
+        self._release(get_domain(url))
+
+    async def _schedule(self, request: _FetchRequest, fetch: Callable[[], Awaitable[T]]) -> T:
+        heapq.heappush(self._queue, request)
+        self._dispatch()
+        try:
+            await request.started
+        except asyncio.CancelledError:
+            if request.started.done() and not request.started.cancelled():
+                self._release(request.domain)
+            else:
+                request.cancelled = True
+            raise
+
+        start = time.monotonic()
+        failed = True
+        try:
+            result = await fetch()
+            failed = False
+            return result
+        finally:
+            self._release(request.domain, time.monotonic() - start, failed=failed)
+
+    async def run(self, url: str, fetch: Callable[[], Awaitable[T]], priority: Optional[FetchPriority] = None) -> T:
+        """Run `fetch`, which fetches `url`, once the scheduler allows it, or join the fetch of `url` already scheduled.
+
+        The priority class defaults to the `fetch_priority` of the current task.
+        """
+        self._bind_loop()
+        priority = fetch_priority.get() if priority is None else priority
+        key = get_url_key(url)
+
+        flight = self._flights.get(key)
+        if flight is None:
+            request = _FetchRequest(priority=priority,
+                                    order=next(self._order),
+                                    domain=get_domain(url),
+                                    started=self._loop.create_future())
+            flight = _Flight(asyncio.ensure_future(self._schedule(request, fetch)), request)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._flights.pop(key, None) if self._flights.get(key) is flight else None)
+        else:
+            self.coalesced += 1
+            if priority < flight.request.priority and not flight.request.started.done():
+                flight.request.priority = priority
+                heapq.heapify(self._queue)
+                self._dispatch()
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            # The fetch is only cancelled once every caller waiting for it is
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        queued = [request for request in self._queue if not (request.cancelled or request.started.done())]
+        return {
+            "queue_depth": len(queued),
+            "queue_depth_by_priority": {
+                priority.name.lower(): sum(request.priority == priority for request in queued)
+                for priority in FetchPriority
+            },
+            "in_flight": self.in_flight,
+            "coalesced": self.coalesced,
+            "domains": {domain: state.stats() for domain, state in self._domains.items()},
+        }
+
+
+fetch_scheduler = FetchScheduler()
+
+__all__ = [
+    "FetchPriority",
+    "FetchScheduler",
+    "fetch_priority",
+    "fetch_scheduler",
+]
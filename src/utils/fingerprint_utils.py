@@ -0,0 +1,132 @@
+import re
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Contents at least this similar (estimated Jaccard similarity of their shingles) are near-duplicates
+DEFAULT_DUPLICATE_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+
+# Prime above 2**32, so the permutations of the 32-bit shingle hashes stay within uint64
+_MERSENNE_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def get_shingles(text: str, shingle_size: int = DEFAULT_SHINGLE_SIZE) -> Set[int]:
+    """
+    Get the hashed word shingles of a text, case and punctuation insensitive.
+    :param text: The text to shingle.
+    :param shingle_size: Number of consecutive words per shingle.
+    :return: The set of 32-bit shingle hashes, a single shingle for texts shorter than `shingle_size` words.
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) <= shingle_size:
+        return {zlib.crc32(" ".join(words).encode())}
+    return {zlib.crc32(" ".join(words[i:i + shingle_size]).encode()) for i in range(len(words) - shingle_size + 1)}
+
+
+class MinHasher():
+    """Computes MinHash signatures, whose agreement rate estimates the Jaccard similarity of two shingle sets."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        generator = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = generator.randint(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Set[int]) -> np.ndarray:
+        hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+        return float(np.mean(signature == other))
+
+
+def _get_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick the LSH bands and rows whose candidate threshold (1/bands)^(1/rows) is the highest below `threshold`.
+
+    Candidates are then checked against the full signature, so a lower candidate threshold only costs comparisons.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) < threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex():
+    """MinHash LSH index of contents, answering whether a new content is a near-duplicate of an indexed one.
+
+    Parameters:
+        threshold (`float`): Estimated Jaccard similarity from which two contents are near-duplicates.
+        num_perm (`int`): Number of MinHash permutations, more is more accurate and slower.
+        shingle_size (`int`): Number of consecutive words per shingle.
+    """
+
+    def __init__(self,
+                 threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+                 num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands, self.rows = _get_bands(threshold, num_perm)
+
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _find(self, signature: np.ndarray, band_keys: List[bytes]) -> Optional[Tuple[str, float]]:
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, band_keys):
+            candidates.update(bucket.get(band_key, ()))
+
+        best = None
+        for key in candidates:
+            similarity = self.hasher.similarity(signature, self.signatures[key])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def find(self, text: str) -> Optional[Tuple[str, float]]:
+        """Return the key and the estimated similarity of the most similar near-duplicate of a text, if any."""
+        shingles = get_shingles(text, self.shingle_size)
+        if not shingles:
+            return None
+        signature = self.hasher.signature(shingles)
+        return self._find(signature, self._band_keys(signature))
+
+    def add(self, key: str, text: str) -> Optional[Tuple[str, float]]:
+        """Index a text under a key unless it is a near-duplicate of an indexed text.
+
+        :return: The key and the estimated similarity of the near-duplicate, None when the text was indexed.
+        """
+        shingles = get_shingles(text, self.shingle_size)
+        if not shingles:
+            return None
+        signature = self.hasher.signature(shingles)
+        band_keys = self._band_keys(signature)
+
+        duplicate = self._find(signature, band_keys)
+        if duplicate is not None:
+            return duplicate
+
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self.buckets, band_keys):
+            bucket.setdefault(band_key, []).append(key)
+        return None
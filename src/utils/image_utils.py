@@ -1,8 +1,23 @@
 import requests
 import os
 import base64
+import hashlib
 import mimetypes
+import threading
 import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+IMAGE_MAX_SIZE = int(os.getenv('IMAGE_MAX_SIZE', 2048))
+IMAGE_FORMAT = os.getenv('IMAGE_FORMAT', 'PNG').upper()
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', 85))
+IMAGE_CACHE_MAX_SIZE = int(os.getenv('IMAGE_CACHE_MAX_SIZE', 256 * 1024 * 1024))
+
 
 def download_image(image_url, download_path):
 
@@ -29,4 +44,136 @@ def download_image(image_url, download_path):
         for chunk in response.iter_content(chunk_size=512):
             fh.write(chunk)
 
-    return download_image_path
\ No newline at end of file
+    return download_image_path
+
+
+@dataclass(frozen=True)
+class ImagePolicy:
+    """How images are prepared before being sent to a model.
+
+    Attributes:
+        max_size: Longest side in pixels, larger images are downscaled. None keeps the original size.
+        format: Encoding format understood by PIL ("PNG", "JPEG", "WEBP").
+        quality: Quality used for the lossy formats.
+    """
+    max_size: Optional[int] = IMAGE_MAX_SIZE
+    format: str = IMAGE_FORMAT
+    quality: int = IMAGE_QUALITY
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.format.lower()}"
+
+
+DEFAULT_IMAGE_POLICY = ImagePolicy()
+
+# Policies per model id, a key also matches every model id containing it
+MODEL_IMAGE_POLICIES: Dict[str, ImagePolicy] = {
+    # Anthropic downscales anything above 1568px on the long edge server side
+    "claude": replace(DEFAULT_IMAGE_POLICY, max_size=1568),
+}
+
+
+def get_image_policy(model_id: Optional[str] = None, raw: bool = False) -> ImagePolicy:
+    """Policy of a model. Raw policies are for base64 payloads sent without a mime type and always encode PNG."""
+    policy = DEFAULT_IMAGE_POLICY
+    if model_id:
+        model_id = model_id.split("/")[-1]
+        if model_id in MODEL_IMAGE_POLICIES:
+            policy = MODEL_IMAGE_POLICIES[model_id]
+        else:
+            policy = next((policy for key, policy in MODEL_IMAGE_POLICIES.items() if key in model_id), policy)
+    return replace(policy, format="PNG") if raw else policy
+
+
+def set_image_policy(model_id: str, policy: ImagePolicy) -> None:
+    MODEL_IMAGE_POLICIES[model_id] = policy
+
+
+def _encode_image(image: "Image.Image", policy: ImagePolicy) -> str:
+    if policy.max_size and max(image.size) > policy.max_size:
+        scale = policy.max_size / max(image.size)
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                             Image.LANCZOS)
+
+    image_format = policy.format.upper()
+    save_kwargs = {}
+    if image_format in ("JPEG", "WEBP"):
+        save_kwargs["quality"] = policy.quality
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffered = BytesIO()
+    image.save(buffered, format=image_format, **save_kwargs)
+    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+
+class ImageEncodingCache():
+    """Process-wide cache of base64 encoded images.
+
+    Images are keyed by a hash of their pixels and the policy used to encode them. The hash
+    of an image object is remembered while the object is alive, so screenshots kept in the
+    agent memory are neither re-hashed nor re-encoded at every step.
+    """
+
+    def __init__(self, max_size: int = IMAGE_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self._encoded: OrderedDict[Tuple[str, ImagePolicy], str] = OrderedDict()
+        self._digests: Dict[int, Tuple[weakref.ref, str]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _get_digest(self, image: "Image.Image") -> str:
+        entry = self._digests.get(id(image))
+        if entry is not None and entry[0]() is image:
+            return entry[1]
+
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+        digest.update(f"{image.mode}:{image.size}".encode("utf-8"))
+        digest = digest.hexdigest()
+
+        image_id = id(image)
+        try:
+            ref = weakref.ref(image, lambda _, image_id=image_id: self._digests.pop(image_id, None))
+            self._digests[image_id] = (ref, digest)
+        except TypeError:
+            pass
+        return digest
+
+    def encode(self, image: "Image.Image", policy: ImagePolicy = DEFAULT_IMAGE_POLICY) -> str:
+        with self._lock:
+            key = (self._get_digest(image), policy)
+            if key in self._encoded:
+                self._encoded.move_to_end(key)
+                self.hits += 1
+                return self._encoded[key]
+
+            self.misses += 1
+            encoded = _encode_image(image, policy)
+            self._encoded[key] = encoded
+            self.size += len(encoded)
+            while self.size > self.max_size and len(self._encoded) > 1:
+                _, evicted = self._encoded.popitem(last=False)
+                self.size -= len(evicted)
+            return encoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._encoded.clear()
+            self.size = 0
+
+
+image_encoding_cache = ImageEncodingCache()
+
+
+def encode_image_cached(image: "Image.Image", policy: ImagePolicy = DEFAULT_IMAGE_POLICY) -> str:
+    """Base64 encode an image with the given policy, reusing previous encodings of the same pixels."""
+    return image_encoding_cache.encode(image, policy)
+
+
+def make_image_url_cached(image: "Image.Image", policy: ImagePolicy = DEFAULT_IMAGE_POLICY) -> str:
+    """Data URL of an image encoded with the given policy."""
+    return f"data:{policy.mime_type};base64,{encode_image_cached(image, policy)}"
@@ -0,0 +1,87 @@
+import re
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+DEFAULT_PASSAGE_LENGTH = 1000
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD_PATTERN = re.compile(r"\w+")
+_PARAGRAPH_PATTERN = re.compile(r"\n\s*\n")
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def split_passages(text: str, passage_length: int = DEFAULT_PASSAGE_LENGTH) -> List[str]:
+    """
+    Split a text into passages of about `passage_length` characters along paragraph boundaries.
+    :param text: The text to split.
+    :param passage_length: Maximum number of characters of a passage. Longer paragraphs are cut between words.
+    :return: The passages, in document order.
+    """
+    passages = []
+    current = ""
+    for paragraph in _PARAGRAPH_PATTERN.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        if current and len(current) + len(paragraph) + 2 > passage_length:
+            passages.append(current)
+            current = ""
+
+        while len(paragraph) > passage_length:
+            cut = paragraph.rfind(" ", 0, passage_length)
+            cut = cut if cut > 0 else passage_length
+            if current:
+                passages.append(current)
+                current = ""
+            passages.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+
+    if current:
+        passages.append(current)
+    return passages
+
+
+def bm25_scores(query: str, passages: List[str], k1: float = BM25_K1, b: float = BM25_B) -> np.ndarray:
+    """
+    Score passages against a query with Okapi BM25, the passages being the collection.
+    :param query: The query.
+    :param passages: The passages to score.
+    :return: The score of each passage, 0 for passages sharing no term with the query.
+    """
+    query_terms = list(dict.fromkeys(tokenize(query)))
+    if not passages or not query_terms:
+        return np.zeros(len(passages))
+
+    term_index = {term: index for index, term in enumerate(query_terms)}
+    term_frequencies = np.zeros((len(passages), len(query_terms)))
+    lengths = np.zeros(len(passages))
+    for row, passage in enumerate(passages):
+        tokens = tokenize(passage)
+        lengths[row] = len(tokens)
+        for term, count in Counter(token for token in tokens if token in term_index).items():
+            term_frequencies[row, term_index[term]] = count
+
+    document_frequencies = (term_frequencies > 0).sum(axis=0)
+    idf = np.log((len(passages) - document_frequencies + 0.5) / (document_frequencies + 0.5) + 1)
+    norms = k1 * (1 - b + b * lengths / max(lengths.mean(), 1))
+    weights = term_frequencies * (k1 + 1) / (term_frequencies + norms[:, None])
+    return weights @ idf
+
+
+def rank_passages(query: str, passages: List[str], top_k: int) -> List[int]:
+    """
+    Get the indexes of the `top_k` passages most relevant to a query, best first.
+    Ties, e.g. passages sharing no term with the query, keep their document order.
+    """
+    scores = bm25_scores(query, passages)
+    order = np.argsort(-scores, kind="stable")
+    return [int(index) for index in order[:top_k]]
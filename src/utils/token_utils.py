@@ -1,5 +1,66 @@
+import os
+from functools import lru_cache
+from typing import Any
+
 import tiktoken
 
+# Tokens charged for an image part, a rough upper bound across providers
+IMAGE_TOKEN_COUNT = int(os.getenv('IMAGE_TOKEN_COUNT', 1500))
+# Tokens added by the chat format around each message
+MESSAGE_TOKEN_OVERHEAD = 4
+DEFAULT_CONTEXT_WINDOW = int(os.getenv('DEFAULT_CONTEXT_WINDOW', 128000))
+# Encoding used for the models tiktoken does not know (Anthropic, Google, Qwen, ...), close enough for budgeting
+DEFAULT_ENCODING = "o200k_base"
+
+# Context windows in tokens, a key also matches every model id containing it. Longer keys are checked first.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-5": 400000,
+    "o1": 200000,
+    "o3": 200000,
+    "o4-mini": 200000,
+    "claude": 200000,
+    "gemini-2.5": 1048576,
+    "qwen2.5": 32768,
+    "deepseek": 65536,
+}
+
+# USD per million input, cached input and output tokens. Keys match like the context windows.
+MODEL_PRICES = {
+    "gpt-4o": (2.5, 1.25, 10.0),
+    "gpt-4o-search-preview": (2.5, 2.5, 10.0),
+    "gpt-4.1": (2.0, 0.5, 8.0),
+    "gpt-5": (1.25, 0.125, 10.0),
+    "o1": (15.0, 7.5, 60.0),
+    "o3": (2.0, 0.5, 8.0),
+    "o3-deep-research": (10.0, 2.5, 40.0),
+    "o4-mini": (1.1, 0.275, 4.4),
+    "claude": (3.0, 0.3, 15.0),
+    "gemini-2.5": (1.25, 0.31, 10.0),
+    "deepseek-chat": (0.27, 0.07, 1.1),
+    "deepseek-reasoner": (0.55, 0.14, 2.19),
+}
+
+
+def _match_model(model: str, table: dict) -> Any:
+    model = model.split("/")[-1].lower()
+    for key in sorted(table, key=len, reverse=True):
+        if key in model:
+            return table[key]
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = "gpt-4o") -> "tiktoken.Encoding":
+    """Tokenizer of a model, created once per model id."""
+    model = model.split("/")[-1]
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
 def get_token_count(prompt: str, model: str = "gpt-4o") -> int:
     """
     Get the number of tokens in a prompt.
@@ -7,5 +68,55 @@ def get_token_count(prompt: str, model: str = "gpt-4o") -> int:
     :param model: The model to use for tokenization. Default is "gpt-4o".
     :return: The number of tokens in the prompt.
     """
-    encoding = tiktoken.encoding_for_model(model)
-    return len(encoding.encode(prompt))
\ No newline at end of file
+    encoding = get_encoding(model)
+    return len(encoding.encode(prompt, disallowed_special=()))
+
+
+def get_message_token_count(message: Any, model: str = "gpt-4o") -> int:
+    """
+    Get the number of tokens of a chat message, text parts are tokenized and images charged a flat count.
+    :param message: A `ChatMessage` or a message dict.
+    :param model: The model to use for tokenization. Default is "gpt-4o".
+    :return: The number of tokens in the message.
+    """
+    content = message.get("content") if isinstance(message, dict) else message.content
+    if content is None:
+        return MESSAGE_TOKEN_OVERHEAD
+    if isinstance(content, str):
+        return MESSAGE_TOKEN_OVERHEAD + get_token_count(content, model)
+
+    token_count = MESSAGE_TOKEN_OVERHEAD
+    for element in content:
+        if element.get("type") == "text":
+            token_count += get_token_count(element["text"], model)
+        elif element.get("type") in ("image", "image_url"):
+            token_count += IMAGE_TOKEN_COUNT
+    return token_count
+
+
+def get_context_window(model: str) -> int:
+    """
+    Get the context window of a model.
+    :param model: The model id.
+    :return: The number of tokens the model accepts, `DEFAULT_CONTEXT_WINDOW` for unknown models.
+    """
+    context_window = _match_model(model, MODEL_CONTEXT_WINDOWS)
+    return context_window if context_window is not None else DEFAULT_CONTEXT_WINDOW
+
+
+def get_token_cost(model: str, input_tokens: int, output_tokens: int, cached_input_tokens: int = 0) -> float:
+    """
+    Get the price of a model call.
+    :param model: The model id.
+    :param input_tokens: Number of input tokens, including the cached ones.
+    :param output_tokens: Number of output tokens.
+    :param cached_input_tokens: Part of the input tokens read from the prompt cache.
+    :return: The cost in USD, 0 for models without a known price.
+    """
+    prices = _match_model(model, MODEL_PRICES)
+    if prices is None:
+        return 0.0
+    input_price, cached_input_price, output_price = prices
+    return ((input_tokens - cached_input_tokens) * input_price
+            + cached_input_tokens * cached_input_price
+            + output_tokens * output_price) / 1e6
@@ -1,17 +1,23 @@
 import os
-from typing import Optional
+import asyncio
+from typing import Dict, Optional
 from dotenv import load_dotenv
 load_dotenv(verbose=True)
 
 from markitdown._base_converter import DocumentConverterResult
-from crawl4ai import AsyncWebCrawler
 from firecrawl import FirecrawlApp
 
+from src.utils.fetch_cache import CachedPage, fetch_cache
+from src.utils.crawler_pool import crawler_pool
+from src.utils.fetch_scheduler import fetch_scheduler
+
 async def firecrawl_fetch_url(url: str):
     try:
         app = FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY", None))
 
-        response = app.scrape_url(
+        # The Firecrawl client is blocking, keep the event loop free for the other fetches
+        response = await asyncio.to_thread(
+            app.scrape_url,
             url,
         )
 
@@ -22,22 +28,52 @@ async def firecrawl_fetch_url(url: str):
         return None
 
 async def fetch_crawl4ai_url(url: str):
-    """Fetch content from a given URL using the crawl4ai library."""
+    """Fetch content from a given URL using the crawl4ai library, with a browser of the shared crawler pool."""
     try:
-        async with AsyncWebCrawler() as crawler:
-            response = await crawler.arun(
-                url=url,
-            )
+        response = await crawler_pool.arun(
+            url=url,
+        )
 
-            if response:
-                result = response.markdown
-                return result
-            else:
-                return None
+        if response:
+            result = response.markdown
+            return result
+        else:
+            return None
     except Exception as e:
         return None
 
 async def fetch_url(url: str) -> Optional[DocumentConverterResult]:
+    """Fetch the content of a URL as markdown, from the fetch cache when it is fresh or still valid.
+
+    Requests to the web go through the fetch scheduler, which keeps them polite to the fetched domains
+    and coalesces concurrent fetches of the same URL.
+    """
+    page = await fetch_cache.aget(url)
+    if page is not None and page.is_fresh:
+        return DocumentConverterResult(markdown=page.markdown, title=page.title)
+    return await fetch_scheduler.run(url, lambda: _revalidate_or_fetch_url(url, page))
+
+async def _revalidate_or_fetch_url(url: str, page: Optional[CachedPage]) -> Optional[DocumentConverterResult]:
+    if page is not None and await fetch_cache.revalidate(page):
+        return DocumentConverterResult(markdown=page.markdown, title=page.title)
+
+    result = await _fetch_url(url)
+    if result:
+        # The validators are kept for later revalidations
+        validators = await _get_validators(url)
+        await fetch_cache.aset(url, result.markdown, title=result.title, **validators)
+    return result
+
+async def _get_validators(url: str) -> Dict[str, Optional[str]]:
+    # The HEAD request is an extra request to the domain, only sent when the scheduler has a slot to spare
+    if not fetch_cache.enabled or not fetch_scheduler.try_acquire(url):
+        return {}
+    try:
+        return await fetch_cache.get_validators(url)
+    finally:
+        fetch_scheduler.release(url)
+
+async def _fetch_url(url: str) -> Optional[DocumentConverterResult]:
     # Fetch content from a URL using Firecrawl and Crawl4AI.
 
     try:
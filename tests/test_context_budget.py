@@ -0,0 +1,59 @@
+import unittest
+
+from src.logger import Timing
+from src.memory import AgentMemory, ActionStep, PlanningStep, TaskStep, ContextBudgeter
+
+
+def action_step(step_number, observations):
+    return ActionStep(step_number=step_number,
+                      timing=Timing(start_time=0.0, end_time=1.0),
+                      model_output=f"Thought {step_number}",
+                      observations=observations)
+
+
+class TestContextBudgeter(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = AgentMemory(system_prompt="You are a helpful agent.", user_prompt="Go on.")
+        self.memory.steps.append(TaskStep(task="Find the answer."))
+        for step_number in range(6):
+            self.memory.steps.append(action_step(step_number, f"result {step_number} " * 2000))
+
+    def test_fits_without_changes_under_budget(self):
+        budgeter = ContextBudgeter("gpt-4o", max_tokens=1000000, reserved_tokens=0)
+        messages = budgeter.fit(self.memory)
+        self.assertTrue(any("result 0" in message.content[0]["text"] for message in messages))
+
+    def test_elides_oldest_observations_first(self):
+        budgeter = ContextBudgeter("gpt-4o", max_tokens=20000, reserved_tokens=0, keep_last_steps=2)
+        order = budgeter._get_elision_order(self.memory.steps)
+        self.assertEqual(order[:4], [1, 2, 3, 4])
+        messages = budgeter.fit(self.memory)
+        texts = "\n".join(message.content[0]["text"] for message in messages)
+        self.assertIn("truncated", texts)
+        self.assertIn("result 5 " * 2000, texts)
+
+    def test_duplicate_observations_are_elided_first(self):
+        self.memory.steps.append(action_step(6, "result 2 " * 2000))
+        budgeter = ContextBudgeter("gpt-4o", max_tokens=20000, reserved_tokens=0)
+        self.assertEqual(budgeter._get_elision_order(self.memory.steps)[0], 3)
+
+    def test_drops_steps_but_keeps_task_and_latest_plan(self):
+        self.memory.steps.append(PlanningStep(model_input_messages=[], model_output_message=None,
+                                              plan="The plan.", timing=Timing(start_time=0.0, end_time=1.0)))
+        budgeter = ContextBudgeter("gpt-4o", max_tokens=100, reserved_tokens=0)
+        texts = "\n".join(message.content[0]["text"] for message in budgeter.fit(self.memory))
+        self.assertIn("Find the answer.", texts)
+        self.assertIn("The plan.", texts)
+        self.assertNotIn("Thought 0", texts)
+
+    def test_token_counts_are_cached_on_final_steps(self):
+        step = self.memory.steps[1]
+        step.get_token_count("gpt-4o")
+        self.assertIn(("gpt-4o", False, False), step.__dict__["_token_count_cache"])
+        step.observations = "changed"
+        self.assertNotIn("_token_count_cache", step.__dict__)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from src.utils.crawler_pool import CrawlerPool
+
+
+class FakeCrawler():
+    """Crawler whose pages take a delay to crawl, and which can break like a crashed browser."""
+
+    instances = []
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.broken = False
+        self.started = False
+        self.closed = False
+        self.active = 0
+        self.max_active = 0
+        FakeCrawler.instances.append(self)
+
+    async def start(self):
+        self.started = True
+
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.broken:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return SimpleNamespace(success=True, markdown=f"content of {url}")
+
+
+class TestCrawlerPool(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        FakeCrawler.instances = []
+
+    def make_pool(self, **kwargs):
+        return CrawlerPool(crawler_factory=FakeCrawler, **kwargs)
+
+    async def test_browsers_are_reused_across_concurrent_runs(self):
+        pool = self.make_pool(size=2, max_concurrent_pages=3)
+        results = await asyncio.gather(*[pool.arun(f"https://{i}.com") for i in range(12)])
+
+        self.assertEqual(results[3].markdown, "content of https://3.com")
+        self.assertEqual(len(FakeCrawler.instances), 2)
+        self.assertEqual([crawler.max_active for crawler in FakeCrawler.instances], [3, 3])
+        self.assertFalse(any(crawler.closed for crawler in FakeCrawler.instances))
+
+    async def test_requests_are_spread_while_browsers_start(self):
+        class SlowStartingCrawler(FakeCrawler):
+            async def start(self):
+                await asyncio.sleep(0.05)
+                await super().start()
+
+        pool = CrawlerPool(crawler_factory=SlowStartingCrawler, size=2, max_concurrent_pages=2)
+        await asyncio.gather(*[pool.arun(f"https://{i}.com") for i in range(4)])
+
+        self.assertEqual(len(FakeCrawler.instances), 2)
+        self.assertEqual([crawler.max_active for crawler in FakeCrawler.instances], [2, 2])
+
+    async def test_browsers_are_recycled_after_their_page_budget(self):
+        pool = self.make_pool(size=1, max_concurrent_pages=2, recycle_after=4)
+        await asyncio.gather(*[pool.arun(f"https://{i}.com") for i in range(8)])
+
+        self.assertEqual(len(FakeCrawler.instances), 2)
+        self.assertTrue(FakeCrawler.instances[0].closed)
+        await pool.close()
+        self.assertTrue(FakeCrawler.instances[1].closed)
+
+    async def test_broken_browser_is_replaced(self):
+        pool = self.make_pool(size=1)
+        await pool.arun("https://a.com")
+        FakeCrawler.instances[0].broken = True
+
+        with self.assertRaises(RuntimeError):
+            await pool.arun("https://b.com")
+        result = await pool.arun("https://c.com")
+
+        self.assertEqual(result.markdown, "content of https://c.com")
+        self.assertEqual(len(FakeCrawler.instances), 2)
+        self.assertTrue(FakeCrawler.instances[0].closed)
+        self.assertEqual(pool.retired, 1)
+
+    async def test_idle_browser_is_health_checked_before_reuse(self):
+        pool = self.make_pool(size=1, health_check_interval=0)
+        await pool.arun("https://a.com")
+        FakeCrawler.instances[0].broken = True
+
+        result = await pool.arun("https://b.com")
+        self.assertEqual(result.markdown, "content of https://b.com")
+        self.assertTrue(FakeCrawler.instances[0].closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import time
+import tempfile
+import unittest
+
+import httpx
+
+from src.utils.fetch_cache import FetchCache, get_url_key
+
+
+class TestFetchCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_url_key_normalization(self):
+        self.assertEqual(get_url_key("HTTPS://Example.com:443/a?b=2&a=1#section"), "https://example.com/a?a=1&b=2")
+        self.assertEqual(get_url_key("http://example.com"), "http://example.com/")
+        self.assertNotEqual(get_url_key("http://example.com:8080/"), get_url_key("http://example.com/"))
+
+    def test_pages_survive_new_instance(self):
+        FetchCache(path=self.path).set("https://a.com/page", "# Page", title="Page", etag='"v1"')
+        page = FetchCache(path=self.path).get("https://a.com/page#top")
+
+        self.assertEqual((page.markdown, page.title, page.etag), ("# Page", "Page", '"v1"'))
+        self.assertTrue(page.is_fresh)
+
+    def test_identical_contents_share_a_blob(self):
+        cache = FetchCache(path=self.path)
+        cache.set("https://a.com", "same content")
+        cache.set("https://mirror.com", "same content")
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.path, "blobs"))), 1)
+
+        cache.set("https://a.com", "new content")
+        self.assertEqual(cache.get("https://mirror.com").markdown, "same content")
+
+    def test_least_recently_used_pages_are_evicted(self):
+        cache = FetchCache(path=self.path)
+        for url in ["https://a.com", "https://b.com"]:
+            cache.set(url, f"{url} " + os.urandom(300).hex())
+        cache.max_size = cache.stats()["size"]
+        cache.get("https://a.com")
+
+        # Smaller than the evicted page once compressed, so a single eviction makes room for it
+        cache.set("https://c.com", "https://c.com")
+        self.assertIsNone(cache.get("https://b.com"))
+        self.assertIsNotNone(cache.get("https://a.com"))
+        self.assertIsNotNone(cache.get("https://c.com"))
+        self.assertLessEqual(cache.stats()["size"], cache.max_size)
+
+    async def test_stale_pages_are_revalidated(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            unchanged = request.headers.get("if-none-match") == '"v1"'
+            return httpx.Response(304 if unchanged else 200, headers={"etag": '"v1"' if unchanged else '"v2"'})
+
+        cache = FetchCache(path=self.path, ttl=0.05)
+        cache._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        cache.set("https://a.com", "content", etag='"v1"')
+        cache.set("https://b.com", "content", etag='"v0"')
+        time.sleep(0.1)
+
+        page = cache.get("https://a.com")
+        self.assertFalse(page.is_fresh)
+        self.assertTrue(await cache.revalidate(page))
+        self.assertTrue(cache.get("https://a.com").is_fresh)
+        self.assertFalse(await cache.revalidate(cache.get("https://b.com")))
+        self.assertEqual(requests[0].method, "HEAD")
+        await cache._http_client.aclose()
+
+    async def test_async_access(self):
+        cache = FetchCache(path=self.path, ttl=0.05)
+        await cache.aset("https://a.com", "content", title="A")
+        time.sleep(0.1)
+        self.assertFalse((await cache.aget("https://a.com")).is_fresh)
+
+        await cache.atouch("https://a.com")
+        page = await cache.aget("https://a.com")
+        self.assertEqual((page.markdown, page.title), ("content", "A"))
+        self.assertTrue(page.is_fresh)
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = FetchCache(path=self.path, enabled=False)
+        cache.set("https://a.com", "content")
+        self.assertIsNone(cache.get("https://a.com"))
+        self.assertEqual(os.listdir(self.path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import time
+import unittest
+from collections import Counter
+
+from src.utils.fetch_scheduler import FetchPriority, FetchScheduler, fetch_priority
+
+
+class TestFetchScheduler(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.active = Counter()
+        self.max_active = Counter()
+        self.started = []
+
+    def fetcher(self, url, delay=0.05):
+        domain = url.split("/")[2]
+
+        async def fetch():
+            self.started.append(url)
+            self.active[domain] += 1
+            self.max_active[domain] = max(self.max_active[domain], self.active[domain])
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.active[domain] -= 1
+            return f"content of {url}"
+
+        return fetch
+
+    async def fetch(self, scheduler, url, priority=None, delay=0.05):
+        return await scheduler.run(url, self.fetcher(url, delay), priority=priority)
+
+    async def test_domain_and_global_limits(self):
+        scheduler = FetchScheduler(max_in_flight=3, max_per_domain=2, domain_interval=0)
+        urls = [f"https://{domain}.com/{i}" for domain in "ab" for i in range(4)]
+        results = await asyncio.gather(*[self.fetch(scheduler, url) for url in urls])
+
+        self.assertEqual(results[0], "content of https://a.com/0")
+        self.assertEqual(self.max_active, Counter({"a.com": 2, "b.com": 2}))
+        self.assertEqual(scheduler.in_flight, 0)
+
+    async def test_busy_domain_does_not_block_the_others(self):
+        scheduler = FetchScheduler(max_in_flight=4, max_per_domain=1, domain_interval=0.2)
+        start = time.monotonic()
+        await asyncio.gather(*[self.fetch(scheduler, url, delay=0.01)
+                               for url in ["https://a.com/1", "https://a.com/2", "https://b.com/1"]])
+
+        self.assertEqual(self.started, ["https://a.com/1", "https://b.com/1", "https://a.com/2"])
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    async def test_interactive_fetches_go_first(self):
+        scheduler = FetchScheduler(max_in_flight=1, domain_interval=0)
+        token = fetch_priority.set(FetchPriority.BACKGROUND)
+        background = [asyncio.create_task(self.fetch(scheduler, f"https://a.com/{i}")) for i in range(3)]
+        fetch_priority.reset(token)
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(self.fetch(scheduler, "https://b.com/"))
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(scheduler.stats()["queue_depth_by_priority"], {"interactive": 1, "background": 2})
+        await asyncio.gather(interactive, *background)
+        self.assertEqual(self.started[:2], ["https://a.com/0", "https://b.com/"])
+
+    async def test_concurrent_fetches_of_a_url_are_coalesced(self):
+        scheduler = FetchScheduler()
+        results = await asyncio.gather(*[self.fetch(scheduler, url) for url in
+                                         ["https://a.com/page", "https://A.com/page#intro", "https://a.com/page"]])
+
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(self.started, ["https://a.com/page"])
+        self.assertEqual(scheduler.coalesced, 2)
+        self.assertEqual(scheduler.stats()["domains"]["a.com"]["requests"], 1)
+
+    async def test_fetch_is_cancelled_with_its_last_caller(self):
+        scheduler = FetchScheduler()
+        first = asyncio.create_task(self.fetch(scheduler, "https://a.com/", delay=10))
+        second = asyncio.create_task(self.fetch(scheduler, "https://a.com/", delay=10))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.active["a.com"], 1)
+        second.cancel()
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.active["a.com"], 0)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    async def test_cancelling_queued_fetches_keeps_capacity(self):
+        scheduler = FetchScheduler(max_in_flight=1, domain_interval=0)
+        running = asyncio.create_task(self.fetch(scheduler, "https://a.com/", delay=10))
+        queued = asyncio.create_task(self.fetch(scheduler, "https://b.com/"))
+        last = asyncio.create_task(self.fetch(scheduler, "https://c.com/"))
+        await asyncio.sleep(0.01)
+
+        # The running fetch releases its slot before the queued one handles its cancellation
+        running.cancel()
+        queued.cancel()
+        self.assertEqual(await asyncio.wait_for(last, 1), "content of https://c.com/")
+        self.assertEqual(self.started, ["https://a.com/", "https://c.com/"])
+        self.assertEqual(scheduler.in_flight, 0)
+
+
+    async def test_side_requests_only_take_spare_slots(self):
+        scheduler = FetchScheduler(max_in_flight=4, max_per_domain=2, domain_interval=0)
+        fetch = asyncio.create_task(self.fetch(scheduler, "https://a.com/1", delay=0.1))
+        await asyncio.sleep(0.01)
+
+        self.assertTrue(scheduler.try_acquire("https://a.com/1"))
+        self.assertFalse(scheduler.try_acquire("https://a.com/2"))
+        self.assertTrue(scheduler.try_acquire("https://b.com/"))
+        scheduler.release("https://a.com/1")
+        scheduler.release("https://b.com/")
+        await fetch
+        self.assertEqual(scheduler.in_flight, 0)
+        self.assertEqual(scheduler.stats()["domains"]["a.com"]["active"], 0)
+
+    async def test_side_requests_respect_the_domain_interval(self):
+        scheduler = FetchScheduler(domain_interval=10)
+        await self.fetch(scheduler, "https://a.com/", delay=0)
+        self.assertFalse(scheduler.try_acquire("https://a.com/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
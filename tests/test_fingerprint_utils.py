@@ -0,0 +1,39 @@
+import unittest
+
+from src.utils.fingerprint_utils import MinHasher, NearDuplicateIndex, get_shingles
+
+
+def make_text(start, count):
+    return " ".join(f"token{i}" for i in range(start, start + count))
+
+
+class TestFingerprintUtils(unittest.TestCase):
+
+    def test_shingles_ignore_case_and_punctuation(self):
+        self.assertEqual(get_shingles("The quick, brown fox jumps over!"), get_shingles("the QUICK brown fox: jumps over"))
+        self.assertEqual(len(get_shingles("too short")), 1)
+        self.assertEqual(get_shingles("  ...  "), set())
+
+    def test_minhash_estimates_jaccard_similarity(self):
+        hasher = MinHasher(num_perm=256)
+        first, second = set(range(0, 1000)), set(range(500, 1500))  # Jaccard similarity of 1/3
+        similarity = hasher.similarity(hasher.signature(first), hasher.signature(second))
+        self.assertAlmostEqual(similarity, 1 / 3, delta=0.1)
+
+    def test_index_detects_near_duplicates_only(self):
+        index = NearDuplicateIndex(threshold=0.8)
+        article = make_text(0, 300)
+        self.assertIsNone(index.add("original", article))
+
+        duplicate = index.add("mirror", article + " Originally published elsewhere.")
+        self.assertEqual(duplicate[0], "original")
+        self.assertGreaterEqual(duplicate[1], 0.8)
+
+        self.assertIsNone(index.add("related", make_text(150, 300)))
+        self.assertIsNone(index.add("unrelated", make_text(1000, 300)))
+        self.assertEqual(len(index), 3)
+        self.assertIsNone(index.find(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import base64
+import unittest
+from dataclasses import replace
+from io import BytesIO
+
+from PIL import Image
+
+from src.models import ChatMessage, MessageManager
+from src.models.base import MessageRole
+from src.utils import get_image_policy, image_encoding_cache, make_image_url_cached
+from src.utils.image_utils import DEFAULT_IMAGE_POLICY, ImageEncodingCache
+
+
+def decode_image(encoded):
+    return Image.open(BytesIO(base64.b64decode(encoded)))
+
+
+class TestImageEncodingCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ImageEncodingCache()
+        self.image = Image.new("RGB", (64, 48), color=(200, 10, 10))
+
+    def test_repeated_image_hits(self):
+        encoded = self.cache.encode(self.image)
+        self.assertEqual(self.cache.encode(self.image), encoded)
+        # A copy with the same pixels shares the entry
+        self.assertEqual(self.cache.encode(self.image.copy()), encoded)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_pixel_change_misses(self):
+        encoded = self.cache.encode(self.image)
+        changed = self.image.copy()
+        changed.putpixel((0, 0), (0, 0, 0))
+        self.assertNotEqual(self.cache.encode(changed), encoded)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_policies_get_distinct_entries(self):
+        jpeg_policy = replace(DEFAULT_IMAGE_POLICY, format="JPEG")
+        small_policy = replace(DEFAULT_IMAGE_POLICY, max_size=32)
+        encodings = [self.cache.encode(self.image, policy)
+                     for policy in [DEFAULT_IMAGE_POLICY, jpeg_policy, small_policy]]
+        self.assertEqual(len(set(encodings)), 3)
+        self.assertEqual(self.cache.misses, 3)
+
+        self.assertEqual(decode_image(encodings[1]).format, "JPEG")
+        self.assertEqual(decode_image(encodings[2]).size, (32, 24))
+        self.assertEqual(self.cache.encode(self.image, jpeg_policy), encodings[1])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_evicts_past_max_size(self):
+        encoded = self.cache.encode(self.image)
+        cache = ImageEncodingCache(max_size=len(encoded) + 1)
+        cache.encode(self.image)
+        cache.encode(self.image, replace(DEFAULT_IMAGE_POLICY, max_size=32))
+        self.assertEqual(len(cache._encoded), 1)
+        self.assertLessEqual(cache.size, cache.max_size)
+
+
+class TestImagePolicy(unittest.TestCase):
+
+    def test_model_policies(self):
+        self.assertEqual(get_image_policy("claude-4-sonnet").max_size, 1568)
+        self.assertEqual(get_image_policy("anthropic/claude37-sonnet").max_size, 1568)
+        self.assertEqual(get_image_policy("gpt-4.1"), DEFAULT_IMAGE_POLICY)
+        self.assertEqual(get_image_policy("gpt-4.1", raw=True).format, "PNG")
+
+    def test_claude_images_are_downscaled(self):
+        image = Image.new("RGB", (3136, 1000), color=(10, 200, 10))
+        message = ChatMessage(role=MessageRole.USER, content=[{"type": "text", "text": "describe"},
+                                                              {"type": "image", "image": image}])
+        message_list = MessageManager(model_id="claude-4-sonnet").get_clean_message_list(
+            [message], convert_images_to_image_urls=True)
+        url = message_list[0]["content"][-1]["image_url"]["url"]
+        self.assertEqual(url, make_image_url_cached(image, get_image_policy("claude-4-sonnet")))
+        self.assertEqual(decode_image(url.split(",", 1)[1]).size, (1568, 500))
+
+        hits = image_encoding_cache.hits
+        MessageManager(model_id="claude-4-sonnet").get_clean_message_list(
+            [message], convert_images_to_image_urls=True)
+        self.assertGreater(image_encoding_cache.hits, hits)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+from collections import Counter
+from unittest import mock
+
+import httpx
+
+from src.proxy.local_proxy import HostLimitedAsyncTransport, build_async_http_client
+
+
+class TestHostLimitedAsyncTransport(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.active = Counter()
+        self.max_active = Counter()
+
+    def make_client(self, handler, max_connections_per_host=2):
+        transport = HostLimitedAsyncTransport(max_connections_per_host=max_connections_per_host)
+        transport._transport = httpx.MockTransport(handler)
+        return httpx.AsyncClient(transport=transport), transport
+
+    async def slow_handler(self, request):
+        host = request.url.host
+        self.active[host] += 1
+        self.max_active[host] = max(self.max_active[host], self.active[host])
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.active[host] -= 1
+        return httpx.Response(200, content=b"ok")
+
+    def free_slots(self, transport, host):
+        return transport._semaphores[host]._value
+
+    async def test_caps_requests_per_host(self):
+        client, transport = self.make_client(self.slow_handler, max_connections_per_host=2)
+        async with client:
+            responses = await asyncio.gather(*[client.get("https://a.com/") for _ in range(6)],
+                                             *[client.get("https://b.com/") for _ in range(2)])
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertEqual(self.max_active["a.com"], 2)
+        self.assertEqual(self.max_active["b.com"], 2)
+        self.assertEqual(self.free_slots(transport, "a.com"), 2)
+
+    async def test_releases_slot_when_streamed_body_is_read(self):
+        client, transport = self.make_client(lambda request: httpx.Response(200, content=b"body"),
+                                             max_connections_per_host=1)
+        async with client:
+            async with client.stream("GET", "https://a.com/") as response:
+                self.assertEqual(self.free_slots(transport, "a.com"), 0)
+                self.assertEqual(await response.aread(), b"body")
+            self.assertEqual(self.free_slots(transport, "a.com"), 1)
+
+    async def test_releases_slot_on_early_close(self):
+        client, transport = self.make_client(lambda request: httpx.Response(200, content=b"body"),
+                                             max_connections_per_host=1)
+        async with client:
+            response = await client.send(client.build_request("GET", "https://a.com/"), stream=True)
+            self.assertEqual(self.free_slots(transport, "a.com"), 0)
+            await response.aclose()
+            self.assertEqual(self.free_slots(transport, "a.com"), 1)
+
+            # The slot is free again for the next request
+            response = await asyncio.wait_for(client.get("https://a.com/"), timeout=1)
+            self.assertEqual(response.content, b"body")
+
+    async def test_releases_slot_on_transport_error(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        client, transport = self.make_client(handler, max_connections_per_host=1)
+        async with client:
+            for _ in range(2):
+                with self.assertRaises(httpx.ConnectError):
+                    await asyncio.wait_for(client.get("https://a.com/"), timeout=1)
+            self.assertEqual(self.free_slots(transport, "a.com"), 1)
+
+
+class TestBuildAsyncHttpClient(unittest.IsolatedAsyncioTestCase):
+
+    async def test_uses_environment_proxies(self):
+        proxies = {"https": "proxy:3128", "no": "localhost,.internal.com"}
+        with mock.patch("urllib.request.getproxies", return_value=proxies):
+            client = build_async_http_client(proxy=None)
+        async with client:
+            proxied = client._transport_for_url(httpx.URL("https://a.com/"))
+            self.assertIsNot(proxied, client._transport)
+            self.assertIsInstance(proxied, HostLimitedAsyncTransport)
+            # Every transport of the client shares the per-host caps
+            self.assertIs(proxied._semaphores, client._transport._semaphores)
+            self.assertIs(client._transport_for_url(httpx.URL("https://x.internal.com/")), client._transport)
+            self.assertIs(client._transport_for_url(httpx.URL("https://localhost:8000/")), client._transport)
+            self.assertIs(client._transport_for_url(httpx.URL("http://a.com/")), client._transport)
+
+    async def test_explicit_proxy_ignores_environment(self):
+        with mock.patch("urllib.request.getproxies", return_value={"all": "http://proxy:3128"}):
+            client = build_async_http_client(proxy="http://local:8080")
+        async with client:
+            self.assertIs(client._transport_for_url(httpx.URL("https://a.com/")), client._transport)
+
+    async def test_no_proxy_wildcard_disables_environment_proxies(self):
+        with mock.patch("urllib.request.getproxies", return_value={"all": "http://proxy:3128", "no": "*"}):
+            client = build_async_http_client(proxy=None)
+        async with client:
+            self.assertIs(client._transport_for_url(httpx.URL("https://a.com/")), client._transport)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import json
+import unittest
+from copy import deepcopy
+
+from src.models import ChatMessage, LiteLLMModel, MessageManager
+from src.models.base import MessageRole
+from src.models.message_manager import MAX_CONVERSION_CACHE_SIZE, dumps_completion_payload
+
+API_TYPES = ["chat/completions", "responses"]
+
+
+def text_message(role, text):
+    return ChatMessage(role=role, content=[{"type": "text", "text": text}])
+
+
+class FakeTool():
+    def __init__(self, name="search"):
+        self.name = name
+        self.description = f"{name} the web"
+        self.parameters = {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "query to run"},
+                "limit": {"type": "any", "description": "number of results", "nullable": True},
+            },
+        }
+
+
+class TestIncrementalMessageList(unittest.TestCase):
+
+    def setUp(self):
+        self.messages = [
+            text_message(MessageRole.SYSTEM, "system prompt"),
+            text_message(MessageRole.USER, "task"),
+            text_message(MessageRole.ASSISTANT, "thought"),
+            text_message(MessageRole.USER, "observation"),
+        ]
+
+    def convert(self, message_manager, message_list, api_type):
+        return message_manager.get_clean_message_list(message_list, api_type=api_type)
+
+    def assertMatchesFromScratch(self, message_list, output, api_type):
+        expected = self.convert(MessageManager(model_id="gpt-4.1"), message_list, api_type)
+        self.assertEqual(output, expected)
+
+    def test_append_to_tail(self):
+        for api_type in API_TYPES:
+            with self.subTest(api_type=api_type):
+                message_manager = MessageManager(model_id="gpt-4.1")
+                first = self.convert(message_manager, self.messages[:2], api_type)
+                snapshot = deepcopy(first)
+
+                output = self.convert(message_manager, self.messages, api_type)
+                self.assertMatchesFromScratch(self.messages, output, api_type)
+                # The converted prefix is reused and never modified
+                self.assertIs(output[0], first[0])
+                self.assertIs(output[1], first[1])
+                self.assertEqual(first, snapshot)
+
+    def test_divergence_mid_list(self):
+        for api_type in API_TYPES:
+            with self.subTest(api_type=api_type):
+                message_manager = MessageManager(model_id="gpt-4.1")
+                first = self.convert(message_manager, self.messages, api_type)
+                snapshot = deepcopy(first)
+
+                diverged = self.messages[:2] + [text_message(MessageRole.ASSISTANT, "another thought"),
+                                                text_message(MessageRole.USER, "another observation")]
+                output = self.convert(message_manager, diverged, api_type)
+                self.assertMatchesFromScratch(diverged, output, api_type)
+                self.assertIs(output[1], first[1])
+                self.assertEqual(first, snapshot)
+
+                # Going back to the original list still gives its conversion
+                output = self.convert(message_manager, self.messages, api_type)
+                self.assertMatchesFromScratch(self.messages, output, api_type)
+
+    def test_same_role_message_is_merged(self):
+        for api_type in API_TYPES:
+            with self.subTest(api_type=api_type):
+                message_manager = MessageManager(model_id="gpt-4.1")
+                first = self.convert(message_manager, self.messages, api_type)
+                snapshot = deepcopy(first)
+
+                merged = self.messages + [text_message(MessageRole.USER, "more observation")]
+                output = self.convert(message_manager, merged, api_type)
+                self.assertMatchesFromScratch(merged, output, api_type)
+                self.assertEqual(len(output), len(first))
+                self.assertEqual(first, snapshot)
+
+                # A message following the merged one starts from the merged checkpoint
+                extended = merged + [text_message(MessageRole.ASSISTANT, "answer")]
+                output = self.convert(message_manager, extended, api_type)
+                self.assertMatchesFromScratch(extended, output, api_type)
+
+                # Dropping the merged message goes back to the unmerged conversion
+                output = self.convert(message_manager, self.messages, api_type)
+                self.assertEqual(output, snapshot)
+
+    def test_api_types_are_cached_apart(self):
+        message_manager = MessageManager(model_id="gpt-4.1")
+        # Chat completions join merged texts while responses keep both parts
+        messages = self.messages + [text_message(MessageRole.USER, "more observation")]
+        for _ in range(2):
+            for api_type in API_TYPES:
+                output = self.convert(message_manager, messages, api_type)
+                self.assertMatchesFromScratch(messages, output, api_type)
+        self.assertEqual(len(message_manager._conversion_cache), len(API_TYPES))
+        self.assertNotEqual(self.convert(message_manager, messages, "chat/completions"),
+                            self.convert(message_manager, messages, "responses"))
+
+    def test_eviction_past_cache_size(self):
+        message_manager = MessageManager(model_id="gpt-4.1")
+        conversations = [[text_message(MessageRole.SYSTEM, f"system prompt {i}"),
+                          text_message(MessageRole.USER, f"task {i}")]
+                         for i in range(MAX_CONVERSION_CACHE_SIZE + 1)]
+        for conversation in conversations:
+            self.convert(message_manager, conversation, "chat/completions")
+        self.assertEqual(len(message_manager._conversion_cache), MAX_CONVERSION_CACHE_SIZE)
+        cached_ids = {cache_key[-1] for cache_key in message_manager._conversion_cache}
+        self.assertNotIn(id(conversations[0][0]), cached_ids)
+        self.assertIn(id(conversations[-1][0]), cached_ids)
+
+        # The evicted conversation is converted again from scratch
+        conversation = conversations[0] + [text_message(MessageRole.ASSISTANT, "thought")]
+        output = self.convert(message_manager, conversation, "chat/completions")
+        self.assertMatchesFromScratch(conversation, output, "chat/completions")
+        self.assertEqual(len(message_manager._conversion_cache), MAX_CONVERSION_CACHE_SIZE)
+
+
+class TestToolJsonSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.tool = FakeTool()
+        self.message_manager = MessageManager(model_id="gpt-4.1")
+
+    def test_payload_round_trip(self):
+        payload = {"model": "gpt-4.1", "messages": [{"role": "user", "content": "task"}], "temperature": 0.0}
+        self.assertEqual(json.loads(dumps_completion_payload(payload)), payload)
+
+        tools = [self.message_manager.get_tool_json_schema(tool) for tool in [self.tool, FakeTool("fetch")]]
+        # An uncompiled schema is serialized as is
+        tools.append({"type": "function", "function": {"name": "noop", "parameters": {}}})
+        for payload in [{**payload, "tools": tools, "tool_choice": "required"}, {"tools": tools}]:
+            self.assertEqual(json.loads(dumps_completion_payload(payload)), payload)
+
+    def test_model_family_shapes(self):
+        openai_schema = self.message_manager.get_tool_json_schema(self.tool)
+        anthropic_schema = self.message_manager.get_tool_json_schema(self.tool, model_id="claude37-sonnet")
+
+        self.assertEqual(openai_schema["type"], "function")
+        self.assertEqual(openai_schema["function"]["name"], "search")
+        self.assertEqual(openai_schema["function"]["parameters"]["required"], ["query"])
+        self.assertEqual(openai_schema["function"]["parameters"]["properties"]["limit"]["type"], "string")
+
+        self.assertEqual(set(anthropic_schema), {"name", "description", "input_schema"})
+        self.assertEqual(anthropic_schema["input_schema"]["required"], ["query"])
+        self.assertEqual(anthropic_schema["input_schema"]["properties"],
+                         openai_schema["function"]["parameters"]["properties"])
+
+        # The tool's own parameters are left as they are
+        self.assertEqual(self.tool.parameters["properties"]["limit"]["type"], "any")
+
+    def test_callers_do_not_mutate_shared_schema(self):
+        model = LiteLLMModel(model_id="gpt-4.1")
+        schema = model.message_manager.get_tool_json_schema(self.tool, model_id=model.model_id)
+        snapshot = deepcopy(schema)
+
+        messages = [text_message(MessageRole.USER, "task")]
+        for tool_choice in ["required", None]:
+            completion_kwargs = model._prepare_completion_kwargs(messages,
+                                                                 stop_sequences=["Observation:"],
+                                                                 tools_to_call_from=[self.tool],
+                                                                 tool_choice=tool_choice)
+            self.assertIs(completion_kwargs["tools"][0], schema)
+            dumps_completion_payload(completion_kwargs)
+        self.assertEqual(schema, snapshot)
+        self.assertEqual(json.loads(dumps_completion_payload({"tools": [schema]}))["tools"][0], snapshot)
+
+    def test_recompiles_on_parameters_change(self):
+        schema = self.message_manager.get_tool_json_schema(self.tool)
+        self.assertIs(self.message_manager.get_tool_json_schema(self.tool), schema)
+
+        # A new parameters object is picked up without invalidation
+        self.tool.parameters = {**self.tool.parameters,
+                                "properties": {"url": {"type": "string", "description": "page to fetch"}}}
+        schema = self.message_manager.get_tool_json_schema(self.tool)
+        self.assertEqual(list(schema["function"]["parameters"]["properties"]), ["url"])
+
+        # Editing parameters in place needs an invalidation
+        self.tool.parameters["properties"]["depth"] = {"type": "integer", "description": "link depth"}
+        self.assertIs(self.message_manager.get_tool_json_schema(self.tool), schema)
+        MessageManager.invalidate_tool_json_schema(self.tool)
+        recompiled = self.message_manager.get_tool_json_schema(self.tool)
+        self.assertIsNot(recompiled, schema)
+        self.assertEqual(recompiled["function"]["parameters"]["required"], ["url", "depth"])
+        self.assertEqual(json.loads(dumps_completion_payload({"tools": [recompiled]})), {"tools": [recompiled]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import unittest
+from unittest import mock
+
+from src.models.catalog import ModelRegistry, get_model_catalog
+from src.models.models import ModelManager
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.built = []
+        self.registry = ModelRegistry(on_build=lambda name, model: self.built.append(name))
+
+    def _factory(self, name):
+        def factory():
+            return {"name": name}
+        return factory
+
+    def test_names_are_listed_without_building(self):
+        self.registry.register("a", self._factory("a"))
+        self.registry.register("b", self._factory("b"))
+        self.assertEqual(list(self.registry.keys()), ["a", "b"])
+        self.assertIn("a", self.registry)
+        self.assertNotIn("c", self.registry)
+        self.assertEqual(len(self.registry), 2)
+        self.assertEqual(self.built, [])
+
+    def test_model_is_built_once_on_first_access(self):
+        self.registry.register("a", self._factory("a"))
+        model = self.registry["a"]
+        self.assertIs(self.registry["a"], model)
+        self.assertEqual(self.built, ["a"])
+        self.assertTrue(self.registry.is_built("a"))
+
+    def test_direct_models_and_missing_names(self):
+        self.registry["a"] = "model"
+        self.assertEqual(self.registry["a"], "model")
+        self.assertEqual(self.built, [])
+        with self.assertRaises(KeyError):
+            self.registry["missing"]
+
+
+class TestModelCatalog(unittest.TestCase):
+
+    def test_catalog_names_are_unique(self):
+        for use_local_proxy in (True, False):
+            names = [spec.model_name for spec in get_model_catalog(use_local_proxy=use_local_proxy)]
+            self.assertEqual(len(names), len(set(names)))
+            self.assertIn("gpt-4.1", names)
+
+    def test_remote_deployments_are_registered_when_configured(self):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key", "OPENAI_API_BASE": "https://api.openai.com/v1"}):
+            names = [spec.model_name for spec in get_model_catalog(use_local_proxy=True)]
+        self.assertIn("gpt-4.1", names)
+        self.assertIn("gpt-4.1-remote", names)
+
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "", "OPENAI_API_BASE": ""}):
+            names = [spec.model_name for spec in get_model_catalog(use_local_proxy=True)]
+        self.assertNotIn("gpt-4.1-remote", names)
+
+
+class TestModelRoutes(unittest.TestCase):
+
+    def setUp(self):
+        # A manager of its own, the shared one being a singleton
+        self.manager = object.__new__(ModelManager)
+        self.manager.__init__()
+        for model_name in ["gpt-4.1", "gpt-4.1-remote"]:
+            self.manager.registed_models.register(model_name, lambda: None)
+
+    def test_unknown_members_are_dropped_with_a_warning(self):
+        with mock.patch("src.models.models.logger") as logger:
+            self.manager._init_routers({"router": dict(models=["gpt-4.1", "gpt-4.1-typo"])})
+        warnings = " ".join(call.args[0] for call in logger.warning.call_args_list)
+        self.assertIn("gpt-4.1-typo is not registered", warnings)
+        self.assertIn("neither hedged nor failed over", warnings)
+        self.assertIn("router", self.manager.registed_models)
+
+    def test_complete_routes_are_registered_silently(self):
+        with mock.patch("src.models.models.logger") as logger:
+            self.manager._init_routers({"router": dict(models=["gpt-4.1", "gpt-4.1-remote"])})
+        logger.warning.assert_not_called()
+        self.assertIn("router", self.manager.registed_models)
+
+
+if __name__ == "__main__":
+    unittest.main()
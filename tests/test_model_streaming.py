@@ -0,0 +1,144 @@
+import json
+import unittest
+from types import SimpleNamespace
+
+from src.base import AsyncMultiStepAgent
+from src.models import ChatMessage, LiteLLMModel
+from src.models.base import ChatMessageStreamDelta, MessageRole, agglomerate_stream_deltas
+from src.models.openaillm import OpenAIServerModel
+from src.models.rate_limiter import ModelRateLimiter
+
+
+def chunk(content=None, tool_calls=None, usage=None, finish_reason=None):
+    if usage is not None:
+        return SimpleNamespace(usage=usage, choices=[])
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls) if content is not None or tool_calls else None
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+def tool_call_chunk(index, name=None, arguments="", id=None):
+    return chunk(tool_calls=[SimpleNamespace(index=index, id=id, type="function",
+                                             function=SimpleNamespace(name=name, arguments=arguments))])
+
+
+CHUNKS = [
+    chunk(content="Let me "),
+    chunk(content="search."),
+    tool_call_chunk(0, name="web_searcher_tool", id="call_0"),
+    tool_call_chunk(0, arguments='{"query": '),
+    tool_call_chunk(0, arguments='"deep research"}'),
+    chunk(finish_reason="tool_calls"),
+    chunk(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=8))),
+]
+
+
+class FakeStream():
+    """Async stream of chat completion chunks, counting how many were consumed."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed == len(self.chunks):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return self.chunks[self.consumed - 1]
+
+
+class FakeCompletions():
+
+    def __init__(self):
+        self.calls = []
+        self.streams = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.streams.append(FakeStream(CHUNKS))
+        return self.streams[-1]
+
+
+class SyncModel():
+    """Model only implementing the synchronous `generate_stream`."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_stream(self, messages, **kwargs):
+        self.calls.append(kwargs)
+        yield ChatMessageStreamDelta(content="sync ")
+        yield ChatMessageStreamDelta(content="answer")
+
+
+class TestAsyncGenerateStream(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.messages = [ChatMessage(role=MessageRole.USER, content=[{"type": "text", "text": "task"}])]
+
+    def make_models(self):
+        """An OpenAI and a LiteLLM model served by the same fake chat completions endpoint."""
+        completions = FakeCompletions()
+        openai_model = OpenAIServerModel("gpt-4.1",
+                                         http_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+                                         rate_limiter=ModelRateLimiter("gpt-4.1", max_concurrency=1))
+        litellm_model = LiteLLMModel("gpt-4.1", rate_limiter=ModelRateLimiter("gpt-4.1", max_concurrency=1))
+        litellm_model.client = SimpleNamespace(acompletion=completions.create)
+        return [openai_model, litellm_model], completions
+
+    async def test_streams_usage_and_tool_call_deltas(self):
+        models, completions = self.make_models()
+        for model in models:
+            with self.subTest(model=type(model).__name__):
+                deltas = [delta async for delta in model.agenerate_stream(self.messages)]
+                message = agglomerate_stream_deltas(deltas)
+
+                self.assertEqual(message.content, "Let me search.")
+                self.assertEqual(len(message.tool_calls), 1)
+                self.assertEqual(message.tool_calls[0].id, "call_0")
+                self.assertEqual(message.tool_calls[0].function.name, "web_searcher_tool")
+                self.assertEqual(json.loads(message.tool_calls[0].function.arguments), {"query": "deep research"})
+                self.assertEqual((message.token_usage.input_tokens, message.token_usage.output_tokens), (10, 5))
+                self.assertEqual(message.token_usage.cached_input_tokens, 8)
+                self.assertEqual((model._last_input_token_count, model._last_output_token_count), (10, 5))
+
+                self.assertTrue(completions.calls[-1]["stream"])
+                self.assertEqual(completions.calls[-1]["stream_options"], {"include_usage": True})
+                self.assertEqual(model.rate_limiter.window.in_flight, 0)
+
+    async def test_slot_released_when_consumer_stops_early(self):
+        models, completions = self.make_models()
+        for model in models:
+            with self.subTest(model=type(model).__name__):
+                stream = model.agenerate_stream(self.messages)
+                async for delta in stream:
+                    self.assertEqual(model.rate_limiter.window.in_flight, 1)
+                    break
+                await stream.aclose()
+                self.assertEqual(completions.streams[-1].consumed, 1)
+                self.assertEqual(model.rate_limiter.window.in_flight, 0)
+
+                # The single slot is free for the next request
+                deltas = [delta async for delta in model.agenerate_stream(self.messages)]
+                self.assertEqual(agglomerate_stream_deltas(deltas).content, "Let me search.")
+                self.assertEqual(model.rate_limiter.stats()["concurrency_window"], 1)
+
+    async def test_agent_stream_uses_async_model(self):
+        models, _ = self.make_models()
+        agent = SimpleNamespace(model=models[0])
+        deltas = [delta async for delta in AsyncMultiStepAgent._generate_stream(agent, self.messages)]
+        self.assertEqual(agglomerate_stream_deltas(deltas).content, "Let me search.")
+
+    async def test_agent_stream_falls_back_to_sync_model(self):
+        agent = SimpleNamespace(model=SyncModel())
+        deltas = [delta async for delta in AsyncMultiStepAgent._generate_stream(agent, self.messages,
+                                                                                stop_sequences=["<end_plan>"])]
+        self.assertEqual(agglomerate_stream_deltas(deltas).content, "sync answer")
+        self.assertEqual(agent.model.calls, [{"stop_sequences": ["<end_plan>"]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from src.models import ChatMessage, MessageManager
+from src.models.base import MessageRole, get_token_usage
+
+
+def text_message(role, text):
+    return ChatMessage(role=role, content=[{"type": "text", "text": text}])
+
+
+class TestPromptCache(unittest.TestCase):
+
+    def setUp(self):
+        self.messages = [
+            text_message(MessageRole.SYSTEM, "system prompt"),
+            text_message(MessageRole.USER, "task"),
+            text_message(MessageRole.ASSISTANT, "thought"),
+            text_message(MessageRole.USER, "observation"),
+        ]
+
+    def test_breakpoints_on_prefix_and_tail(self):
+        message_list = MessageManager(model_id="claude-4-sonnet").get_clean_message_list(self.messages)
+        marked = [i for i, message in enumerate(message_list) if "cache_control" in message["content"][-1]]
+        self.assertEqual(marked, [0, 2, 3])
+
+    def test_breakpoints_do_not_leak_into_conversion_cache(self):
+        message_manager = MessageManager(model_id="claude-4-sonnet")
+        message_manager.get_clean_message_list(self.messages)
+        message_list = message_manager.get_clean_message_list(self.messages + [text_message(MessageRole.ASSISTANT, "answer")])
+        self.assertNotIn("cache_control", message_list[1]["content"][-1])
+
+    def test_no_breakpoints_for_other_models(self):
+        message_list = MessageManager(model_id="gpt-4.1").get_clean_message_list(self.messages)
+        self.assertFalse(any("cache_control" in message["content"][-1] for message in message_list))
+
+    def test_token_usage_reads_cache_counters(self):
+        openai_usage = {"prompt_tokens": 100, "completion_tokens": 10, "prompt_tokens_details": {"cached_tokens": 80}}
+        anthropic_usage = {"input_tokens": 100, "output_tokens": 10,
+                           "cache_read_input_tokens": 60, "cache_creation_input_tokens": 40}
+        self.assertEqual(get_token_usage(openai_usage).cached_input_tokens, 80)
+        self.assertEqual(get_token_usage(anthropic_usage).cached_input_tokens, 60)
+        self.assertEqual(get_token_usage(anthropic_usage).cache_creation_input_tokens, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from src.utils.ranking_utils import bm25_scores, rank_passages, split_passages
+
+
+class TestRankingUtils(unittest.TestCase):
+
+    def test_split_passages_packs_paragraphs(self):
+        text = "\n\n".join(["alpha " * 10, "beta " * 10, "gamma " * 10])
+        passages = split_passages(text, passage_length=130)
+        self.assertEqual(len(passages), 2)
+        self.assertTrue(passages[0].startswith("alpha") and "beta" in passages[0])
+        self.assertTrue(passages[1].startswith("gamma"))
+
+    def test_split_passages_cuts_long_paragraphs_between_words(self):
+        passages = split_passages("word " * 100, passage_length=50)
+        self.assertTrue(all(len(passage) <= 50 for passage in passages))
+        self.assertEqual(sum(len(passage.split()) for passage in passages), 100)
+
+    def test_bm25_prefers_passages_matching_rare_terms(self):
+        passages = [
+            "The cookie policy of this website and the privacy settings.",
+            "Perovskite solar cells reached a record efficiency this year.",
+            "Solar panels are popular. Solar energy is cheap.",
+            "Subscribe to our newsletter.",
+        ]
+        scores = bm25_scores("perovskite solar cell efficiency", passages)
+        self.assertEqual(int(scores.argmax()), 1)
+        self.assertEqual(scores[3], 0)
+        self.assertEqual(rank_passages("perovskite solar cell efficiency", passages, top_k=2), [1, 2])
+
+    def test_empty_query_keeps_document_order(self):
+        self.assertEqual(rank_passages("", ["a", "b", "c"], top_k=2), [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
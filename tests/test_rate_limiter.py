@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+
+from src.models.rate_limiter import ModelRateLimiter, TokenBucket, estimate_prompt_tokens
+from src.utils.token_utils import IMAGE_TOKEN_COUNT
+
+
+class OverloadedError(Exception):
+    status_code = 429
+
+
+class TestModelRateLimiter(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrency_window_caps_in_flight(self):
+        limiter = ModelRateLimiter("test", max_concurrency=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter.limit():
+                peak = max(peak, limiter.window.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[call() for _ in range(6)])
+        self.assertEqual(peak, 2)
+        self.assertEqual(limiter.stats()["requests"], 6)
+
+    async def test_window_backs_off_on_429(self):
+        limiter = ModelRateLimiter("test", max_concurrency=8)
+        with self.assertRaises(OverloadedError):
+            async with limiter.limit():
+                raise OverloadedError()
+        self.assertEqual(limiter.stats()["concurrency_window"], 4)
+        self.assertEqual(limiter.stats()["overloads"], 1)
+
+    async def test_other_errors_do_not_shrink_window(self):
+        limiter = ModelRateLimiter("test", max_concurrency=8)
+        with self.assertRaises(ValueError):
+            async with limiter.limit():
+                raise ValueError()
+        self.assertEqual(limiter.stats()["concurrency_window"], 8)
+
+    async def test_burst_of_429s_backs_off_once(self):
+        limiter = ModelRateLimiter("test", max_concurrency=8)
+
+        async def call():
+            async with limiter.limit():
+                await asyncio.sleep(0.01)
+                raise OverloadedError()
+
+        results = await asyncio.gather(*[call() for _ in range(8)], return_exceptions=True)
+        self.assertTrue(all(isinstance(result, OverloadedError) for result in results))
+        self.assertEqual(limiter.stats()["concurrency_window"], 4)
+        self.assertEqual(limiter.stats()["overloads"], 8)
+
+        # Requests started after the back off belong to a new congestion epoch
+        with self.assertRaises(OverloadedError):
+            async with limiter.limit():
+                raise OverloadedError()
+        self.assertEqual(limiter.stats()["concurrency_window"], 2)
+
+    async def test_cancelled_requests_leave_the_window_as_is(self):
+        limiter = ModelRateLimiter("test", max_concurrency=8, initial_concurrency=4)
+
+        async def call():
+            async with limiter.limit():
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(call())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(limiter.window.window, 4)
+        self.assertEqual(limiter.window.in_flight, 0)
+
+    async def test_timeouts_leave_the_window_as_is(self):
+        limiter = ModelRateLimiter("test", max_concurrency=8, initial_concurrency=4)
+        with self.assertRaises(asyncio.TimeoutError):
+            async with limiter.limit():
+                await asyncio.wait_for(asyncio.sleep(10), timeout=0.01)
+
+        class APITimeoutError(Exception):
+            pass
+
+        with self.assertRaises(APITimeoutError):
+            async with limiter.limit():
+                raise APITimeoutError()
+        self.assertEqual(limiter.window.window, 4)
+
+    def test_images_are_charged_a_flat_count(self):
+        text = {"type": "text", "text": "describe the screenshot"}
+        image = {"type": "image_url", "image_url": {"url": "data:image/png;base64," + "A" * 400_000}}
+        with_image = estimate_prompt_tokens({"messages": [{"role": "user", "content": [text, image]}]})
+        without_image = estimate_prompt_tokens({"messages": [{"role": "user", "content": [text]}]})
+        self.assertLess(with_image - without_image, IMAGE_TOKEN_COUNT + 10)
+        self.assertGreaterEqual(with_image - without_image, IMAGE_TOKEN_COUNT)
+
+    async def test_token_bucket_waits_when_empty(self):
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await bucket.acquire(1)
+        await bucket.acquire(1)
+        self.assertGreaterEqual(loop.time() - start, 0.08)
+
+
+if __name__ == "__main__":
+    unittest.main()
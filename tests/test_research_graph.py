@@ -0,0 +1,237 @@
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+
+from src.tools import tool_progress_callback
+from src.tools.deep_researcher import (DeepResearcherTool,
+                                       ResearchBudget,
+                                       ResearchContext,
+                                       ResearchInsight,
+                                       ResearchInsightEvent,
+                                       ResearchSummaryEvent)
+
+
+class FakeResearcher(DeepResearcherTool):
+    """Research graph whose nodes sleep and return canned follow-ups instead of searching."""
+
+    def __init__(self, follow_ups, delay=0.05, max_branches=2, max_concurrency=4,
+                 relevance=lambda query: 1.0, tokens_per_node=0, min_marginal_gain=0.0):
+        self.follow_ups = follow_ups
+        self.delay = delay
+        self.max_branches = max_branches
+        self.max_concurrency = max_concurrency
+        self.relevance = relevance
+        self.tokens_per_node = tokens_per_node
+        self.min_marginal_gain = min_marginal_gain
+        self.marginal_gain_window = 3
+        self.max_insights = 10
+        self.researched = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+
+    async def _research_node(self, context, query, depth, filter_year=None, deadline=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.researched.append((query, depth))
+        context.current_depth = max(context.current_depth, depth + 1)
+        context.budget.tokens += self.tokens_per_node
+        insight = ResearchInsight(content=f"insight about {query}", source_url=query,
+                                  relevance_score=self.relevance(query))
+        context.insights.append(insight)
+        return self.follow_ups(query), [insight]
+
+
+class TestResearchGraph(unittest.IsolatedAsyncioTestCase):
+
+    async def test_frontier_respects_depth_and_branching(self):
+        researcher = FakeResearcher(lambda query: [f"{query}.{i}" for i in range(3)])
+        context = ResearchContext(query="q", max_depth=3)
+        await researcher._research_graph(context, "q", deadline=time.time() + 10)
+
+        depths = [depth for _, depth in researcher.researched]
+        self.assertEqual(depths.count(0), 1)
+        self.assertEqual(depths.count(1), 2)
+        self.assertEqual(depths.count(2), 4)
+        self.assertEqual(context.current_depth, 3)
+
+    async def test_siblings_run_concurrently(self):
+        researcher = FakeResearcher(lambda query: [f"{query}.{i}" for i in range(4)],
+                                    delay=0.1, max_branches=4, max_concurrency=3)
+        context = ResearchContext(query="q", max_depth=2)
+        start = time.monotonic()
+        await researcher._research_graph(context, "q", deadline=time.time() + 10)
+
+        self.assertEqual(len(researcher.researched), 5)
+        self.assertEqual(researcher.max_in_flight, 3)
+        self.assertLess(time.monotonic() - start, 0.45)
+
+    async def test_duplicate_follow_ups_are_skipped(self):
+        researcher = FakeResearcher(lambda query: ["same", "Same ", "q"])
+        context = ResearchContext(query="q", max_depth=3)
+        await researcher._research_graph(context, "q", deadline=time.time() + 10)
+        self.assertEqual([query for query, _ in researcher.researched], ["q", "same"])
+
+    async def test_deadline_cancels_running_nodes(self):
+        researcher = FakeResearcher(lambda query: [f"{query}.{i}" for i in range(2)], delay=10)
+        context = ResearchContext(query="q", max_depth=3)
+        start = time.monotonic()
+        await researcher._research_graph(context, "q", deadline=time.time() + 0.1)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(researcher.cancelled, 1)
+        self.assertEqual(researcher.in_flight, 0)
+
+    async def test_best_candidates_are_expanded_first(self):
+        follow_ups = {"q": ["weak", "strong"], "weak": ["weak.1"], "strong": ["strong.1"]}
+        researcher = FakeResearcher(lambda query: follow_ups.get(query, []), delay=0.01, max_concurrency=1,
+                                    relevance=lambda query: 0.2 if query.startswith("weak") else 0.9)
+        context = ResearchContext(query="q", max_depth=3)
+        await researcher._research_graph(context, "q", deadline=time.time() + 10)
+        self.assertEqual([query for query, _ in researcher.researched], ["q", "weak", "strong", "strong.1", "weak.1"])
+
+    async def test_expansion_stops_when_budget_is_exhausted(self):
+        researcher = FakeResearcher(lambda query: [f"{query}.{i}" for i in range(2)], delay=0.01,
+                                    max_concurrency=1, tokens_per_node=100)
+        context = ResearchContext(query="q", max_depth=5, budget=ResearchBudget(max_tokens=250))
+        await researcher._research_graph(context, "q", deadline=time.time() + 10)
+        self.assertEqual(len(researcher.researched), 3)
+
+    async def test_expansion_stops_when_marginal_gain_drops(self):
+        researcher = FakeResearcher(lambda query: [f"{query}.{i}" for i in range(2)], delay=0.01,
+                                    max_concurrency=1, relevance=lambda query: 0.1, min_marginal_gain=0.5)
+        context = ResearchContext(query="q", max_depth=5)
+        await researcher._research_graph(context, "q", deadline=time.time() + 10)
+        self.assertEqual(len(researcher.researched), 3)
+
+    async def test_partial_summaries_are_reported(self):
+        events = []
+        self.addCleanup(tool_progress_callback.reset, tool_progress_callback.set(events.append))
+        researcher = FakeResearcher(lambda query: [f"{query}.{i}" for i in range(2)], delay=0.01)
+        context = ResearchContext(query="q", max_depth=2)
+        await researcher._research_graph(context, "q", deadline=time.time() + 10)
+
+        self.assertEqual(len(events), 3)
+        self.assertTrue(all(isinstance(event, ResearchSummaryEvent) and event.partial for event in events))
+        self.assertIn("insight about q.1", events[-1].content)
+
+
+class FakeAnalyzer(DeepResearcherTool):
+    """Insight extraction whose analyses sleep for the delay of their url instead of calling the model."""
+
+    def __init__(self, delays, max_concurrent_analyses=5):
+        self.delays = delays
+        self.max_concurrent_analyses = max_concurrent_analyses
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _analyze_content(self, content, url, title, query):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays[url])
+        finally:
+            self.in_flight -= 1
+        if content == "error":
+            raise ValueError(url)
+        return [ResearchInsight(content=content, source_url=url)]
+
+
+def search_results(*urls, content=None):
+    return [SimpleNamespace(url=url, title=None, raw_content=f"content of {url}" if content is None else content)
+            for url in urls]
+
+
+class TestExtractInsights(unittest.IsolatedAsyncioTestCase):
+
+    async def test_results_are_analyzed_concurrently_and_merged_as_completed(self):
+        analyzer = FakeAnalyzer({"a": 0.2, "b": 0.05, "c": 0.1}, max_concurrent_analyses=2)
+        context = ResearchContext(query="q")
+        insights = await analyzer._extract_insights(context, search_results("a", "b", "c"), "q", time.time() + 10)
+
+        self.assertEqual([insight.source_url for insight in insights], ["b", "c", "a"])
+        self.assertEqual(context.insights, insights)
+        self.assertEqual(analyzer.max_in_flight, 2)
+
+    async def test_visited_and_failed_results_are_skipped(self):
+        analyzer = FakeAnalyzer({"a": 0.01, "b": 0.01})
+        context = ResearchContext(query="q", visited_urls={"a"})
+        results = search_results("a") + search_results("b", content="error") + search_results("c", content="")
+        insights = await analyzer._extract_insights(context, results, "q", time.time() + 10)
+
+        self.assertEqual(insights, [])
+        self.assertEqual(context.visited_urls, {"a", "b", "c"})
+
+    async def test_deadline_cancels_stragglers(self):
+        analyzer = FakeAnalyzer({"a": 0.01, "b": 10})
+        context = ResearchContext(query="q")
+        start = time.monotonic()
+        insights = await analyzer._extract_insights(context, search_results("a", "b"), "q", time.time() + 0.1)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([insight.source_url for insight in insights], ["a"])
+        self.assertEqual(analyzer.in_flight, 0)
+
+    async def test_near_duplicate_contents_are_analyzed_once(self):
+        analyzer = FakeAnalyzer({"a": 0.01, "mirror": 0.01, "other": 0.01})
+        context = ResearchContext(query="q")
+        article = " ".join(f"word{i}" for i in range(200))
+        results = (search_results("a", content=article)
+                   + search_results("mirror", content=article + " Syndicated from a.")
+                   + search_results("other", content=article[::-1]))
+        insights = await analyzer._extract_insights(context, results, "q", time.time() + 10)
+
+        self.assertEqual(sorted(insight.source_url for insight in insights), ["a", "other"])
+        self.assertEqual(context.visited_urls, {"a", "mirror", "other"})
+
+    async def test_insights_are_reported_as_merged(self):
+        events = []
+        self.addCleanup(tool_progress_callback.reset, tool_progress_callback.set(events.append))
+        analyzer = FakeAnalyzer({"a": 0.1, "b": 0.01})
+        context = ResearchContext(query="q")
+        await analyzer._extract_insights(context, search_results("a", "b"), "q", time.time() + 10)
+
+        self.assertTrue(all(isinstance(event, ResearchInsightEvent) for event in events))
+        self.assertEqual([event.insight.source_url for event in events], ["b", "a"])
+
+
+class FakeChunker(DeepResearcherTool):
+
+    def __init__(self):
+        self.passage_length = 100
+        self.top_k_passages = 2
+        self.map_reduce_passages = 6
+        self.max_map_chunks = 2
+
+
+class TestSelectChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.chunker = FakeChunker()
+
+    def test_short_content_is_kept_whole(self):
+        content = "solar power\n\nwind power"
+        self.assertEqual(self.chunker._select_chunks(content, "solar"), [content])
+
+    def test_most_relevant_passages_are_kept_in_document_order(self):
+        paragraphs = ["menu " * 15, "solar panel output " * 4, "footer " * 12, "solar efficiency record " * 3]
+        chunks = self.chunker._select_chunks("\n\n".join(paragraphs), "solar efficiency")
+        self.assertEqual(chunks, [paragraphs[1].strip() + "\n\n[...]\n\n" + paragraphs[3].strip()])
+
+    def test_long_content_is_split_into_chunks_of_relevant_passages(self):
+        paragraphs = [f"solar fact {i} " * 5 if i % 2 else "boilerplate " * 8 for i in range(12)]
+        chunks = self.chunker._select_chunks("\n\n".join(paragraphs), "solar")
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(all("boilerplate" not in chunk for chunk in chunks))
+
+
+if __name__ == "__main__":
+    unittest.main()
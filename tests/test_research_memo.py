@@ -0,0 +1,68 @@
+import os
+import time
+import tempfile
+import unittest
+
+from src.tools.research_memo import ResearchMemo
+
+
+class TestResearchMemo(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "memo.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_search_is_keyed_on_normalized_query_and_params(self):
+        memo = ResearchMemo(path=self.path)
+        results = [{"position": 1, "url": "https://a.com", "title": "A", "source": "firecrawl"}]
+        memo.set_search("Solar  Cells ", {"lang": "en"}, results)
+        self.assertEqual(memo.get_search("solar cells", {"lang": "en"}), results)
+        self.assertIsNone(memo.get_search("solar cells", {"lang": "fr"}))
+        self.assertEqual(memo.stats()["searches"]["hits"], 1)
+
+    def test_insights_survive_new_instance(self):
+        memo = ResearchMemo(path=self.path)
+        memo.set_insights("page content", "solar cells", "gpt-4.1", [{"content": "insight", "relevance_score": 0.9}])
+
+        memo = ResearchMemo(path=self.path)
+        self.assertEqual(memo.get_insights("page content", "Solar cells", "gpt-4.1")[0]["content"], "insight")
+        self.assertIsNone(memo.get_insights("page content", "solar cells", "o3"))
+        self.assertIsNone(memo.get_insights("changed content", "solar cells", "gpt-4.1"))
+
+    def test_ttl_expiry_per_kind(self):
+        memo = ResearchMemo(path=self.path, search_ttl=0.05, insight_ttl=None)
+        memo.set_search("query", {}, [])
+        memo.set_insights("content", "query", "gpt-4.1", [])
+        time.sleep(0.1)
+        self.assertIsNone(memo.get_search("query", {}))
+        self.assertEqual(memo.get_insights("content", "query", "gpt-4.1"), [])
+
+    def test_expired_rows_are_purged_periodically(self):
+        memo = ResearchMemo(path=self.path, search_ttl=0.05, purge_interval=0.2)
+        memo.set_search("old", {}, [])
+        time.sleep(0.1)
+        memo.set_search("recent", {}, [])
+        self.assertEqual(memo._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0], 2)
+
+        time.sleep(0.15)
+        memo.set_search("new", {}, [])
+        self.assertEqual(memo._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0], 1)
+
+    async def test_async_access(self):
+        memo = ResearchMemo(path=self.path)
+        await memo.aset_insights("content", "query", "gpt-4.1", [{"content": "insight", "relevance_score": 0.5}])
+        self.assertEqual((await memo.aget_insights("content", "query", "gpt-4.1"))[0]["content"], "insight")
+        self.assertIsNone(await memo.aget_search("query", {}))
+
+    def test_disabled_memo_stores_nothing(self):
+        memo = ResearchMemo(path=self.path, enabled=False)
+        memo.set_search("query", {}, [])
+        self.assertIsNone(memo.get_search("query", {}))
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from src.models.cache import ResponseCache, is_deterministic
+from src.models.openaillm import OpenAIServerModel
+from src.tools.deep_researcher import DeepResearcherTool
+
+
+class TestResponseCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_ignores_credentials_and_order(self):
+        key1 = ResponseCache.make_key({"model": "gpt-4.1", "messages": [{"role": "user", "content": "hi"}], "api_key": "a"})
+        key2 = ResponseCache.make_key({"api_key": "b", "messages": [{"role": "user", "content": "hi"}], "model": "gpt-4.1"})
+        key3 = ResponseCache.make_key({"model": "gpt-4.1", "messages": [{"role": "user", "content": "hello"}]})
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+    def test_only_greedy_requests_are_deterministic(self):
+        self.assertTrue(is_deterministic({"model": "gpt-4.1", "temperature": 0}))
+        self.assertFalse(is_deterministic({"model": "gpt-4.1", "temperature": 0.7}))
+        self.assertFalse(is_deterministic({"model": "gpt-4.1"}))
+        self.assertFalse(is_deterministic({"model": "gpt-4.1", "temperature": 0, "n": 3}))
+
+    def test_hit_miss_counters(self):
+        cache = ResponseCache(path=self.path)
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", {"role": "assistant", "content": "answer"})
+        self.assertEqual(cache.get("key")["content"], "answer")
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_disk_tier_survives_new_instance(self):
+        ResponseCache(path=self.path).set("key", {"role": "assistant", "content": "answer"})
+        cache = ResponseCache(path=self.path)
+        self.assertEqual(cache.get("key")["content"], "answer")
+        self.assertEqual(cache.disk_hits, 1)
+
+    def test_ttl_expiry(self):
+        ResponseCache(path=self.path).set("key", {"content": "answer"})
+        time.sleep(0.05)
+        cache = ResponseCache(path=self.path, ttl=0.01)
+        self.assertIsNone(cache.get("key"))
+
+    async def test_async_access(self):
+        await ResponseCache(path=self.path).aset("key", {"content": "answer"})
+        cache = ResponseCache(path=self.path)
+        self.assertIsNone(await cache.aget("missing"))
+        self.assertEqual((await cache.aget("key"))["content"], "answer")
+        self.assertEqual((await cache.aget("key"))["content"], "answer")
+        self.assertEqual((cache.disk_hits, cache.memory_hits, cache.misses), (1, 1, 1))
+
+    def test_memory_lru_eviction(self):
+        cache = ResponseCache(path=None, max_entries=2)
+        cache.set("a", {"content": "a"})
+        cache.set("b", {"content": "b"})
+        cache.get("a")
+        cache.set("c", {"content": "c"})
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_size_eviction(self):
+        cache = ResponseCache(path=self.path, max_size=1)
+        cache.set("a", {"content": "a"})
+        cache.set("b", {"content": "b"})
+        fresh = ResponseCache(path=self.path)
+        self.assertIsNone(fresh.get("a"))
+
+
+class FakeCompletions():
+    """Chat completions endpoint answering every request with an `optimize_query` tool call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        arguments = json.dumps({"query": "q", "optimized_query": "optimized q", "filter_year": 2024})
+        message = {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "call_0", "type": "function", "function": {"name": "optimize_query", "arguments": arguments}}]}
+        return SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+            choices=[SimpleNamespace(message=SimpleNamespace(model_dump=lambda include=None: message))],
+        )
+
+
+class CachedResearcher(DeepResearcherTool):
+
+    def __init__(self, model):
+        self.model = model
+
+
+class TestResearcherResponseCache(unittest.IsolatedAsyncioTestCase):
+
+    def make_model(self, **kwargs):
+        completions = FakeCompletions()
+        client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        model = OpenAIServerModel("gpt-4.1", http_client=client, response_cache=ResponseCache(path=None), **kwargs)
+        return model, completions
+
+    async def test_repeated_optimized_query_hits_the_cache(self):
+        model, completions = self.make_model()
+        researcher = CachedResearcher(model)
+        self.assertEqual(await researcher._generate_optimized_query("q"), ("optimized q", 2024))
+        self.assertEqual(await researcher._generate_optimized_query("q"), ("optimized q", 2024))
+
+        self.assertEqual(completions.calls, 1)
+        self.assertEqual(model.response_cache.hits, 1)
+
+    async def test_models_can_opt_out(self):
+        model, completions = self.make_model(use_cache=False)
+        researcher = CachedResearcher(model)
+        await researcher._generate_optimized_query("q")
+        await researcher._generate_optimized_query("q")
+        self.assertEqual(completions.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+
+from src.models.router import RouterModel
+
+
+class ProviderError(Exception):
+    status_code = 503
+
+
+class FakeModel():
+    def __init__(self, model_id, delay=0.0, error=None):
+        self.model_id = model_id
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, messages, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.model_id
+
+
+class TestRouterModel(unittest.IsolatedAsyncioTestCase):
+
+    async def test_fast_primary_is_not_hedged(self):
+        primary, secondary = FakeModel("a", delay=0.01), FakeModel("b")
+        router = RouterModel("route", models=[primary, secondary], hedge_delay=1)
+        self.assertEqual(await router.generate([]), "a")
+        self.assertEqual(secondary.calls, 0)
+
+    async def test_stalled_primary_is_hedged_and_cancelled(self):
+        primary, secondary = FakeModel("a", delay=10), FakeModel("b", delay=0.01)
+        router = RouterModel("route", models=[primary, secondary], hedge_delay=0.05)
+        self.assertEqual(await router.generate([]), "b")
+        await asyncio.sleep(0)
+        self.assertEqual(primary.cancelled, 1)
+        self.assertEqual(router.latency_stats[1].hedges, 1)
+
+    async def test_stalled_primary_is_ranked_down(self):
+        primary, secondary = FakeModel("a", delay=10), FakeModel("b", delay=0.01)
+        router = RouterModel("route", models=[primary, secondary], hedge_delay=0.05)
+        await router.generate([])
+
+        self.assertEqual(router.latency_stats[0].censored, 1)
+        self.assertGreater(router.latency_stats[0].p50, router.latency_stats[1].p50)
+        self.assertEqual(router._ranked_members(), [1, 0])
+
+    async def test_unsampled_members_rank_at_the_median(self):
+        router = RouterModel("route", models=[FakeModel("a"), FakeModel("b"), FakeModel("c")])
+        router.latency_stats[0].record_success(3.0)
+        router.latency_stats[2].record_success(1.0)
+        self.assertEqual(router._ranked_members(), [2, 0, 1])
+
+    async def test_errors_fail_over(self):
+        primary, secondary = FakeModel("a", error=ProviderError()), FakeModel("b")
+        router = RouterModel("route", models=[primary, secondary], hedge_delay=1)
+        self.assertEqual(await router.generate([]), "b")
+        self.assertEqual(router.latency_stats[0].error_rate, 1.0)
+        # The failing member is now tried last
+        self.assertEqual(await router.generate([]), "b")
+        self.assertEqual(primary.calls, 1)
+
+    async def test_all_members_failing_raises(self):
+        router = RouterModel("route", models=[FakeModel("a", error=ProviderError()),
+                                              FakeModel("b", error=ProviderError())])
+        with self.assertRaises(ProviderError):
+            await router.generate([])
+
+    async def test_hedge_delay_follows_p95(self):
+        router = RouterModel("route", models=[FakeModel("a")], hedge_delay=30, min_samples=4)
+        for latency in [1.0, 2.0, 3.0, 4.0]:
+            router.latency_stats[0].record_success(latency)
+        self.assertEqual(router._get_hedge_delay(0), 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
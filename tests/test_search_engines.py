@@ -0,0 +1,40 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from src.tools.search import BingSearchEngine, run_in_search_thread
+
+BING_PAGE = """<html><body><ol id="b_results">
+<li class="b_algo"><h2><a href="https://a.org">A</a></h2><p>About a</p></li>
+<li class="b_algo"><h2><a href="https://b.org">B</a></h2><p>About b</p></li>
+</ol>{next}</body></html>"""
+
+
+class TestSearchEngines(unittest.IsolatedAsyncioTestCase):
+
+    async def test_blocking_searches_run_in_parallel(self):
+        start = time.monotonic()
+        results = await asyncio.gather(*[run_in_search_thread(time.sleep, 0.2) for _ in range(4)])
+        self.assertEqual(results, [None] * 4)
+        self.assertLess(time.monotonic() - start, 0.6)
+
+    async def test_bing_paginates_with_the_engine_client(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            next_link = '<a title="Next page" href="/search?q=q&first=11">Next</a>' if len(requests) == 1 else ""
+            return httpx.Response(200, text=BING_PAGE.format(next=next_link))
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            engine = BingSearchEngine(client=client)
+            items = await engine.perform_search("q", num_results=3)
+
+        self.assertEqual([item.url for item in items], ["https://a.org", "https://b.org", "https://a.org"])
+        self.assertEqual(len(requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import time
+import unittest
+
+from src.tools.search import SearchItem
+from src.tools.web_searcher import WebSearcherTool, SearchResult, merge_search_results
+
+
+class FakeEngine():
+    """Search engine answering after a delay with canned URLs, or failing."""
+
+    def __init__(self, urls, delay=0.01, error=None):
+        self.urls = urls
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def perform_search(self, query, num_results=10, *args, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return [SearchItem(title=url, url=url) for url in self.urls[:num_results]]
+
+
+class FakeSearcher(WebSearcherTool):
+
+    def __init__(self, engines, race=False, merge_results=False, merge_window=1.0, max_retries=0):
+        self._search_engine = engines
+        self.engine = next(iter(engines))
+        self.fallback_engines = list(engines)[1:]
+        self.race = race
+        self.merge_results = merge_results
+        self.merge_window = merge_window
+        self.retry_delay = 0.01
+        self.max_retry_delay = 0.05
+        self.retry_jitter = 0.5
+        self.max_retries = max_retries
+        self.lang = "en"
+        self.country = "us"
+        self.num_results = 3
+        self.fetch_content = False
+        self.memo = FakeMemo()
+
+    async def _perform_search_with_engine(self, engine, query, num_results, search_params):
+        return await engine.perform_search(query, num_results=num_results)
+
+
+class FakeMemo():
+
+    async def aget_search(self, query, params):
+        return None
+
+    async def aset_search(self, query, params, results):
+        pass
+
+
+class TestSearchRace(unittest.IsolatedAsyncioTestCase):
+
+    async def test_fallback_tries_engines_in_order(self):
+        engines = {"a": FakeEngine([], error=ValueError("down")), "b": FakeEngine(["b1"]), "c": FakeEngine(["c1"])}
+        response = await FakeSearcher(engines).forward("q")
+        self.assertEqual([result.url for result in response.results], ["b1"])
+        self.assertEqual(engines["c"].calls, 0)
+
+    async def test_race_keeps_the_fastest_results_and_cancels_the_others(self):
+        engines = {"a": FakeEngine(["a1"], delay=10), "b": FakeEngine(["b1"], delay=0.01), "c": FakeEngine([], delay=0)}
+        start = time.monotonic()
+        response = await FakeSearcher(engines, race=True).forward("q")
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([result.source for result in response.results], ["b"])
+        self.assertTrue(engines["a"].cancelled)
+
+    async def test_race_merges_results_within_the_window(self):
+        engines = {"a": FakeEngine(["x", "a2"], delay=0.01), "b": FakeEngine(["http://www.x/", "b2"], delay=0.05),
+                   "c": FakeEngine(["c1"], delay=10)}
+        start = time.monotonic()
+        response = await FakeSearcher(engines, race=True, merge_results=True, merge_window=0.2).forward("q")
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([result.url for result in response.results], ["x", "a2", "b2"])
+        self.assertEqual([result.position for result in response.results], [1, 2, 3])
+        self.assertTrue(engines["c"].cancelled)
+
+    async def test_retries_do_not_block_the_event_loop(self):
+        engines = {"a": FakeEngine([])}
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        response = await FakeSearcher(engines, max_retries=3).forward("q")
+        ticker.cancel()
+
+        self.assertIsNotNone(response.error)
+        self.assertEqual(engines["a"].calls, 4)
+        self.assertGreater(ticks, 3)
+
+
+class TestMergeSearchResults(unittest.TestCase):
+
+    def test_results_are_interleaved_by_rank_and_deduplicated(self):
+        def results(source, *urls):
+            return [SearchResult(position=i + 1, url=url, source=source) for i, url in enumerate(urls)]
+
+        merged = merge_search_results([results("a", "https://x.org/page#top", "https://y.org"),
+                                       results("b", "http://www.X.org/page/", "https://z.org")], 10)
+        self.assertEqual([(result.source, result.url) for result in merged],
+                         [("a", "https://x.org/page#top"), ("a", "https://y.org"), ("b", "https://z.org")])
+
+
+if __name__ == "__main__":
+    unittest.main()
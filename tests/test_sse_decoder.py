@@ -0,0 +1,27 @@
+import unittest
+
+from src.models.restful import SSEDecoder
+
+
+class TestSSEDecoder(unittest.TestCase):
+
+    def decode_all(self, lines):
+        decoder = SSEDecoder()
+        events = [decoder.decode(line) for line in lines] + [decoder.flush()]
+        return [event for event in events if event is not None]
+
+    def test_event_is_emitted_on_blank_line(self):
+        decoder = SSEDecoder()
+        self.assertIsNone(decoder.decode('data: {"type": "response.output_text.delta"}'))
+        self.assertEqual(decoder.decode(""), '{"type": "response.output_text.delta"}')
+
+    def test_multiline_data_comments_and_fields(self):
+        lines = ["event: message", "data: {\"a\":", "data: 1}", "", ": keep-alive", "id: 3", "data: [DONE]", ""]
+        self.assertEqual(self.decode_all(lines), ["{\"a\":\n1}", "[DONE]"])
+
+    def test_trailing_event_without_blank_line(self):
+        self.assertEqual(self.decode_all(["data: {\"b\": 2}"]), ["{\"b\": 2}"])
+
+
+if __name__ == "__main__":
+    unittest.main()
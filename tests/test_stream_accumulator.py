@@ -0,0 +1,53 @@
+import unittest
+
+from src.logger import TokenUsage
+from src.models.base import (ChatMessageStreamAccumulator,
+                             ChatMessageStreamDelta,
+                             ChatMessageToolCallFunction,
+                             ChatMessageToolCallStreamDelta,
+                             agglomerate_stream_deltas)
+
+
+def tool_call_delta(index, name="", arguments="", id=None):
+    return ChatMessageStreamDelta(tool_calls=[
+        ChatMessageToolCallStreamDelta(index=index, id=id, type="function",
+                                       function=ChatMessageToolCallFunction(name=name, arguments=arguments))
+    ])
+
+
+class TestChatMessageStreamAccumulator(unittest.TestCase):
+
+    def setUp(self):
+        self.deltas = [
+            ChatMessageStreamDelta(content="Let me "),
+            ChatMessageStreamDelta(content="search."),
+            tool_call_delta(0, name="web_searcher_tool", id="call_0"),
+            tool_call_delta(0, arguments='{"query": '),
+            tool_call_delta(1, name="final_answer_tool", id="call_1"),
+            tool_call_delta(0, arguments='"deep research"}'),
+            ChatMessageStreamDelta(content="", token_usage=TokenUsage(input_tokens=10, output_tokens=5,
+                                                                      cached_input_tokens=8)),
+        ]
+
+    def test_matches_agglomerate(self):
+        accumulator = ChatMessageStreamAccumulator()
+        for delta in self.deltas:
+            accumulator.add(delta)
+            # Partial renders must not change the result
+            accumulator.render_as_markdown()
+        self.assertEqual(accumulator.to_chat_message(), agglomerate_stream_deltas(self.deltas))
+
+    def test_folds_content_tool_calls_and_usage(self):
+        chat_message = agglomerate_stream_deltas(self.deltas)
+        self.assertEqual(chat_message.content, "Let me search.")
+        self.assertEqual([tool_call.id for tool_call in chat_message.tool_calls], ["call_0", "call_1"])
+        self.assertEqual(chat_message.tool_calls[0].function.arguments, '{"query": "deep research"}')
+        self.assertEqual(chat_message.token_usage.cached_input_tokens, 8)
+
+    def test_missing_index_raises(self):
+        with self.assertRaises(ValueError):
+            ChatMessageStreamAccumulator().add(tool_call_delta(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
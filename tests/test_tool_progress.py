@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+
+from src.tools import report_tool_progress, stream_progress, tool_progress_callback
+
+
+async def work(steps, delay=0.01):
+    for step in range(steps):
+        await asyncio.sleep(delay)
+        report_tool_progress(step)
+    return "done"
+
+
+class TestStreamProgress(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.events = asyncio.Queue()
+
+        async def run(steps, delay=0.01):
+            tool_progress_callback.set(self.events.put_nowait)
+            return await work(steps, delay)
+
+        self.run_work = run
+
+    async def test_events_are_yielded_until_completion(self):
+        task = asyncio.create_task(self.run_work(3))
+        events = [event async for event in stream_progress(self.events, task)]
+        self.assertEqual(events, [0, 1, 2])
+        self.assertEqual(task.result(), "done")
+
+    async def test_progress_without_listener_is_dropped(self):
+        self.assertEqual(await work(2), "done")
+        self.assertIsNone(tool_progress_callback.get())
+
+    async def test_closing_the_stream_cancels_the_work(self):
+        task = asyncio.create_task(self.run_work(100, delay=0.05))
+        stream = stream_progress(self.events, task)
+        self.assertEqual(await anext(stream), 0)
+        await stream.aclose()
+        self.assertTrue(task.cancelled())
+
+    async def test_failures_are_raised_after_the_events(self):
+        async def fail():
+            tool_progress_callback.set(self.events.put_nowait)
+            report_tool_progress("started")
+            raise ValueError("failed")
+
+        task = asyncio.create_task(fail())
+        events = [event async for event in stream_progress(self.events, task)]
+        self.assertEqual(events, ["started"])
+        with self.assertRaises(ValueError):
+            task.result()
+
+
+if __name__ == "__main__":
+    unittest.main()